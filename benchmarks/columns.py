@@ -0,0 +1,63 @@
+''' benchmark: date rules visiting each individual and family vs checking date columns at once
+
+    python -m benchmarks.columns [individual_count]
+'''
+from typing import Callable, List
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from unittest.mock import patch
+import os
+import sys
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.validation import ValidationEngine
+from features.valid_dates import dates_before_current_date
+from features.birth_before import birth_before_death
+from features.age_less_than_150_years_old_and_siblings_order import age_and_age_at_death
+from features.list_recent_births_deaths import list_recent_births, list_recent_deaths
+from features.multiple_births import siblings_born_at_same_time, too_many_siblings
+from features.parents_too_old import sibling_spacing
+from features.list_of_living_single_and_multiple_births import list_multiple_births
+from benchmarks.generator import GedcomTreeGenerator
+
+VALIDATORS: List[Callable] = [
+    dates_before_current_date, birth_before_death, age_and_age_at_death,
+    siblings_born_at_same_time, too_many_siblings, sibling_spacing]
+PRINTERS: List[Callable] = [list_recent_births, list_recent_deaths, list_multiple_births]
+
+
+def run_rules(repo: GedcomRepository) -> List[List[str]]:
+    results = ValidationEngine(VALIDATORS).run(repo)
+    return [results[validator].errors for validator in VALIDATORS] + \
+        [[individual.id for individual in printer(repo)[1]] for printer in PRINTERS]
+
+
+def measure(name: str, repo: GedcomRepository) -> List[List[str]]:
+    # columns are built within the measurement
+    repo._individual_columns = repo._family_columns = None
+    start: float = perf_counter()
+    results: List[List[str]] = run_rules(repo)
+    elapsed: float = perf_counter() - start
+    print(f'{name:>8}: {sum(map(len, results))} rows in {elapsed:.3f}s')
+    return results
+
+
+def main(individual_count: int = 200_000) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'columns.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+        repo: GedcomRepository = read_repository_file(path)
+
+    print(f'{len(repo.individuals)} individuals')
+    if repo.individual_columns is None:
+        print('NumPy is not installed, rules visit each individual')
+        return
+
+    columns: List[List[str]] = measure('columns', repo)
+    with patch('gedcom.repository.get_individual_columns', return_value=None):
+        visited: List[List[str]] = measure('visiting', repo)
+
+    print(f'columns output {"matches" if columns == visited else "differs"}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,41 @@
+''' benchmark: parse throughput of a clean file vs a file with invalid lines recorded as diagnostics
+
+    python -m benchmarks.diagnostics [individual_count] [invalid_percent]
+
+    invalid_percent of level-1 lines are malformed and the same share of DATE lines is invalid
+'''
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import sys
+from gedcom import GedcomRepository, read_repository_file
+from benchmarks.generator import GedcomTreeGenerator
+
+
+def measure(name: str, path: str) -> None:
+    with open(path) as file:
+        line_count: int = sum(1 for _ in file)
+
+    start: float = perf_counter()
+    repo: GedcomRepository = read_repository_file(path)
+    elapsed: float = perf_counter() - start
+    print(f'{name:>8}: {line_count / elapsed:10.0f} lines/s, {len(repo.diagnostics)} of {line_count} lines rejected '
+          f'in {elapsed:.3f}s')
+    for reason, count in list(repo.diagnostics.get_reason_counts().items())[:5]:
+        print(f'{count:>18} {reason}')
+
+
+def main(individual_count: int = 50_000, invalid_percent: int = 30) -> None:
+    rate: float = invalid_percent / 100
+    with TemporaryDirectory() as directory:
+        clean_path: str = os.path.join(directory, 'clean.ged')
+        invalid_path: str = os.path.join(directory, 'invalid.ged')
+        GedcomTreeGenerator(individual_count).write_file(clean_path)
+        GedcomTreeGenerator(individual_count, invalid_date_rate=rate, invalid_line_rate=rate).write_file(invalid_path)
+
+        measure('clean', clean_path)
+        measure('invalid', invalid_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
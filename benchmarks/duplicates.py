@@ -0,0 +1,87 @@
+''' benchmark: US23 near-duplicate clusters from blocking and sorted neighbourhood windows
+
+    python -m benchmarks.duplicates [individual_count] [duplicate_rate]
+
+    individuals get random names and birth dates, duplicate_rate of them are entered again
+    with a name typo or without a birth date, recall is the share of those found in a cluster
+'''
+from typing import List, Set, Tuple
+from io import StringIO
+from random import Random
+from time import perf_counter
+import sys
+from gedcom import GedcomRepository
+from gedcom.file import get_lines_from_file
+from gedcom.duplicates import GedcomDuplicateIndex, GedcomDuplicateCluster
+
+GIVEN_NAMES: Tuple[str, ...] = (
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William', 'Elizabeth',
+    'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Daniel', 'Nancy', 'Matthew', 'Lisa', 'Anthony', 'Margaret', 'Mark', 'Sandra', 'Donald', 'Ashley')
+
+# surnames are made of two or three syllables
+SYLLABLES: Tuple[str, ...] = (
+    'an', 'ber', 'cal', 'dor', 'el', 'fen', 'gar', 'hol', 'in', 'kel', 'lan', 'mor', 'nor', 'ost', 'per',
+    'quin', 'ros', 'sel', 'tor', 'val', 'wes', 'yar', 'zan', 'bri', 'dun', 'fal', 'grim', 'har', 'lor', 'mac')
+
+MONTHS: Tuple[str, ...] = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+
+
+def add_typo(name: str, random: Random) -> str:
+    ''' drop, double or swap a letter after the first '''
+    position: int = random.randrange(1, len(name))
+    kind: int = random.randrange(3)
+    if kind == 0:
+        return name[:position] + name[position + 1:]
+    if kind == 1:
+        return name[:position] + name[position] + name[position:]
+
+    position = min(position, len(name) - 2)
+    return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+
+
+def get_rows(individual_count: int, duplicate_rate: float, seed: int = 1) -> Tuple[List[str], Set[Tuple[str, str]]]:
+    ''' GEDCOM rows of individuals and (original, duplicate) ID pairs '''
+    random: Random = Random(seed)
+    rows: List[str] = ['0 HEAD']
+    duplicates: Set[Tuple[str, str]] = set()
+    for n in range(individual_count):
+        given_name: str = f'{random.choice(GIVEN_NAMES)} {random.choice(GIVEN_NAMES)}'
+        surname: str = ''.join(random.choice(SYLLABLES) for _ in range(random.randint(2, 3))).capitalize()
+        birth: str = f'{random.randint(1, 28)} {random.choice(MONTHS)} {random.randint(1700, 2000)}'
+        rows += [f'0 @I{n}@ INDI', f'1 NAME {given_name} /{surname}/', '1 BIRT', f'2 DATE {birth}']
+
+        if random.random() < duplicate_rate:
+            duplicates.add((f'@I{n}@', f'@D{n}@'))
+            rows += [f'0 @D{n}@ INDI']
+            if random.random() < 0.5:
+                rows += [f'1 NAME {add_typo(given_name, random)} /{surname}/', '1 BIRT', f'2 DATE {birth}']
+            else:
+                rows += [f'1 NAME {given_name} /{surname}/']
+
+    return rows + ['0 TRLR'], duplicates
+
+
+def main(individual_count: int = 100_000, duplicate_rate: float = 0.01) -> None:
+    rows, duplicates = get_rows(individual_count, duplicate_rate)
+    repo: GedcomRepository = GedcomRepository(get_lines_from_file(StringIO('\n'.join(rows))))
+    print(f'{len(repo.individuals)} individuals, {len(duplicates)} entered twice')
+
+    start: float = perf_counter()
+    index: GedcomDuplicateIndex = GedcomDuplicateIndex(repo.individuals)
+    clusters: List[GedcomDuplicateCluster] = index.get_clusters()
+    elapsed: float = perf_counter() - start
+    candidate_count: int = len(index.get_candidate_pairs())
+
+    found: Set[Tuple[str, str]] = set()
+    for cluster in clusters:
+        ids: Set[str] = {individual.id for individual in cluster.individuals}
+        found.update(pair for pair in duplicates if pair[0] in ids and pair[1] in ids)
+
+    pair_count: int = len(repo.individuals) * (len(repo.individuals) - 1) // 2
+    print(f'{candidate_count} candidate pairs of {pair_count} ({candidate_count / pair_count:.2e}), {len(clusters)} clusters in {elapsed:.2f}s')
+    print(f'recall {len(found) / max(len(duplicates), 1):.3f}')
+
+
+if __name__ == '__main__':
+    main(*[float(arg) if '.' in arg else int(arg) for arg in sys.argv[1:]])
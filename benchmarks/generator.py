@@ -0,0 +1,173 @@
+''' deterministic synthetic GEDCOM family tree generator
+
+    python -m benchmarks.generator individual_count output.ged [seed]
+'''
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+from array import array
+from random import Random
+import sys
+
+
+MONTHS: Tuple[str, ...] = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+
+# days past the end of their month, rejected by GedcomDate
+INVALID_DATES: Tuple[str, ...] = ('30 FEB', '31 APR', '31 JUN', '31 SEP', '31 NOV', '32 JAN')
+
+# malformed replacement of level-1 lines by tag, rejected while parsing
+MALFORMED_LINES: Dict[str, str] = {
+    'NAME': '1 NAME', 'SEX': '1 SEX X', 'FAMS': '1 FAMS', 'FAMC': '1 FAMC', 'HUSB': '1 HUSB', 'WIFE': '1 WIFE', 'CHIL': '1 CHIL',
+    'BIRT': '1 BIRT Y', 'DEAT': '1 DEAT Y', 'MARR': '1 MARR Y', 'DIV': '1 DIV Y'}
+
+# weights of 0, 1, 2, ... children per family
+CHILDREN_WEIGHTS: Tuple[float, ...] = (10, 15, 25, 20, 12, 8, 5, 3, 1, 1)
+
+
+class GedcomTreeGenerator:
+    ''' generate a GEDCOM family tree of individual_count individuals in generation_count generations
+        individuals of a generation marry in pairs, their children are the next generation,
+        the same seed and settings always write the same file
+        children_weights: relative frequency of families with 0, 1, 2, ... children
+        duplicate_id_rate: share of records reusing the ID of the previous record
+        invalid_date_rate: share of DATE lines with a day past the end of its month
+        invalid_line_rate: share of level-1 lines replaced with a malformed line '''
+
+    def __init__(
+        self,
+        individual_count: int,
+        generation_count: int = 8,
+        children_weights: Sequence[float] = CHILDREN_WEIGHTS,
+        duplicate_id_rate: float = 0.0,
+        invalid_date_rate: float = 0.0,
+        invalid_line_rate: float = 0.0,
+        death_rate: float = 0.3,
+        divorce_rate: float = 0.1,
+        first_year: int = 1700,
+        seed: int = 0
+    ) -> None:
+        self.individual_count: int = individual_count
+        self.generation_count: int = max(1, min(generation_count, individual_count))
+        self.children_weights: Sequence[float] = children_weights
+        self.duplicate_id_rate: float = duplicate_id_rate
+        self.invalid_date_rate: float = invalid_date_rate
+        self.invalid_line_rate: float = invalid_line_rate
+        self.death_rate: float = death_rate
+        self.divorce_rate: float = divorce_rate
+        self.first_year: int = first_year
+        self.seed: int = seed
+
+    def get_generations(self) -> List[Tuple[int, int]]:
+        ''' get individual range of each generation, generations are the same size '''
+        count: int = self.generation_count
+        starts: List[int] = [self.individual_count * g // count for g in range(count + 1)]
+        return list(zip(starts, starts[1:]))
+
+    def plan_families(self, random: Random) -> Tuple[array, array, array, array]:
+        ''' get husband, first child and child count of each family, and the family each individual is a child of
+            husband and wife are consecutive individuals, children are a range of the next generation,
+            families are left without children once the next generation is used up '''
+        husbands: array = array('i')
+        first_children: array = array('i')
+        child_counts: array = array('i')
+        child_of: array = array('i', [-1]) * self.individual_count
+        choices: List[int] = list(range(len(self.children_weights)))
+
+        generations: List[Tuple[int, int]] = self.get_generations()
+        for (start, stop), (next_start, next_stop) in zip(generations, generations[1:] + [(0, 0)]):
+            child: int = next_start
+            for husband in range(start, stop - 1, 2):
+                children: int = random.choices(choices, self.children_weights)[0]
+                children = min(children, next_stop - child)
+                husbands.append(husband)
+                first_children.append(child)
+                child_counts.append(children)
+                for c in range(child, child + children):
+                    child_of[c] = len(husbands) - 1
+                child += children
+
+        return husbands, first_children, child_counts, child_of
+
+    def format_date(self, random: Random, year: int) -> str:
+        if random.random() < self.invalid_date_rate:
+            return f'{random.choice(INVALID_DATES)} {year}'
+
+        return f'{random.randint(1, 28)} {random.choice(MONTHS)} {year}'
+
+    def malform(self, random: Random, lines: List[str]) -> List[str]:
+        ''' replace level-1 lines with malformed lines at invalid_line_rate '''
+        if not self.invalid_line_rate:
+            return lines
+
+        return [MALFORMED_LINES[line.split()[1]] if line[0] == '1' and random.random() < self.invalid_line_rate else line
+                for line in lines]
+
+    def format_id(self, random: Random, prefix: str, number: int) -> str:
+        ''' get record ID, or the ID of the previous record at duplicate_id_rate '''
+        if number and random.random() < self.duplicate_id_rate:
+            number -= 1
+
+        return f'@{prefix}{number}@'
+
+    def write(self, file: TextIO) -> None:
+        ''' write header, individual records, family records and trailer '''
+        random: Random = Random(self.seed)
+        husbands, first_children, child_counts, child_of = self.plan_families(random)
+
+        # family each individual is a spouse of
+        spouse_of: array = array('i', [-1]) * self.individual_count
+        for family, husband in enumerate(husbands):
+            spouse_of[husband] = spouse_of[husband + 1] = family
+
+        generations: List[Tuple[int, int]] = self.get_generations()
+        births: array = array('i', [0]) * self.individual_count
+
+        file.write('0 HEAD\n')
+        for generation, (start, stop) in enumerate(generations):
+            for i in range(start, stop):
+                birth: int = self.first_year + generation * 25 + random.randint(0, 10)
+                births[i] = birth
+                lines: List[str] = [
+                    f'0 {self.format_id(random, "I", i)} INDI',
+                    f'1 NAME Person{i} /Surname{child_of[i] if child_of[i] >= 0 else i}/',
+                    f'1 SEX {"MF"[(i - start) % 2]}',
+                    '1 BIRT',
+                    f'2 DATE {self.format_date(random, birth)}',
+                ]
+                if random.random() < self.death_rate:
+                    lines += ['1 DEAT', f'2 DATE {self.format_date(random, birth + random.randint(1, 90))}']
+                if spouse_of[i] >= 0:
+                    lines.append(f'1 FAMS @F{spouse_of[i]}@')
+                if child_of[i] >= 0:
+                    lines.append(f'1 FAMC @F{child_of[i]}@')
+
+                file.write('\n'.join(self.malform(random, lines)))
+                file.write('\n')
+
+        for family, husband in enumerate(husbands):
+            married: int = max(births[husband], births[husband + 1]) + random.randint(18, 30)
+            lines = [
+                f'0 {self.format_id(random, "F", family)} FAM',
+                f'1 HUSB @I{husband}@',
+                f'1 WIFE @I{husband + 1}@',
+                '1 MARR',
+                f'2 DATE {self.format_date(random, married)}',
+            ]
+            if random.random() < self.divorce_rate:
+                lines += ['1 DIV', f'2 DATE {self.format_date(random, married + random.randint(1, 20))}']
+            lines += [f'1 CHIL @I{child}@' for child in range(first_children[family], first_children[family] + child_counts[family])]
+
+            file.write('\n'.join(self.malform(random, lines)))
+            file.write('\n')
+
+        file.write('0 TRLR\n')
+
+    def write_file(self, path: str) -> None:
+        with open(path, 'w') as file:
+            self.write(file)
+
+
+def main(individual_count: int, path: str, seed: Optional[int] = 0) -> None:
+    GedcomTreeGenerator(individual_count, seed=seed).write_file(path)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]), sys.argv[2], *[int(arg) for arg in sys.argv[3:]])
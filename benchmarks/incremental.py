@@ -0,0 +1,83 @@
+''' benchmark: full parse and validation vs incremental update after editing a single date
+
+    python -m benchmarks.incremental [individual_count]
+
+    the date edit keeps line numbers, the inserted note moves every later record
+'''
+from typing import Callable, List
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import sys
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.incremental import GedcomIncrementalRepository, GedcomUpdate
+from benchmarks.generator import GedcomTreeGenerator
+from index import PIPELINE
+
+
+VALIDATORS: List[Callable] = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+
+
+def edit_date(path: str) -> None:
+    ''' change the year of the DATE line in the middle of the file '''
+    with open(path, 'rb') as file:
+        data: bytes = file.read()
+
+    start: int = data.index(b'2 DATE ', len(data) // 2)
+    end: int = data.index(b'\n', start)
+    year: int = int(data[end - 4:end])
+    with open(path, 'wb') as file:
+        file.write(data[:end - 4] + b'%04d' % (year - 1) + data[end:])
+
+
+def insert_note(path: str) -> None:
+    ''' insert a note record in the middle of the file '''
+    with open(path, 'rb') as file:
+        data: bytes = file.read()
+
+    start: int = data.index(b'\n0 ', len(data) // 2) + 1
+    with open(path, 'wb') as file:
+        file.write(data[:start] + b'0 NOTE inserted\n' + data[start:])
+
+
+def get_subject_count(path: str) -> int:
+    with open(path, 'rb') as file:
+        return sum(1 for line in file if line.startswith(b'0 ') and line.rstrip().endswith((b' INDI', b' FAM')))
+
+
+def measure(name: str, run: Callable[[], GedcomRepository], subject_count: int) -> GedcomRepository:
+    start: float = perf_counter()
+    repo: GedcomRepository = run()
+    repo.run_validations(VALIDATORS)
+    elapsed: float = perf_counter() - start
+    print(f'{name:>12}: {elapsed:9.3f}s {subject_count / elapsed:>14,.0f} subjects/sec')
+    return repo
+
+
+def measure_update(name: str, repo: GedcomIncrementalRepository, subject_count: int) -> None:
+    updates: List[GedcomUpdate] = []
+    measure(name, lambda: updates.append(repo.update()) or repo, subject_count)
+    update: GedcomUpdate = updates[0]
+    print(f'{"":>14}{len(update.parsed)} records parsed, {len(update.moved)} moved, {len(update.removed)} removed')
+
+
+def main(individual_count: int = 50_000) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'tree.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+
+        subject_count: int = get_subject_count(path)
+        measure('full', lambda: read_repository_file(path), subject_count)
+        repo: GedcomRepository = measure('incremental', lambda: GedcomIncrementalRepository(path), subject_count)
+
+        edit_date(path)
+        measure('full', lambda: read_repository_file(path), subject_count)
+        measure_update('date edit', repo, subject_count)
+
+        insert_note(path)
+        measure('full', lambda: read_repository_file(path), subject_count)
+        measure_update('insert', repo, subject_count)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,44 @@
+''' benchmark: reading a file and looking up a few individuals, parsing every subject vs parsing on first access
+
+    python -m benchmarks.lazy [individual_count] [lookup_count]
+'''
+from typing import List, Tuple
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import sys
+from gedcom import GedcomRepository, read_repository_file
+from benchmarks.generator import GedcomTreeGenerator
+
+
+def lookup(repo: GedcomRepository, lookup_count: int) -> List[Tuple]:
+    ''' names, birth dates and families of every n-th individual '''
+    step: int = max(len(repo.individuals) // lookup_count, 1)
+    return [
+        (individual.id, individual.name, individual.birth, [family.id for family in individual.spouse_of_list])
+        for individual in repo.individuals[::step]]
+
+
+def measure(name: str, path: str, lookup_count: int, lazy: bool) -> List[Tuple]:
+    start: float = perf_counter()
+    repo: GedcomRepository = read_repository_file(path, lazy=lazy)
+    ready: float = perf_counter() - start
+    results: List[Tuple] = lookup(repo, lookup_count)
+    elapsed: float = perf_counter() - start
+    print(f'{name:>6}: ready in {ready:.3f}s, {len(results)} lookups done in {elapsed:.3f}s')
+    return results
+
+
+def main(individual_count: int = 100_000, lookup_count: int = 200) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'lazy.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+
+        eager: List[Tuple] = measure('eager', path, lookup_count, False)
+        lazy: List[Tuple] = measure('lazy', path, lookup_count, True)
+
+    print(f'lazy output {"matches" if lazy == eager else "differs"}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
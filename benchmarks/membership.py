@@ -0,0 +1,45 @@
+''' benchmark: parsing records with thousands of CHIL/FAMS lines
+
+    python -m benchmarks.membership [max_member_count]
+
+    time per member line stays flat while duplicate memberships are checked in constant time
+'''
+from typing import List
+from io import StringIO
+from time import perf_counter
+import sys
+from gedcom.file import GedcomLine, get_lines_from_file
+from gedcom.tags import GedcomIndividual, GedcomFamily
+
+
+def get_family_lines(member_count: int) -> List[GedcomLine]:
+    ''' family record with a husband, a wife and member_count children '''
+    rows: List[str] = ['0 @F1@ FAM', '1 HUSB @I0@', '1 WIFE @I1@']
+    rows += [f'1 CHIL @I{n}@' for n in range(2, member_count + 2)]
+    return list(get_lines_from_file(StringIO('\n'.join(rows))))
+
+
+def get_individual_lines(member_count: int) -> List[GedcomLine]:
+    ''' individual record which is a spouse of member_count families '''
+    rows: List[str] = ['0 @I0@ INDI', '1 NAME Person /Surname/', '1 SEX M', '1 FAMC @F0@']
+    rows += [f'1 FAMS @F{n}@' for n in range(1, member_count + 1)]
+    return list(get_lines_from_file(StringIO('\n'.join(rows))))
+
+
+def measure(name: str, subject_class: type, lines: List[GedcomLine], member_count: int) -> None:
+    start: float = perf_counter()
+    subject_class(lines, None)
+    elapsed: float = perf_counter() - start
+    print(f'{name:>10} {member_count:>6} members: {elapsed:.4f}s, {elapsed / member_count * 1e6:.2f}us per line')
+
+
+def main(max_member_count: int = 16_000) -> None:
+    member_count: int = 1_000
+    while member_count <= max_member_count:
+        measure('FAM', GedcomFamily, get_family_lines(member_count), member_count)
+        measure('INDI', GedcomIndividual, get_individual_lines(member_count), member_count)
+        member_count *= 2
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
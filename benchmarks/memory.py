@@ -0,0 +1,42 @@
+''' benchmark: memory held by a parsed repository, keeping lines vs compact subjects
+
+    python -m benchmarks.memory [individual_count]
+
+    memory is measured with tracemalloc once the repository is built, per individual in the file
+'''
+from typing import Callable
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import gc
+import os
+import sys
+import tracemalloc
+from gedcom import GedcomRepository, read_repository_file
+from benchmarks.generator import GedcomTreeGenerator
+
+
+def measure(name: str, read: Callable[[], GedcomRepository], individual_count: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start: float = perf_counter()
+    repo: GedcomRepository = read()
+    elapsed: float = perf_counter() - start
+    gc.collect()
+    size: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{name:>10}: {size / individual_count:8.0f} bytes per individual, '
+          f'{len(repo.individuals)} individuals in {elapsed:.3f}s')
+
+
+def main(individual_count: int = 20_000) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'memory.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+
+        measure('lines', lambda: read_repository_file(path), individual_count)
+        measure('streaming', lambda: read_repository_file(path, streaming=True), individual_count)
+        measure('compact', lambda: read_repository_file(path, compact=True), individual_count)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
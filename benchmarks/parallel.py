@@ -0,0 +1,63 @@
+''' benchmark: parsing a file serially vs in a process pool, with the serial part of the pool split out
+
+    python -m benchmarks.parallel [individual_count] [processes] [expected_cores]
+'''
+from typing import Callable, List, Tuple
+from itertools import accumulate
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import pickle
+import sys
+from gedcom import read_repository_file, read_repository_parallel
+from gedcom.parallel import Shard, get_shard_offsets, count_lines, parse_shard, merge_shards
+from benchmarks.generator import GedcomTreeGenerator
+
+
+def measure(name: str, run: Callable[[], object]) -> float:
+    start: float = perf_counter()
+    run()
+    elapsed: float = perf_counter() - start
+    print(f'{name:>22}: {elapsed:.3f}s')
+    return elapsed
+
+
+def measure_shards(path: str, processes: int) -> None:
+    ''' time each shard on its own, then what the parent does with them, the expected time of a pool of processes
+        is the slowest worker plus the parent '''
+    offsets: List[Tuple[int, int]] = get_shard_offsets(path, processes * 4)
+    line_nos: List[int] = list(accumulate([0] + [count_lines(path, start, stop) for start, stop in offsets][:-1]))
+
+    shard_times: List[float] = []
+    payloads: List[bytes] = []
+    for (start, stop), line_no in zip(offsets, line_nos):
+        started: float = perf_counter()
+        payloads.append(pickle.dumps(parse_shard(path, start, stop, line_no), pickle.HIGHEST_PROTOCOL))
+        shard_times.append(perf_counter() - started)
+
+    # shards are taken by whichever worker is free, in order
+    workers: List[float] = [0.0] * processes
+    for shard_time in shard_times:
+        workers[workers.index(min(workers))] += shard_time
+
+    shards: List[Shard] = []
+    load: float = measure('parent unpickle', lambda: shards.extend(pickle.loads(payload) for payload in payloads))
+    merge: float = measure('parent merge', lambda: merge_shards(shards))
+    print(f'{"shards":>22}: {len(shard_times)}, {sum(map(len, payloads)) / (1 << 20):.1f} MiB sent back, '
+          f'{sum(shard_times):.3f}s of worker time')
+    print(f'{f"expected on {processes} cores":>22}: {max(workers) + load + merge:.3f}s')
+
+
+def main(individual_count: int = 100_000, processes: int = os.cpu_count() or 1, expected_cores: int = 8) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'parallel.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+
+        measure('serial', lambda: read_repository_file(path, mapped=True))
+        measure('serial compact', lambda: read_repository_file(path, compact=True, mapped=True))
+        measure(f'pool of {processes}', lambda: read_repository_parallel(path, processes=processes))
+        measure_shards(path, expected_cores)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
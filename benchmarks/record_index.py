@@ -0,0 +1,55 @@
+''' benchmark: looking up records by ID through the sidecar record index vs parsing the whole file
+
+    python -m benchmarks.record_index [individual_count] [lookup_count]
+
+    lookups are of random individuals with their FAMC and FAMS families, each record read with one seek
+'''
+from typing import List
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import sys
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.record_index import GedcomIndexedRepository, GedcomRecordIndex, open_indexed_repository, write_record_index
+from benchmarks.generator import GedcomTreeGenerator
+
+
+def measure(name: str, elapsed: float, count: int = 1) -> None:
+    print(f'{name:>20}: {elapsed * 1000:10.3f} ms' + (f', {elapsed / count * 1e6:8.1f} us each' if count > 1 else ''))
+
+
+def main(individual_count: int = 100_000, lookup_count: int = 1_000) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'tree.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+
+        start: float = perf_counter()
+        full: GedcomRepository = read_repository_file(path)
+        measure('full parse', perf_counter() - start)
+
+        start = perf_counter()
+        index: GedcomRecordIndex = write_record_index(path)
+        measure('write index', perf_counter() - start)
+        print(f'{"":>22}{os.path.getsize(path + ".idx") / (1 << 20):.1f} MiB sidecar, '
+              f'{os.path.getsize(path) / (1 << 20):.1f} MiB file, {len(index)} records, {len(index.link_targets)} links')
+
+        start = perf_counter()
+        repo: GedcomIndexedRepository = open_indexed_repository(path)
+        measure('open indexed', perf_counter() - start)
+
+        ids: List[str] = Random(0).sample([individual.id for individual in full.individuals], lookup_count)
+        start = perf_counter()
+        for individual_id in ids:
+            repo.individual[individual_id]
+        measure('individual', perf_counter() - start, lookup_count)
+
+        repo = open_indexed_repository(path)
+        start = perf_counter()
+        for individual_id in ids:
+            repo.load_individual_with_families(individual_id)
+        measure('with families', perf_counter() - start, lookup_count)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,119 @@
+''' benchmark: parsing, validators and printers of index.py on synthetic trees of growing size
+
+    python -m benchmarks.scaling [max_individual_count] [duplicate_id_rate] [invalid_date_rate]
+
+    each tree size runs in a fresh process, every stage reports time, individuals/sec and peak RSS
+'''
+from typing import Callable, Iterator, List, Optional, Tuple
+from contextlib import contextmanager, redirect_stdout
+from multiprocessing import get_context
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from time import perf_counter
+import os
+import resource
+import sys
+from benchmarks.generator import GedcomTreeGenerator
+
+
+SIZES: Tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# seconds between RSS samples
+SAMPLE_INTERVAL: float = 0.01
+
+# name, seconds and peak RSS bytes of a stage
+StageResult = Tuple[str, float, int]
+
+
+def get_rss() -> int:
+    ''' get current resident set size in bytes, peak RSS where /proc is not available '''
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        scale: int = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class RssSampler:
+    ''' sample RSS in a background thread to get the peak of a single stage '''
+
+    def __init__(self) -> None:
+        self.peak: int = 0
+        self._stopped: Event = Event()
+        self._thread: Optional[Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, get_rss())
+
+    def __enter__(self) -> 'RssSampler':
+        self.peak = get_rss()
+        self._thread = Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self.peak = max(self.peak, get_rss())
+
+
+@contextmanager
+def measure(results: List[StageResult], name: str) -> Iterator[None]:
+    ''' time stage and sample its peak RSS, output of the stage is discarded '''
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), RssSampler() as sampler:
+        start: float = perf_counter()
+        yield
+        elapsed: float = perf_counter() - start
+
+    results.append((name, elapsed, sampler.peak))
+
+
+def run_stages(path: str) -> List[StageResult]:
+    ''' parse file, then run every step of index.py on its own, in a worker process '''
+    from gedcom import GedcomRepository, read_repository_file
+    from index import PIPELINE
+
+    results: List[StageResult] = []
+    with measure(results, 'read_repository_file'):
+        repo: GedcomRepository = read_repository_file(path)
+
+    for run, step in PIPELINE:
+        with measure(results, step.__name__):
+            run(repo, step)
+
+    validators: List[Callable] = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+    with measure(results, 'run_validations'):
+        repo.run_validations(validators)
+
+    return results
+
+
+def benchmark(individual_count: int, directory: str, **settings) -> List[StageResult]:
+    ''' generate a tree and run stages on it in a fresh process, so peak RSS starts over '''
+    path: str = os.path.join(directory, f'tree-{individual_count}.ged')
+    GedcomTreeGenerator(individual_count, **settings).write_file(path)
+    try:
+        with get_context('spawn').Pool(1) as pool:
+            return pool.apply(run_stages, (path,))
+    finally:
+        os.unlink(path)
+
+
+def main(max_individual_count: int = SIZES[-1], duplicate_id_rate: float = 0.01, invalid_date_rate: float = 0.01) -> None:
+    with TemporaryDirectory() as directory:
+        for individual_count in [size for size in SIZES if size <= max_individual_count]:
+            results: List[StageResult] = benchmark(
+                individual_count, directory,
+                duplicate_id_rate=duplicate_id_rate, invalid_date_rate=invalid_date_rate)
+
+            print(f'{individual_count:,} individuals')
+            for name, elapsed, peak in results:
+                rate: float = individual_count / elapsed if elapsed else float('inf')
+                print(f'{name:>40}: {elapsed:9.3f}s {rate:>14,.0f} individuals/sec {peak / (1 << 20):9,.1f} MiB peak RSS')
+
+
+if __name__ == '__main__':
+    main(*[int(float(arg)) if n == 0 else float(arg) for n, arg in enumerate(sys.argv[1:])])
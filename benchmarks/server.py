@@ -0,0 +1,64 @@
+''' benchmark: latency of server requests on a loaded tree vs loading it
+
+    python -m benchmarks.server [individual_count] [repeat]
+
+    requests go over a Unix socket, or localhost HTTP where Unix sockets are not available
+'''
+from typing import Any, Callable, Dict, List
+from statistics import median
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import perf_counter
+import os
+import socket
+import sys
+from gedcom.server import GedcomServer, make_server
+from benchmarks.generator import GedcomTreeGenerator
+from client import send_request
+from index import PIPELINE
+
+
+def measure(name: str, request: Callable[[], Dict[str, Any]], repeat: int = 1) -> Dict[str, Any]:
+    times: List[float] = []
+    for _ in range(repeat):
+        start: float = perf_counter()
+        response: Dict[str, Any] = request()
+        times.append(perf_counter() - start)
+
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+
+    print(f'{name:>16}: {median(times) * 1000:10.2f} ms median of {repeat}')
+    return response
+
+
+def main(individual_count: int = 100_000, repeat: int = 20) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'tree.ged')
+        GedcomTreeGenerator(individual_count).write_file(path)
+
+        address: str = f'unix:{os.path.join(directory, "gedcom.sock")}' \
+            if hasattr(socket, 'AF_UNIX') else 'http://127.0.0.1:0'
+        gedcom: GedcomServer = GedcomServer(PIPELINE)
+        server = make_server(gedcom, address)
+        if address.startswith('http'):
+            address = f'http://127.0.0.1:{server.server_address[1]}'
+
+        Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            request = lambda command, **kwargs: lambda: send_request({'command': command, 'path': path, **kwargs}, address)
+            measure('load', request('load'))
+            measure('validate (cold)', request('validate'))
+            response: Dict[str, Any] = measure('validate (warm)', request('validate'), repeat)
+            print(f'{"":>18}{sum(result["count"] for result in response["results"])} errors')
+            measure('validate (limit)', request('validate', limit=10), repeat)
+            measure('query', request('query', ids=['@I1@', '@I2@', '@F1@']), repeat)
+            measure('status', request('status'), repeat)
+        finally:
+            server.shutdown()
+            server.server_close()
+            gedcom.close()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
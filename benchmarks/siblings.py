@@ -0,0 +1,60 @@
+''' benchmark: US13 sibling spacing, all-pairs comparison vs birth-sorted window
+
+    python -m benchmarks.siblings [children_per_family] [family_count]
+'''
+from typing import Callable, List
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import sys
+from gedcom import GedcomRepository, read_repository_file
+from features.parents_too_old import month_diff, sibling_spacing, sibling_spacing_compatible
+from benchmarks.generator import GedcomTreeGenerator
+
+
+def all_pairs_sibling_spacing(repo: GedcomRepository) -> List[str]:
+    ''' US13 as it was, comparing every child with every other child '''
+    errors: List[str] = []
+    for family in repo.families:
+        children = family.children
+        for child in children:
+            for child2 in children:
+                if child is child2 or not child.birth or not child2.birth:
+                    continue
+
+                month_d = month_diff(child.birth, child2.birth)
+                are_twins = abs((child2.birth - child.birth).days) < 2
+                if month_d <= 8 and not are_twins:
+                    errors.append(f'ERROR US13: Child({child.id}) was born too close in time to another sibling({child2.id}). (at line {child.birth_line_no})')
+
+    return errors
+
+
+def measure(name: str, validator: Callable, repo: GedcomRepository) -> List[str]:
+    start: float = perf_counter()
+    errors: List[str] = validator(repo)
+    elapsed: float = perf_counter() - start
+    print(f'{name:>12}: {len(errors)} errors in {elapsed:.3f}s')
+    return errors
+
+
+def main(children_per_family: int = 300, family_count: int = 100) -> None:
+    # first generation families get children_per_family children until the second generation is used up
+    weights: List[int] = [0] * children_per_family + [1]
+    generator: GedcomTreeGenerator = GedcomTreeGenerator(
+        2 * family_count * children_per_family, generation_count=2, children_weights=weights)
+
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'siblings.ged')
+        generator.write_file(path)
+        repo: GedcomRepository = read_repository_file(path)
+
+    print(f'{family_count} families of {children_per_family} children')
+    all_pairs: List[str] = measure('all pairs', all_pairs_sibling_spacing, repo)
+    compatible: List[str] = measure('compatible', sibling_spacing_compatible, repo)
+    measure('sorted', sibling_spacing, repo)
+    print(f'compatible output {"matches" if compatible == all_pairs else "differs"}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,68 @@
+''' benchmark: text tokenizer vs memory-mapped byte tokenizer
+
+    python -m benchmarks.tokenizer [line_count]
+'''
+from typing import Callable, Iterator
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import sys
+from gedcom.file import GedcomLine, get_lines_from_path
+
+
+RECORD_LINES = (
+    '0 @I{n}@ INDI',
+    '1 NAME Person{n} /Surname{m}/',
+    '1 SEX M',
+    '1 BIRT',
+    '2 DATE 1 JAN 1900',
+    '1 FAMS @F{n}@',
+    '1 FAMC @F{m}@',
+)
+
+
+def write_synthetic_file(path: str, line_count: int) -> None:
+    ''' write a GEDCOM file of individual records with about line_count lines '''
+    with open(path, 'w') as file:
+        file.write('0 HEAD\n')
+        for n in range(line_count // len(RECORD_LINES)):
+            for line in RECORD_LINES:
+                file.write(line.format(n=n, m=n // 3))
+                file.write('\n')
+        file.write('0 TRLR\n')
+
+
+def consume(lines: Iterator[GedcomLine]) -> int:
+    ''' exhaust line generator, touching the fields a parse reads '''
+    count: int = 0
+    for line in lines:
+        # tags and levels are read for every line, arguments for some
+        if line.level and line.tag == 'FAMS':
+            line.arguments
+        count += 1
+
+    return count
+
+
+def measure(name: str, read: Callable[[], Iterator[GedcomLine]]) -> float:
+    ''' print and return lines/sec of a reader '''
+    start: float = perf_counter()
+    count: int = consume(read())
+    elapsed: float = perf_counter() - start
+    print(f'{name:>8}: {count} lines in {elapsed:.2f}s, {count / elapsed:,.0f} lines/sec')
+    return count / elapsed
+
+
+def main(line_count: int = 10_000_000) -> None:
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'synthetic.ged')
+        write_synthetic_file(path, line_count)
+        print(f'synthetic file: {os.path.getsize(path):,} bytes')
+
+        text_rate: float = measure('text', lambda: get_lines_from_path(path))
+        mapped_rate: float = measure('mapped', lambda: get_lines_from_path(path, mapped=True))
+        print(f'speedup: {mapped_rate / text_rate:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
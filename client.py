@@ -0,0 +1,85 @@
+''' client of server.py, prompts for a GEDCOM file and prints what index.py prints for it
+
+    python client.py [command] [path]
+
+    only the standard library is imported, so starting the client costs no parsing or gedcom imports
+    GEDCOM_SERVER=unix:{path} or http://{host}:{port} is the address of the server
+'''
+from typing import Any, Dict
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+def get_default_socket_path() -> str:
+    ''' socket of the current user, servers of other users sharing the temporary directory are not reached '''
+    directory: str = os.environ.get('XDG_RUNTIME_DIR') or ''
+    if directory:
+        return os.path.join(directory, 'gedcom.sock')
+
+    return os.path.join(tempfile.gettempdir(), f'gedcom-{os.getuid()}.sock' if hasattr(os, 'getuid') else 'gedcom.sock')
+
+
+DEFAULT_SERVER_ADDRESS: str = f'unix:{get_default_socket_path()}' if hasattr(socket, 'AF_UNIX') else 'http://127.0.0.1:8765'
+
+# seconds to wait for an answer, loading a large file takes a while
+REQUEST_TIMEOUT: float = 600.0
+
+
+def get_server_address() -> str:
+    return os.environ.get('GEDCOM_SERVER') or DEFAULT_SERVER_ADDRESS
+
+
+def send_request(request: Dict[str, Any], address: str = '') -> Dict[str, Any]:
+    ''' send JSON request to server at address, return its JSON response '''
+    address = address or get_server_address()
+    body: bytes = json.dumps(request).encode()
+    if address.startswith('unix:'):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(REQUEST_TIMEOUT)
+            connection.connect(address[len('unix:'):])
+            connection.sendall(body + b'\n')
+            with connection.makefile('rb') as file:
+                return json.loads(file.readline())
+
+    url = urlsplit(address)
+    connection: HTTPConnection = HTTPConnection(url.hostname, url.port or 80, timeout=REQUEST_TIMEOUT)
+    try:
+        connection.request('POST', '/', body, {'Content-Type': 'application/json'})
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def prompt_input_file(prompt_message: str, default_file_path: str = '') -> str:
+    ''' prompt for file path input like gedcom.file.prompt_input_file() '''
+    return input(prompt_message) or default_file_path
+
+
+def main(command: str = 'report', path: str = '') -> int:
+    path = path or prompt_input_file('Enter GEDCOM file (i.g. "test.ged" or "./test.ged"): ', 'test.ged')
+    try:
+        response: Dict[str, Any] = send_request({'command': command, 'path': os.path.abspath(path)})
+    except OSError as e:
+        print(f'Cannot reach GEDCOM server at {get_server_address()} ({e}), start it with python server.py',
+              file=sys.stderr)
+        return 1
+
+    if 'error' in response:
+        print(response['error'], file=sys.stderr)
+        return 1
+
+    if command == 'report':
+        print(response['text'], end='')
+    else:
+        print(json.dumps(response, indent=2))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
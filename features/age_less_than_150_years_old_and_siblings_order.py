@@ -1,22 +1,33 @@
 from typing import List, Tuple
 from collections import defaultdict
+from datetime import date as Date
 from gedcom import GedcomRepository
 from gedcom.pretty_table import pretty_print_individuals
+from gedcom.validation import ValidationRule, individual_hook, columns_hook, as_validator, TREE_SCOPE
 
 
-def age_and_age_at_death(repo):
+class AgeAndAgeAtDeath(ValidationRule):
     '''US07'''
-    errors = []
-    individuals_by_combination: Dict[Tuple[str],
-                                     List[GedcomIndividual]] = defaultdict(list)
-    for individual in repo.individuals:
+    # errors depend on the current date
+    scope = TREE_SCOPE
+
+    @individual_hook
+    def check_individual(self, individual):
         individual_age = individual.age
 
         if individual_age and individual_age >= 150:
-            errors.append(
-                f'ERROR US07: Individual({individual.id}) is older than 150 years old ({individual.age}) (at line {individual.birth_line_no})')
+            yield f'ERROR US07: Individual({individual.id}) is older than 150 years old ({individual.age}) (at line {individual.birth_line_no})'
+
+    @columns_hook(check_individual)
+    def check_individual_columns(self, columns):
+        ages = columns.ages_at(Date.today())
+
+        for row in columns.rows(columns.birth_known & (ages >= 150)):
+            individual = columns.individuals[row]
+            yield f'ERROR US07: Individual({individual.id}) is older than 150 years old ({ages[row]}) (at line {individual.birth_line_no})'
+
 
-    return errors
+age_and_age_at_death = as_validator(AgeAndAgeAtDeath, 'age_and_age_at_death')
 
 
 def order_siblings_by_age(repo):
@@ -1,48 +1,52 @@
-from typing import List, Tuple
+from typing import List, Tuple, Iterator
 from collections import defaultdict
 from gedcom import GedcomRepository
+from gedcom.tags import GedcomIndividual, GedcomFamily
+from gedcom.validation import ValidationRule, individual_hook, family_hook, columns_hook, as_validator, LINKED_SCOPE, SUBJECT_SCOPE
 
 
-def birth_before_marriage(repo: GedcomRepository) -> List[str]:
+class BirthBeforeMarriage(ValidationRule):
   ''' US02: Birth should occur before marriage of an individual '''
-  invalid_marriage: List[Tuple[str]] = []
+  scope = LINKED_SCOPE
 
-  errors: List[str] = []
-
-  for family in repo.families:
+  @family_hook
+  def check_family(self, family: GedcomFamily) -> Iterator[str]:
     marriage_date: Date = family.marriage
 
     if not marriage_date:
-      continue
+      return
 
     for husband in family.husbands:
       if husband.birth and marriage_date < husband.birth:
-        errors.append(
-            f'ERROR US02 at line {husband.sex_line_no}: Husband ({husband.id}) in family({family.id}) married before being born')
+        yield f'ERROR US02 at line {husband.sex_line_no}: Husband ({husband.id}) in family({family.id}) married before being born'
 
     for wife in family.wifes:
       if wife.birth and marriage_date < wife.birth:
-        errors.append(
-            f'ERROR US02 at line {wife.sex_line_no}: Wife ({wife.id}) in family({family.id}) married before being born')
+        yield f'ERROR US02 at line {wife.sex_line_no}: Wife ({wife.id}) in family({family.id}) married before being born'
+
 
-  return errors
+birth_before_marriage = as_validator(BirthBeforeMarriage, 'birth_before_marriage')
 
 
-def birth_before_death(repo: GedcomRepository) -> List[str]:
+class BirthBeforeDeath(ValidationRule):
   ''' US03: Birth should occur before death of an individual '''
-  invalid_death: List[Tuple[str]] = []
+  scope = SUBJECT_SCOPE
+
+  @individual_hook
+  def check_individual(self, individual: GedcomIndividual) -> Iterator[str]:
+    birthday: Date = individual.birth
+    death_date: Date = individual.death
+
+    # check individual is born before they die
+    if death_date and birthday and death_date < birthday:
+      yield f'ERROR US03 at line {individual.death_line_no}: Individual ({individual.id}) died before being born'
 
-  for individual in repo.individuals:
-      birthday: Date = individual.birth
-      death_date: Date = individual.death
+  @columns_hook(check_individual)
+  def check_individual_columns(self, columns) -> Iterator[str]:
+    died_before_born = columns.birth_known & columns.death_known & (columns.death_ordinal < columns.birth_ordinal)
 
-  # check individual is born before they die
-      if death_date and birthday and death_date < birthday:
-          invalid_death.append((individual, 'Individual'))
+    for individual in columns.select(died_before_born):
+      yield from self.check_individual(individual)
 
-  errors: List[str] = []
-  for individual, role in invalid_death:
-    errors.append(
-        f'ERROR US03 at line {individual.death_line_no}: Individual ({individual.id}) died before being born')
 
-  return errors
+birth_before_death = as_validator(BirthBeforeDeath, 'birth_before_death')
@@ -1,51 +1,55 @@
 from datetime import date as Date
 from gedcom import GedcomRepository
+from gedcom.validation import ValidationRule, family_hook, as_validator, LINKED_SCOPE
 
-def birth_before_parents_marriage(repo: GedcomRepository):
+
+class BirthBeforeParentsMarriage(ValidationRule):
     """ US08 Individual birth date should occur after parents marriage date """
-    errors = []
-    for family in repo.families:
+    scope = LINKED_SCOPE
+
+    @family_hook
+    def check_family(self, family):
         marriage_date = family.marriage
+        children = family.children
 
-        if len(family.children) == 0:
-            continue
+        if len(children) == 0:
+            return
 
         if not marriage_date:
-            continue
+            return
 
-        for child in family.children:
+        for child in children:
             if child.birth and child.birth < marriage_date:
-                errors.append(
-                    f"ANOMALY US08: Birth date (at line {child.birth_line_no}) for Individual({child.id}) in Family({family.id}) occurs before parent's marriage date (at line {family.marriage_line_no}).")
-    
-    return errors
+                yield f"ANOMALY US08: Birth date (at line {child.birth_line_no}) for Individual({child.id}) in Family({family.id}) occurs before parent's marriage date (at line {family.marriage_line_no})."
+
+
+birth_before_parents_marriage = as_validator(BirthBeforeParentsMarriage, 'birth_before_parents_marriage')
 
-def birth_before_parents_death(repo: GedcomRepository):
+
+class BirthBeforeParentsDeath(ValidationRule):
     """ US09 Individual birth date should occur before parents death date """
-    errors = []
-    for family in repo.families:
-        father = family.husband
-        mother = family.wife
+    scope = LINKED_SCOPE
+
+    @family_hook
+    def check_family(self, family):
+        children = family.children
+        fathers = family.husbands
+        mothers = family.wifes
 
-        if len(family.children) == 0:
-            continue
+        if len(children) == 0:
+            return
 
-        for child in family.children:
+        for child in children:
             if not child.birth:
                 continue
 
-            for father in family.husbands:
+            for father in fathers:
                 if father.death and father.death < child.birth:
-                    errors.append(
-                        f"ERROR US09: Birth date (at line {child.birth_line_no}) for Individual({child.id}) in Family({family.id}) occurs after Father's({father.id}) death date (at line {father.death_line_no}).")
-            
-            for mother in family.wifes:
+                    yield f"ERROR US09: Birth date (at line {child.birth_line_no}) for Individual({child.id}) in Family({family.id}) occurs after Father's({father.id}) death date (at line {father.death_line_no})."
+
+            for mother in mothers:
                 if mother.death and mother.death < child.birth:
-                    errors.append(
-                        f"ERROR US09: Birth date (at line {child.birth_line_no}) for Individual({child.id}) in Family({family.id}) occurs after Mother's({mother.id}) death date (at line {mother.death_line_no}).")
-    
-    return errors
-            
+                    yield f"ERROR US09: Birth date (at line {child.birth_line_no}) for Individual({child.id}) in Family({family.id}) occurs after Mother's({mother.id}) death date (at line {mother.death_line_no})."
 
-            
 
+birth_before_parents_death = as_validator(BirthBeforeParentsDeath, 'birth_before_parents_death')
@@ -0,0 +1,65 @@
+from os.path import abspath
+from tempfile import TemporaryDirectory
+import os
+import shutil
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.cache import GedcomRepositoryCache
+from gedcom.exceptions import GedcomException
+from gedcom.testing import GedcomTestCase
+
+
+class RepositoryCacheTest(GedcomTestCase):
+
+    def assert_same_repository(self, repo: GedcomRepository, cached: GedcomRepository) -> None:
+        self.assertEqual(
+            [(l.line_no, l.data, l.status) for l in repo.lines],
+            [(l.line_no, l.data, l.status) for l in cached.lines])
+        self.assertEqual(
+            [(i.id, i.line_no, i.birth, [f.id for f in i.spouse_of_list]) for i in repo.individuals],
+            [(i.id, i.line_no, i.birth, [f.id for f in i.spouse_of_list]) for i in cached.individuals])
+        self.assertEqual(
+            [(f.id, [c.id for c in f.children]) for f in repo.families],
+            [(f.id, [c.id for c in f.children]) for f in cached.families])
+
+    def test_cached_repository(self) -> None:
+        """ test repository loaded from cache matches parsed repository """
+        with TemporaryDirectory() as directory:
+            cache: GedcomRepositoryCache = GedcomRepositoryCache(directory)
+            path: str = abspath('./test_files/test.ged')
+            repo: GedcomRepository = read_repository_file(path)
+
+            self.assertIsNone(cache.load(path))
+            read_repository_file(path, cache=cache)
+            cached: GedcomRepository = cache.load(path)
+            self.assertIsNotNone(cached)
+            self.assert_same_repository(repo, cached)
+
+            # same content at another path shares the snapshot
+            copy_path: str = os.path.join(directory, 'copy.ged')
+            shutil.copyfile(path, copy_path)
+            copied: GedcomRepository = cache.load(copy_path)
+            self.assertEqual(copy_path, copied.lines.source)
+            self.assert_same_repository(repo, copied)
+
+            # changed content misses the cache
+            with open(copy_path, 'a') as file:
+                file.write('0 NOTE changed\n')
+            self.assertIsNone(cache.load(copy_path))
+
+    def test_cache_eviction(self) -> None:
+        """ test least recently used snapshots are evicted over size limit """
+        with TemporaryDirectory() as directory:
+            cache: GedcomRepositoryCache = GedcomRepositoryCache(directory, size_limit=0)
+            path: str = abspath('./test_files/test.ged')
+            read_repository_file(path, cache=cache)
+            self.assertIsNone(cache.load(path))
+
+    def test_unsupported_modes(self) -> None:
+        """ test modes which are not cached or not combined raise instead of being ignored """
+        path: str = abspath('./test_files/test.ged')
+        for kwargs in ({'lazy': True}, {'compact': True}, {'streaming': True}):
+            with self.assertRaises(GedcomException):
+                read_repository_file(path, cache=True, **kwargs)
+
+        with self.assertRaises(GedcomException):
+            read_repository_file(path, lazy=True, compact=True)
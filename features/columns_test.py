@@ -0,0 +1,74 @@
+from unittest import skipUnless
+from unittest.mock import patch
+from datetime import date as Date
+from gedcom.columns import np
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine
+from features.valid_dates import dates_before_current_date
+from features.birth_before import birth_before_death
+from features.age_less_than_150_years_old_and_siblings_order import age_and_age_at_death
+from features.multiple_births import siblings_born_at_same_time, too_many_siblings
+from features.parents_too_old import sibling_spacing
+from features.list_of_living_single_and_multiple_births import list_multiple_births
+
+
+@skipUnless(np is not None, 'NumPy is not installed')
+class ColumnsTest(GedcomTestCase):
+
+    def test_columns(self) -> None:
+        """ test date columns match dates of individuals """
+        repo = self.parse_test_file('age_greater_than_150_years_old')
+        columns = repo.individual_columns
+        present: Date = Date.today()
+
+        self.assertIs(columns, repo.individual_columns)
+        self.assertEqual(len(columns), len(repo.individuals))
+        for row, individual in enumerate(repo.individuals):
+            self.assertEqual(bool(columns.birth_known[row]), individual.birth is not None)
+            self.assertEqual(bool(columns.death_known[row]), individual.death is not None)
+            self.assertEqual(columns.birth_ordinal[row], individual.birth_ordinal or 0)
+            self.assertEqual(columns.death_ordinal[row], individual.death_ordinal or 0)
+            if individual.birth:
+                self.assertEqual(columns.ages_at(present)[row], individual.age_at(present))
+
+    def test_columns_hooks(self) -> None:
+        """ test rules checking all individuals at once report the same errors as visiting each individual """
+        validators = [dates_before_current_date, birth_before_death, age_and_age_at_death]
+        for file_name in ('Invalid_future_dates', 'incorrect_birth_death', 'age_greater_than_150_years_old'):
+            repo = self.parse_test_file(file_name)
+            results = ValidationEngine(validators).run(repo)
+
+            # a repository without columns visits each individual
+            repo._individual_columns = None
+            with patch('gedcom.repository.get_individual_columns', return_value=None):
+                expected = ValidationEngine(validators).run(repo)
+
+            for validator in validators:
+                self.assertEqual(results[validator].errors, expected[validator].errors)
+
+    def test_family_columns(self) -> None:
+        """ test children entries of family columns follow family.children """
+        repo = self.parse_test_file('incorrect_siblings_born_at_same_time')
+        columns = repo.family_columns
+
+        self.assertIs(columns, repo.family_columns)
+        self.assertEqual(len(columns), len(repo.families))
+        for row, family in enumerate(repo.families):
+            entries = range(columns.offsets[row], columns.offsets[row + 1])
+            self.assertEqual([columns.get_child(entry) for entry in entries], family.children)
+
+    def test_family_columns_hooks(self) -> None:
+        """ test rules checking all families at once report the same errors as visiting each family """
+        validators = [siblings_born_at_same_time, too_many_siblings, sibling_spacing]
+        for file_name in ('incorrect_siblings_born_at_same_time', 'incorrect_too_many_siblings', 'incorrect_sibling_spacing', 'list_of_multiple_births'):
+            repo = self.parse_test_file(file_name)
+            results = ValidationEngine(validators).run(repo)
+            multiple_births = list_multiple_births(repo)
+
+            repo._family_columns = None
+            with patch('gedcom.repository.get_family_columns', return_value=None):
+                expected = ValidationEngine(validators).run(repo)
+                self.assertEqual(multiple_births, list_multiple_births(repo))
+
+            for validator in validators:
+                self.assertEqual(results[validator].errors, expected[validator].errors)
@@ -0,0 +1,63 @@
+from os.path import abspath
+from io import StringIO
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.file import get_lines_from_file
+from gedcom.tags import GedcomCompactIndividual, GedcomCompactFamily
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine
+from features.parents_too_old import parents_too_old, sibling_spacing
+from features.multiple_births import siblings_born_at_same_time
+from features.id_validations import unique_ids
+from features.streaming_test import run_pipeline
+
+
+class CompactTest(GedcomTestCase):
+
+    def parse_compact_test_file(self, file_name: str) -> GedcomRepository:
+        return read_repository_file(abspath(f'./test_files/{file_name}.ged'), compact=True)
+
+    def test_compact_repository(self) -> None:
+        """ test compact parse matches list parse without keeping lines """
+        repo: GedcomRepository = self.parse_test_file('test')
+        compact: GedcomRepository = self.parse_compact_test_file('test')
+
+        self.assertIsNone(compact.lines)
+        self.assertTrue(all(isinstance(i, GedcomCompactIndividual) and not i.lines for i in compact.individuals))
+        self.assertTrue(all(isinstance(f, GedcomCompactFamily) and not f.lines for f in compact.families))
+        self.assertEqual(
+            [(i.id, i.line_no, i.name, i.birth, i.birth_line_no, i.spouse_of_id_list) for i in repo.individuals],
+            [(i.id, i.line_no, i.name, i.birth, i.birth_line_no, i.spouse_of_id_list) for i in compact.individuals])
+        self.assertEqual(
+            [(f.id, f.line_no, f.husband_id, f.children_id_list, f.children_line_no_list) for f in repo.families],
+            [(f.id, f.line_no, f.husband_id, f.children_id_list, f.children_line_no_list) for f in compact.families])
+        self.assertEqual(
+            [f.id for f in compact.individual['I03'].spouse_of_list], [f.id for f in repo.individual['I03'].spouse_of_list])
+
+    def test_compact_errors(self) -> None:
+        """ test properties raise the errors they raised while parsed """
+        lines = get_lines_from_file(StringIO('0 I1 INDI\n1 SEX M\n1 BIRT Y\n2 DATE 1 JAN 2000\n1 FAMS F1\n0 TRLR'))
+        repo: GedcomRepository = GedcomRepository(lines, keep_lines=False, compact=True)
+        individual: GedcomCompactIndividual = repo.individual['I1']
+
+        self.assertEqual(individual.sex, 'M')
+        self.assertEqual(individual.birth_line_no, 3)
+        self.assertTrue(individual.is_member_of('F1'))
+        with self.assertRaises(AttributeError):
+            individual.name
+        # an event rejected before its DATE line has no date
+        self.assertIsNone(individual.birth)
+
+    def test_compact_validation(self) -> None:
+        """ test validators report the same errors on compact subjects """
+        validators = [parents_too_old, sibling_spacing, siblings_born_at_same_time, unique_ids]
+        for file_name in ('incorrect_parents_too_old', 'incorrect_sibling_spacing', 'not_unique_ids'):
+            expected = ValidationEngine(validators).run(self.parse_test_file(file_name))
+            results = ValidationEngine(validators).run(self.parse_compact_test_file(file_name))
+            for validator in validators:
+                self.assertEqual(results[validator].errors, expected[validator].errors)
+
+    def test_compact_pipeline(self) -> None:
+        """ test every validator and printer of index.py prints the same on compact subjects """
+        for file_name in ('test', 'illegitimate_dates', 'List_of_deceased', 'incorrect_parents_too_old'):
+            self.assertEqual(run_pipeline(self.parse_compact_test_file(file_name)),
+                             run_pipeline(self.parse_test_file(file_name)), file_name)
@@ -0,0 +1,36 @@
+from io import StringIO
+from typing import List
+from datetime import date as Date
+from gedcom.file import get_lines_from_file
+from gedcom.tags import GedcomIndividual
+from gedcom.dates import to_ordinal, years_between, years_apart, months_between, anniversary
+from gedcom.testing import GedcomTestCase
+
+
+class DatesTest(GedcomTestCase):
+
+    def test_ordinals(self) -> None:
+        """ test day numbers match date ordinals """
+        for date in (Date(1, 1, 1), Date(1900, 2, 28), Date(1900, 3, 1), Date(2000, 2, 29), Date(2000, 12, 31), Date(2023, 7, 4)):
+            self.assertEqual(to_ordinal(date.year, date.month, date.day), date.toordinal())
+
+    def test_leap_day(self) -> None:
+        """ test leap day anniversaries fall on Mar 1 in common years """
+        self.assertEqual(anniversary((2000, 2, 29), 14), (2014, 3, 1))
+        self.assertEqual(anniversary((2000, 2, 29), 4), (2004, 2, 29))
+        self.assertEqual(years_between((2000, 2, 29), (2014, 2, 28)), 13)
+        self.assertEqual(years_between((2000, 2, 29), (2014, 3, 1)), 14)
+        self.assertEqual(years_apart((2014, 3, 1), (2000, 2, 29)), 14)
+        self.assertEqual(months_between((2000, 1, 31), (2000, 2, 29)), 0)
+        self.assertEqual(months_between((2000, 1, 31), (2000, 3, 1)), 1)
+
+    def test_age_at_leap_day(self) -> None:
+        """ test age of individual born on a leap day """
+        lines: str = '\n'.join(['0 I1 INDI', '1 BIRT', '2 DATE 29 FEB 2000', '1 DEAT', '2 DATE 1 MAR 2015'])
+        individual: GedcomIndividual = GedcomIndividual(list(get_lines_from_file(StringIO(lines))), None)
+
+        self.assertEqual(individual.birth_ordinal, Date(2000, 2, 29).toordinal())
+        self.assertEqual(individual.birth_ymd, (2000, 2, 29))
+        self.assertEqual(individual.age_at(Date(2014, 2, 28)), 13)
+        self.assertEqual(individual.age_at(Date(2014, 3, 1)), 14)
+        self.assertEqual(individual.age_at(Date(2020, 1, 1)), 15)
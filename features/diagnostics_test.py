@@ -0,0 +1,104 @@
+from os.path import abspath
+from io import StringIO
+from tempfile import TemporaryDirectory
+import os
+from gedcom import GedcomRepository, read_repository_file, read_repository_parallel
+from gedcom.file import get_lines_from_file
+from gedcom.testing import GedcomTestCase
+
+
+INVALID_FILE: str = '''0 HEAD
+0 I1 INDI
+1 NAME
+1 SEX X
+1 BIRT Y
+2 DATE 1 JAN 2000
+1 FAMS F1
+1 FAMS F1
+0 F1 FAM
+1 HUSB I1
+1 HUSB I1
+1 MARR
+2 DATE 30 FEB 2020
+0 TRLR'''
+
+
+class DiagnosticsTest(GedcomTestCase):
+
+    def parse_invalid_file(self, **kwargs) -> GedcomRepository:
+        return GedcomRepository(get_lines_from_file(StringIO(INVALID_FILE)), **kwargs)
+
+    def test_diagnostics(self) -> None:
+        """ test invalid lines are recorded with line number, tag and reason instead of raising """
+        repo: GedcomRepository = self.parse_invalid_file()
+
+        self.assertEqual(list(repo.diagnostics), [
+            (3, 'NAME', 'single argument required'),
+            (4, 'SEX', 'M or F required'),
+            (5, 'BIRT', 'event no argumets allowed'),
+            (8, 'FAMS', 'Duplicate family membership for individual'),
+            (11, 'HUSB', 'Duplicate family husband'),
+            (13, 'DATE', 'invalid date')])
+        self.assertEqual(repo.diagnostics.get_line_reasons()[4], ['M or F required'])
+        self.assertEqual(repo.diagnostics.get_reason_counts()['invalid date'], 1)
+
+    def test_diagnostics_subjects(self) -> None:
+        """ test subjects keep their valid lines and rejected lines are not validated """
+        repo: GedcomRepository = self.parse_invalid_file()
+
+        self.assertEqual([i.id for i in repo.individuals], ['I1'])
+        self.assertEqual([f.id for f in repo.families], ['F1'])
+        self.assertEqual(repo.individual['I1'].spouse_of_id_list, ['F1'])
+        self.assertEqual(repo.family['F1'].husband_line_no, 10)
+        self.assertEqual(
+            [l.line_no for l in repo.lines if l.tag in ('NAME', 'SEX', 'FAMS', 'HUSB') and not l.validated], [3, 4, 8, 11])
+
+    def test_diagnostics_modes(self) -> None:
+        """ test every parse mode records the same diagnostics """
+        expected = list(self.parse_invalid_file().diagnostics)
+        for kwargs in ({'keep_lines': False}, {'lazy': True}, {'compact': True}):
+            repo: GedcomRepository = self.parse_invalid_file(**kwargs)
+            self.assertEqual(sorted(repo.diagnostics), expected, kwargs)
+
+    def test_lazy_diagnostics(self) -> None:
+        """ test lazy diagnostics list every rejected line in line order, whichever subjects were accessed """
+        repo: GedcomRepository = self.parse_invalid_file(lazy=True)
+        repo.family['F1'].husband_line_no
+
+        self.assertEqual(list(repo.diagnostics), list(self.parse_invalid_file().diagnostics))
+        self.assertTrue(repo.individual['I1'].parsed)
+
+    def test_parallel_diagnostics(self) -> None:
+        """ test parallel parse records the diagnostics of serial parse """
+        for name in ['test', 'not_unique_ids']:
+            repo: GedcomRepository = self.parse_test_file(name)
+            parallel: GedcomRepository = read_repository_parallel(
+                abspath(f'./test_files/{name}.ged'), processes=2, shard_count=8)
+
+            self.assertEqual(list(repo.diagnostics), list(parallel.diagnostics))
+
+    def test_misplaced_id_tag(self) -> None:
+        """ test ID lines with the tag before the ID are rejected by every reader, without reading the file back """
+        with TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'misplaced.ged')
+            with open(path, 'w') as file:
+                file.write('0 HEAD\n0 INDI I1\n1 NAME A /B/\n0 I2 INDI\n1 NAME C /D/\n0 TRLR\n')
+
+            for kwargs in ({}, {'mapped': True}, {'streaming': True}, {'lazy': True}, {'compact': True}):
+                repo: GedcomRepository = read_repository_file(path, **kwargs)
+                self.assertEqual([i.id for i in repo.individuals], ['I2'], kwargs)
+                self.assertEqual(list(repo.diagnostics), [(2, 'INDI', 'Incorrect INDI format')], kwargs)
+                if repo.lines is not None:
+                    self.assertIsNone(repo.lines._source_file, kwargs)
+
+    def test_event_without_date(self) -> None:
+        """ test events rejected before their DATE line have no date in every parse mode """
+        lines: str = '0 HEAD\n0 I1 INDI\n1 NAME A /B/\n1 BIRT\n1 SEX M\n1 DEAT Y\n2 DATE 1 JAN 2000\n0 TRLR'
+        for kwargs in ({}, {'keep_lines': False}, {'lazy': True}, {'compact': True}):
+            repo: GedcomRepository = GedcomRepository(get_lines_from_file(StringIO(lines)), **kwargs)
+            individual = repo.individual['I1']
+            self.assertEqual(
+                (individual.birth, individual.birth_ordinal, individual.birth_ymd, individual.death, individual.death_ymd),
+                (None, None, None, None, None), kwargs)
+            self.assertEqual(sorted(repo.diagnostics),
+                             [(4, 'BIRT', 'event DATE line missing'), (6, 'DEAT', 'event no argumets allowed')], kwargs)
@@ -1,3 +1,4 @@
+from gedcom.references import GedcomReferenceIndex
 from gedcom.testing import GedcomTestCase
 from features.id_validations import unique_ids, corresponding_entries
 
@@ -33,3 +34,13 @@ class IdValidationsTest(GedcomTestCase):
             ])
 
         self.assert_file_validation_passes('valid_ids', corresponding_entries)
+
+    def test_reference_index(self) -> None:
+        """ test dangling and one-sided references """
+        repo = self.parse_test_file('not_corresponding_entries')
+        references = GedcomReferenceIndex(repo.individuals, repo.families)
+
+        self.assertEqual(
+            [(subject.id, tag, id, line_no, target and target.line_no) for subject, tag, id, line_no, target in references.broken_members()],
+            [('F01', 'CHIL', 'I06', 78, 48), ('F04', 'HUSB', 'I12', 100, None),
+             ('F04', 'WIFE', 'I01', 99, 3), ('F04', 'CHIL', 'I13', 101, None)])
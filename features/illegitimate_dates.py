@@ -1,21 +1,19 @@
-from typing import List, Optional
-from datetime import date as Date
+from typing import List
 from gedcom import GedcomRepository
 from gedcom.tags import GedcomDate
+from gedcom.tags.date import DATE_VALID, parse_date_arguments
 
 
 def illegitimate_dates(repo: GedcomRepository) -> List[str]:
   errors: List[str] = []
 
-  for line in repo.lines:
-    if line.tag == 'DATE':
-      date: Optional[Date] = GedcomDate([line], repo).date
-      dd, mmm, yyyy = line.arguments
-      day = int(dd)
-      month = GedcomDate.month_map[mmm]
-      year = int(yyyy)
-      if not date or date.year != year or date.month != month or date.day != day:
+  for line in repo.date_lines:
+    # DATE lines validated on ingest hold legitimate dates
+    if not line.validated:
+      # other lines are judged by their arguments, without recording diagnostics again
+      date, verdict = parse_date_arguments(line.arguments)
+      if verdict != DATE_VALID or line.level != GedcomDate.level:
         errors.append(
-            f'ERROR US42: Illegitimate date ({dd} {mmm} {yyyy}) at line ({line.line_no})')
+            f'ERROR US42: Illegitimate date ({" ".join(line.arguments)}) at line ({line.line_no})')
 
   return errors
@@ -1,6 +1,10 @@
 
+from io import StringIO
+from gedcom import GedcomRepository
+from gedcom.file import get_lines_from_file
 from gedcom.testing import GedcomTestCase
 from features.illegitimate_dates import illegitimate_dates
+from gedcom.tags.date import DATE_INVALID, DATE_MALFORMED, parse_date_arguments
 
 
 class IllegitimateDatesTest(GedcomTestCase):
@@ -17,3 +21,21 @@ class IllegitimateDatesTest(GedcomTestCase):
 
         self.assert_file_validation_passes(
             'legitimate_dates', illegitimate_dates)
+
+    def test_shared_dates(self) -> None:
+        """ test repeated DATE arguments share one parsed date """
+        self.assertIs(parse_date_arguments(('1', 'JAN', '2000'))[0], parse_date_arguments(('1', 'JAN', '2000'))[0])
+        self.assertEqual(parse_date_arguments(('29', 'FEB', '2021')), (None, DATE_INVALID))
+        self.assertEqual(parse_date_arguments(('1', 'XYZ', '2021')), (None, DATE_MALFORMED))
+
+    def test_unparsed_dates(self) -> None:
+        """ test DATE lines not parsed on ingest are checked without adding diagnostics """
+        repo: GedcomRepository = GedcomRepository(get_lines_from_file(StringIO(
+            '0 HEAD\n0 I1 INDI\n1 BIRT\n2 DATE 1 XYZ 2000\n1 DATE 1 JAN 2000\n1 NOTE\n2 DATE 2 JAN 2000\n0 TRLR')))
+        diagnostics: int = len(repo.diagnostics)
+
+        for _ in range(2):
+            self.assertEqual(illegitimate_dates(repo), [
+                'ERROR US42: Illegitimate date (1 XYZ 2000) at line (4)',
+                'ERROR US42: Illegitimate date (1 JAN 2000) at line (5)'])
+            self.assertEqual(len(repo.diagnostics), diagnostics)
@@ -0,0 +1,101 @@
+from typing import List, Set
+from os.path import abspath
+from tempfile import TemporaryDirectory
+import os
+import shutil
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.cache import GedcomRepositoryCache
+from gedcom.incremental import GedcomIncrementalRepository, GedcomUpdate, read_repository_incremental
+from gedcom.testing import GedcomTestCase
+from features.birth_before import BirthBeforeDeath, BirthBeforeMarriage, birth_before_death
+from index import PIPELINE
+
+
+VALIDATORS: List = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+
+
+class IncrementalTest(GedcomTestCase):
+
+    def setUp(self) -> None:
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.path: str = os.path.join(self.directory.name, 'test.ged')
+        shutil.copyfile(abspath('./test_files/test.ged'), self.path)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def edit_lines(self, line_no: int, text: str, replaced_count: int = 1) -> None:
+        ''' replace lines of the test file from line_no with text '''
+        with open(self.path, newline='') as file:
+            lines: List[str] = file.readlines()
+
+        lines[line_no - 1:line_no - 1 + replaced_count] = [f'{text}\r\n']
+        with open(self.path, 'w', newline='') as file:
+            file.writelines(lines)
+
+    def assert_same_as_full_parse(self, repo: GedcomRepository) -> None:
+        full: GedcomRepository = read_repository_file(self.path)
+        self.assertEqual(
+            [(l.line_no, l.data, l.status) for l in full.lines],
+            [(l.line_no, l.data, l.status) for l in repo.lines])
+        self.assertEqual(
+            [(i.id, i.line_no, i.birth, i.death_line_no, [f.id for f in i.spouse_of_list]) for i in full.individuals],
+            [(i.id, i.line_no, i.birth, i.death_line_no, [f.id for f in i.spouse_of_list]) for i in repo.individuals])
+        self.assertEqual(
+            [(f.id, f.line_no, [c.id for c in f.children]) for f in full.families],
+            [(f.id, f.line_no, [c.id for c in f.children]) for f in repo.families])
+        self.assertEqual(list(full.diagnostics), list(repo.diagnostics))
+
+        full.run_validations(VALIDATORS)
+        repo.run_validations(VALIDATORS)
+        for validator in VALIDATORS:
+            self.assertEqual(
+                (full._validation_results[validator].errors, str(full._validation_results[validator].exception)),
+                (repo._validation_results[validator].errors, str(repo._validation_results[validator].exception)),
+                validator.__name__)
+
+    def get_unchecked_ids(self, repo: GedcomIncrementalRepository, rule_class: type) -> Set[str]:
+        checked: Set = repo.rule_states[rule_class].checked
+        return {subject.id for subject in repo.individuals + repo.families if subject not in checked}
+
+    def test_incremental_update(self) -> None:
+        """ test only the edited record is parsed and subjects in scope of it are validated again """
+        repo: GedcomIncrementalRepository = GedcomIncrementalRepository(self.path)
+        self.assert_same_as_full_parse(repo)
+
+        # death of I02 before birth
+        self.edit_lines(16, '2 DATE 1 JAN 0800')
+        update: GedcomUpdate = repo.update()
+
+        self.assertEqual([[i.id for i in record.individuals] for record in update.parsed], [['I02']])
+        self.assertEqual((update.moved, len(update.removed)), ([], 1))
+        self.assertEqual(self.get_unchecked_ids(repo, BirthBeforeDeath), {'I02'})
+        self.assertEqual(self.get_unchecked_ids(repo, BirthBeforeMarriage), {'I02', 'F01'})
+        self.assert_same_as_full_parse(repo)
+        self.assertIn('Individual (I02) died before being born', ' '.join(repo._validation_results[birth_before_death].errors))
+
+    def test_incremental_moved_lines(self) -> None:
+        """ test records after an inserted line keep their data with shifted line numbers """
+        repo: GedcomIncrementalRepository = GedcomIncrementalRepository(self.path)
+        repo.run_validations(VALIDATORS)
+
+        self.edit_lines(3, '0 NOTE inserted', 0)
+        update: GedcomUpdate = repo.update()
+
+        self.assertEqual([record.line_no for record in update.parsed], [2])
+        self.assertEqual(len(update.moved), len(repo.records) - 3)
+        self.assertEqual(self.get_unchecked_ids(repo, BirthBeforeDeath), {s.id for s in repo.individuals + repo.families})
+        self.assert_same_as_full_parse(repo)
+
+    def test_incremental_store(self) -> None:
+        """ test repository stored in cache is updated to the edited file with its validation results """
+        cache: GedcomRepositoryCache = GedcomRepositoryCache(os.path.join(self.directory.name, 'cache'))
+        repo: GedcomIncrementalRepository = read_repository_incremental(self.path, cache)
+        repo.run_validations(VALIDATORS)
+        repo.store()
+
+        self.edit_lines(16, '2 DATE 1 JAN 0800')
+        repo = read_repository_incremental(self.path, cache)
+
+        self.assertEqual(self.get_unchecked_ids(repo, BirthBeforeDeath), {'I02'})
+        self.assert_same_as_full_parse(repo)
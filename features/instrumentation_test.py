@@ -0,0 +1,41 @@
+from os.path import abspath, join
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.instrumentation import GedcomInstrumentation
+from gedcom.testing import GedcomTestCase
+from features.id_validations import unique_ids
+from features.project3 import all_gedcom_individuals
+
+
+def failing_validator(repo: GedcomRepository) -> List[str]:
+    raise KeyError('@I0@')
+
+
+class InstrumentationTest(GedcomTestCase):
+
+    def test_instrumentation(self) -> None:
+        """ test stages are measured and exceptions recorded """
+        with TemporaryDirectory() as directory:
+            profile_path: str = join(directory, 'unique_ids.prof')
+            instrumentation: GedcomInstrumentation = GedcomInstrumentation(
+                trace_allocations=True, profile_stage='unique_ids', profile_path=profile_path)
+            repo: GedcomRepository = read_repository_file(
+                abspath('./test_files/not_unique_ids.ged'), instrumentation=instrumentation)
+
+            repo.run_validations([unique_ids])
+            repo.validate(unique_ids)
+            repo.validate(failing_validator)
+            repo.print_individuals(all_gedcom_individuals)
+
+            report: Dict[str, Dict] = {stats['name']: stats for stats in instrumentation.report()}
+            self.assertTrue({'tokenize', 'subjects', 'sort', 'relations'} <= report.keys())
+
+            self.assertEqual(report['unique_ids']['calls'], 1)
+            self.assertEqual(report['unique_ids']['items'], len(unique_ids(repo)))
+            self.assertGreater(report['unique_ids']['allocated'], 0)
+            self.assertEqual(report['failing_validator']['exceptions'], ["KeyError: '@I0@'"])
+            self.assertEqual(report['all_gedcom_individuals']['items'], len(repo.individuals))
+
+            with open(profile_path, 'rb') as file:
+                self.assertTrue(file.read())
@@ -1,15 +1,19 @@
-from typing import List
+from typing import List, Iterator
 from gedcom import GedcomRepository
+from gedcom.tags import GedcomFamily
+from gedcom.validation import ValidationRule, family_hook, as_validator, LINKED_SCOPE
 
 
-def large_age_diff(repo: GedcomRepository) -> List[str]:
-  errors: List[str] = []
+class LargeAgeDiff(ValidationRule):
+  ''' US34: List all couples who were married when the older spouse was more than twice as old as the younger spouse '''
+  scope = LINKED_SCOPE
 
-  for family in repo.families:
+  @family_hook
+  def check_family(self, family: GedcomFamily) -> Iterator[str]:
     marriage_date = family.marriage
 
     if not marriage_date:
-      continue
+      return
 
     for husband in family.husbands:
       for wife in family.wifes:
@@ -17,7 +21,7 @@ def large_age_diff(repo: GedcomRepository) -> List[str]:
         older_age: int = spouse_older.age_at(marriage_date)
         younger_age: int = spouse_younger.age_at(marriage_date)
         if older_age and younger_age and older_age / 2 > younger_age:
-          errors.append(
-              f'ANOMALY US34: Family({family.id} at line {family.line_no}) spouse({spouse_older.id}) is more than twice as old as spouse({spouse_younger.id})')
+          yield f'ANOMALY US34: Family({family.id} at line {family.line_no}) spouse({spouse_older.id}) is more than twice as old as spouse({spouse_younger.id})'
 
-  return errors
+
+large_age_diff = as_validator(LargeAgeDiff, 'large_age_diff')
@@ -0,0 +1,69 @@
+from io import StringIO
+from os.path import abspath
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.file import get_lines_from_file
+from gedcom.tags import GedcomLazyIndividual, GedcomLazyFamily
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine
+from features.parents_too_old import parents_too_old, sibling_spacing
+from features.multiple_births import siblings_born_at_same_time
+from index import PIPELINE
+
+
+class LazyTest(GedcomTestCase):
+
+    def parse_lazy_test_file(self, file_name: str) -> GedcomRepository:
+        return read_repository_file(abspath(f'./test_files/{file_name}.ged'), lazy=True)
+
+    def test_lazy_repository(self) -> None:
+        """ test lazy parse matches eager parse """
+        repo: GedcomRepository = self.parse_test_file('test')
+        lazy: GedcomRepository = self.parse_lazy_test_file('test')
+
+        self.assertTrue(all(isinstance(i, GedcomLazyIndividual) for i in lazy.individuals))
+        self.assertTrue(all(isinstance(f, GedcomLazyFamily) for f in lazy.families))
+        self.assertEqual(
+            [(i.id, i.line_no, i.name, i.birth) for i in repo.individuals],
+            [(i.id, i.line_no, i.name, i.birth) for i in lazy.individuals])
+        self.assertEqual(
+            [(f.id, f.line_no, f.children_id_list) for f in repo.families],
+            [(f.id, f.line_no, f.children_id_list) for f in lazy.families])
+        self.assertEqual(
+            [f.id for f in lazy.individual['I03'].spouse_of_list], ['F01', 'F01', 'F02'])
+
+    def test_parse_on_access(self) -> None:
+        """ test subjects are parsed once, on first access of their data """
+        repo: GedcomRepository = self.parse_lazy_test_file('test')
+        self.assertFalse(any(i.parsed for i in repo.individuals))
+        self.assertFalse(any(f.parsed for f in repo.families))
+
+        individual: GedcomLazyIndividual = repo.individual['I01']
+        self.assertFalse(individual.parsed)
+        birth = individual.birth
+        self.assertTrue(individual.parsed)
+        self.assertIs(individual.birth, birth)
+        self.assertEqual([i.id for i in repo.individuals if i.parsed], ['I01'])
+
+        with self.assertRaises(AttributeError):
+            individual.no_such_attribute
+
+    def test_lazy_validation(self) -> None:
+        """ test validators report the same errors on lazy subjects """
+        validators = [parents_too_old, sibling_spacing, siblings_born_at_same_time]
+        for file_name in ('incorrect_parents_too_old', 'incorrect_sibling_spacing', 'incorrect_siblings_born_at_same_time'):
+            expected = ValidationEngine(validators).run(self.parse_test_file(file_name))
+            results = ValidationEngine(validators).run(self.parse_lazy_test_file(file_name))
+            for validator in validators:
+                self.assertEqual(results[validator].errors, expected[validator].errors)
+
+    def test_lazy_property_errors(self) -> None:
+        """ test properties of lazy subjects raise the errors of eager subjects, on records without NAME or SEX """
+        lines: str = '0 HEAD\n0 I1 INDI\n1 BIRT\n2 DATE 1 JAN 1990\n1 FAMS F1\n0 I2 INDI\n1 NAME C /D/\n1 FAMS F1\n' \
+                     '0 F1 FAM\n1 HUSB I1\n1 WIFE I2\n0 TRLR'
+        validators = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+        expected = ValidationEngine(validators).run(GedcomRepository(get_lines_from_file(StringIO(lines))))
+        results = ValidationEngine(validators).run(GedcomRepository(get_lines_from_file(StringIO(lines)), lazy=True))
+        for validator in validators:
+            self.assertEqual(
+                (results[validator].errors, str(results[validator].exception)),
+                (expected[validator].errors, str(expected[validator].exception)), validator.__name__)
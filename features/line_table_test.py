@@ -0,0 +1,36 @@
+from gedcom.file import GedcomLineTable, GedcomLineRange, read_line_table
+from gedcom.testing import GedcomTestCase
+
+
+class LineTableTest(GedcomTestCase):
+
+    def test_line_table(self) -> None:
+        """ test columnar line table rows """
+        table: GedcomLineTable = read_line_table('./test_files/test.ged')
+        with open('./test_files/test.ged') as file:
+            file_lines = [line.rstrip('\n') for line in file]
+
+        self.assertEqual(len(table), len(file_lines))
+        self.assertEqual([line.data for line in table], file_lines)
+        self.assertEqual([line.line_no for line in table], list(range(1, len(file_lines) + 1)))
+
+        line: GedcomLine = table[2]
+        self.assertEqual((line.level, line.tag, line.arguments), (0, 'INDI', ('I01',)))
+        self.assertFalse(line.validated)
+        line.validated = True
+        self.assertTrue(line.validated)
+        self.assertFalse(table[1].validated or table[3].validated)
+        line.validated = False
+        self.assertFalse(line.validated)
+
+    def test_line_range(self) -> None:
+        """ test subject data keeps line ranges over the repository line table """
+        repo: GedcomRepository = self.parse_test_file('test')
+        i01 = repo.individual['I01']
+
+        self.assertIsInstance(repo.lines, GedcomLineTable)
+        self.assertIsInstance(i01.lines, GedcomLineRange)
+        self.assertIs(i01.lines.table, repo.lines)
+        self.assertEqual([line.line_no for line in i01.lines], [3, 4, 5, 6, 7, 8])
+        self.assertEqual([line.status for line in i01.lines], ['Y'] * 6)
+        self.assertEqual(i01.lines[1:3][-1].tag, 'SEX')
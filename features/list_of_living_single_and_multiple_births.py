@@ -23,6 +23,11 @@ def list_multiple_births(repo: GedcomRepository):
     
     multiple_birth_children = []
 
+    columns = repo.family_columns
+    if columns is not None:
+        entries = columns.get_grouped_births(2)
+        return 'List multiple birth in families', [columns.get_child(entry) for entry in entries.tolist()]
+
     for family in repo.families:
         children: List[GedcomIndividual] = family.children
         birth_day_dict: DefaultDict[str,
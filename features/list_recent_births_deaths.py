@@ -1,16 +1,20 @@
 from gedcom import GedcomRepository
-from datetime import timedelta, date as Date
+from datetime import date as Date
 
 def list_recent_births(repo: GedcomRepository):
     """US35 List all people in a GEDCOM file who were born in the last 30 days """
     recent_births = []
-    present = Date.today()
-    thirty_days = present - timedelta(days=30)
+    present = Date.today().toordinal()
+    thirty_days = present - 30
     
+    columns = repo.individual_columns
+    if columns is not None:
+        births = columns.birth_ordinal
+        return 'Recent Births', columns.select(columns.birth_known & (births <= present) & (births >= thirty_days))
 
     for individual in repo.individuals:
 
-        if individual.birth and (individual.birth <= present and individual.birth >= thirty_days):
+        if individual.birth and (individual.birth_ordinal <= present and individual.birth_ordinal >= thirty_days):
             recent_births.append(individual)
     
     return 'Recent Births', recent_births
@@ -18,12 +22,17 @@ def list_recent_births(repo: GedcomRepository):
 def list_recent_deaths(repo: GedcomRepository):
     """ US36 List all people in a GEDCOM file who died in the last 30 days """
     recent_deaths = []
-    present = Date.today()
-    thirty_days = present - timedelta(days=30)
+    present = Date.today().toordinal()
+    thirty_days = present - 30
+
+    columns = repo.individual_columns
+    if columns is not None:
+        deaths = columns.death_ordinal
+        return 'Recent Deaths', columns.select(columns.death_known & (deaths <= present) & (deaths >= thirty_days))
 
     for individual in repo.individuals:
 
-        if individual.death and (individual.death <= present and individual.death >= thirty_days):
+        if individual.death and (individual.death_ordinal <= present and individual.death_ordinal >= thirty_days):
             recent_deaths.append(individual)
     
     return 'Recent Deaths', recent_deaths
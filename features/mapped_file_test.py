@@ -0,0 +1,26 @@
+from gedcom.file import get_lines_from_path
+from gedcom import read_repository_file
+from gedcom.testing import GedcomTestCase
+
+
+class MappedFileTest(GedcomTestCase):
+
+    def test_mapped_lines(self) -> None:
+        """ test memory-mapped tokenizer matches text tokenizer """
+        path: str = './test_files/test.ged'
+        text_lines = [(line.line_no, line.level, line.tag, line.arguments, line.data)
+                      for line in get_lines_from_path(path)]
+        mapped_lines = [(line.line_no, line.level, line.tag, line.arguments, line.data)
+                        for line in get_lines_from_path(path, mapped=True)]
+
+        self.assertEqual(text_lines, mapped_lines)
+
+    def test_mapped_repository(self) -> None:
+        """ test repository parsed from memory-mapped file """
+        repo: GedcomRepository = self.parse_test_file('test')
+        mapped: GedcomRepository = read_repository_file('./test_files/test.ged', mapped=True)
+
+        self.assertEqual([line.status for line in repo.lines],
+                         [line.status for line in mapped.lines])
+        self.assertEqual([individual.id for individual in repo.individuals],
+                         [individual.id for individual in mapped.individuals])
@@ -1,43 +1,45 @@
 from gedcom import GedcomRepository
+from gedcom.validation import ValidationRule, family_hook, as_validator, LINKED_SCOPE
+from gedcom.dates import years_between
 
 
-def marriage_after_14(repo: GedcomRepository):
+class MarriageAfter14(ValidationRule):
     """ US10 Marriage of individuals should occur after age 14 """
-    errors = []
-    for family in repo.families:
-        marriage_date = family.marriage
+    scope = LINKED_SCOPE
+
+    @family_hook
+    def check_family(self, family):
+        marriage_date = family.marriage_ymd
 
         if not marriage_date:
-            continue
+            return
 
         for husband in family.husbands:
             if not husband.birth:
                 continue
-            husband_14th = husband.birth.replace(year=husband.birth.year+14)
-            if husband.birth and (husband_14th > marriage_date):
+            if years_between(husband.birth_ymd, marriage_date) < 14:
                 invalid_marr_date_line_no = family.marriage_line_no
-                errors.append(
-                    f'ERROR US10: Individual({husband.id}) in Family({family.id}) married (at line {invalid_marr_date_line_no}) when under age 14.')
+                yield f'ERROR US10: Individual({husband.id}) in Family({family.id}) married (at line {invalid_marr_date_line_no}) when under age 14.'
 
         for wife in family.wifes:
             if not wife.birth:
                 continue
-            wife_14th = wife.birth.replace(year=wife.birth.year+14)
-            if wife.birth and (wife_14th > marriage_date):
+            if years_between(wife.birth_ymd, marriage_date) < 14:
                 invalid_marr_date_line_no = family.marriage_line_no
-                errors.append(
-                    f'ERROR US10: Individual({wife.id}) in Family({family.id}) married (at line {invalid_marr_date_line_no}) when under age 14.')
+                yield f'ERROR US10: Individual({wife.id}) in Family({family.id}) married (at line {invalid_marr_date_line_no}) when under age 14.'
+
 
-    return errors
+marriage_after_14 = as_validator(MarriageAfter14, 'marriage_after_14')
 
 
-def male_last_names(repo: GedcomRepository):
+class MaleLastNames(ValidationRule):
     """ US16 All males in a family must share the same last name """
-    errors = []
+    scope = LINKED_SCOPE
 
-    for family in repo.families:
+    @family_hook
+    def check_family(self, family):
       if not family.children:
-        continue
+        return
 
       for husband in family.husbands:
         male_ln = husband.last_name
@@ -45,8 +47,7 @@ def male_last_names(repo: GedcomRepository):
         for child in family.children:
             child_ln = child.last_name
             if child.is_male and child_ln != male_ln:
-                errors.append(
-                    f'ERROR US16: In Family({family.id}), Son({child.id}) last name (at line {child.name_line_no}) does not match Father({husband.id}) last name (at line {husband.name_line_no}).'
-                )
+                yield f'ERROR US16: In Family({family.id}), Son({child.id}) last name (at line {child.name_line_no}) does not match Father({husband.id}) last name (at line {husband.name_line_no}).'
+
 
-    return errors
+male_last_names = as_validator(MaleLastNames, 'male_last_names')
@@ -0,0 +1,37 @@
+from io import StringIO
+from typing import List
+from gedcom.file import GedcomLine, get_lines_from_file
+from gedcom.tags import GedcomIndividual, GedcomFamily
+from gedcom.testing import GedcomTestCase
+
+
+def get_lines(rows: List[str]) -> List[GedcomLine]:
+    return list(get_lines_from_file(StringIO('\n'.join(rows))))
+
+
+class MembershipTest(GedcomTestCase):
+
+    def test_duplicate_family_members(self) -> None:
+        """ test repeated family members are rejected while parsing """
+        lines: List[GedcomLine] = get_lines(
+            ['0 F1 FAM', '1 HUSB I1', '1 WIFE I1', '1 CHIL I2', '1 CHIL I3', '1 CHIL I2', '1 CHIL I1'])
+        family: GedcomFamily = GedcomFamily(lines, None)
+
+        self.assertEqual(family.husband_id, 'I1')
+        self.assertIsNone(family.wife_id)
+        self.assertEqual(family.children_id_list, ['I2', 'I3'])
+        self.assertEqual([line.validated for line in lines], [True, True, False, True, True, False, False])
+        self.assertTrue(family.has_member('I3'))
+        self.assertFalse(family.has_member('I4'))
+
+    def test_duplicate_individual_memberships(self) -> None:
+        """ test repeated family memberships are rejected while parsing """
+        lines: List[GedcomLine] = get_lines(
+            ['0 I1 INDI', '1 FAMC F1', '1 FAMS F2', '1 FAMS F1', '1 FAMS F2', '1 FAMS F3'])
+        individual: GedcomIndividual = GedcomIndividual(lines, None)
+
+        self.assertEqual(individual.child_of_id_list, ['F1'])
+        self.assertEqual(individual.spouse_of_id_list, ['F2', 'F3'])
+        self.assertEqual([line.validated for line in lines], [True, True, True, False, False, True])
+        self.assertTrue(individual.is_member_of('F3'))
+        self.assertFalse(individual.is_member_of('F4'))
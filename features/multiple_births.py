@@ -1,12 +1,17 @@
-from typing import List, Tuple
+from typing import List, Tuple, Iterator
 from collections import defaultdict
 from gedcom import GedcomRepository
+from gedcom.tags import GedcomFamily
+from datetime import date as Date
+from gedcom.validation import ValidationRule, family_hook, columns_hook, as_validator, LINKED_SCOPE
 
 
-def siblings_born_at_same_time(repo: GedcomRepository) -> List[str]:
+class SiblingsBornAtSameTime(ValidationRule):
     ''' US14: No more than five siblings should be born at the same time '''
-    errors: List[str] = []
-    for family in repo.families:
+    scope = LINKED_SCOPE
+
+    @family_hook
+    def check_family(self, family: GedcomFamily) -> Iterator[str]:
         children=  family.children
         birth_day_dict= defaultdict(list)
         for child in children:
@@ -16,20 +21,37 @@ def siblings_born_at_same_time(repo: GedcomRepository) -> List[str]:
             birth_day_dict[birth_day_key].append(child)
         for key, same_birth_children in birth_day_dict.items():
             if len(same_birth_children) > 5:
-                errors.append(
-                f'ERROR US14 at line {child.birth_line_no}: too many siblings born at once({key}) in family({family.id})')
-    return errors
+                yield f'ERROR US14 at line {child.birth_line_no}: too many siblings born at once({key}) in family({family.id})'
+
+    @columns_hook(check_family)
+    def check_family_columns(self, columns) -> Iterator[str]:
+        groups, firsts, sizes = columns.get_birth_groups()
+        # groups of a family in order of their first child
+        for first in sorted(firsts[sizes > 5].tolist()):
+            family = columns.families[columns.child_family[first]]
+            key = Date.fromordinal(int(columns.birth_ordinal[first]))
+            # line of the last child of the family, as reported by check_family
+            yield f'ERROR US14 at line {family.children[-1].birth_line_no}: too many siblings born at once({key}) in family({family.id})'
+
 
+siblings_born_at_same_time = as_validator(SiblingsBornAtSameTime, 'siblings_born_at_same_time')
 
-def too_many_siblings(repo: GedcomRepository) -> List[str]:
+
+class TooManySiblings(ValidationRule):
     ''' US15: There should be fewer than 15 siblings in a family '''
-    errors: List[str] = []
+    scope = LINKED_SCOPE
 
-    for family in repo.families:
-        child_count = 0
+    @family_hook
+    def check_family(self, family: GedcomFamily) -> Iterator[str]:
         children = family.children  # list of indis
         if len(children) > 14:
-            errors.append(
-                f'ERROR US15 at line {family.line_no}: too many siblings in family: ({family.id})')
+            yield f'ERROR US15 at line {family.line_no}: too many siblings in family: ({family.id})'
+
+    @columns_hook(check_family)
+    def check_family_columns(self, columns) -> Iterator[str]:
+        for row in columns.rows(columns.counts > 14):
+            family = columns.families[row]
+            yield f'ERROR US15 at line {family.line_no}: too many siblings in family: ({family.id})'
+
 
-    return errors
+too_many_siblings = as_validator(TooManySiblings, 'too_many_siblings')
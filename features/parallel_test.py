@@ -0,0 +1,36 @@
+from os.path import abspath
+from gedcom import GedcomRepository, read_repository_parallel
+from gedcom.testing import GedcomTestCase
+from features.streaming_test import run_pipeline
+
+
+class ParallelTest(GedcomTestCase):
+
+    def test_parallel_repository(self) -> None:
+        """ test parallel parse matches serial parse """
+        for name in ['test', 'not_unique_ids']:
+            repo: GedcomRepository = self.parse_test_file(name)
+            parallel: GedcomRepository = read_repository_parallel(
+                abspath(f'./test_files/{name}.ged'), processes=2, shard_count=8)
+
+            self.assertIsNone(parallel.lines)
+            self.assertEqual(
+                [(i.id, i.line_no, i.name, i.birth) for i in repo.individuals],
+                [(i.id, i.line_no, i.name, i.birth) for i in parallel.individuals])
+            self.assertEqual(
+                [(f.id, f.line_no, f.children_id_list) for f in repo.families],
+                [(f.id, f.line_no, f.children_id_list) for f in parallel.families])
+            self.assertEqual(
+                {id: [i.line_no for i in dups] for id, dups in repo.individual_duplicates.items()},
+                {id: [i.line_no for i in dups] for id, dups in parallel.individual_duplicates.items()})
+            self.assertEqual(
+                {id: [f.line_no for f in dups] for id, dups in repo.family_duplicates.items()},
+                {id: [f.line_no for f in dups] for id, dups in parallel.family_duplicates.items()})
+
+    def test_parallel_pipeline(self) -> None:
+        """ test every validator and printer of index.py prints the same after parallel parse """
+        for name in ['test', 'illegitimate_dates', 'not_unique_ids']:
+            path: str = abspath(f'./test_files/{name}.ged')
+            expected: str = run_pipeline(self.parse_test_file(name))
+            for processes in (1, 2):
+                self.assertEqual(run_pipeline(read_repository_parallel(path, processes=processes, shard_count=4)), expected, name)
@@ -0,0 +1,29 @@
+from typing import List
+from gedcom import GedcomRepository
+from gedcom.parallel import validate_parallel
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine
+from index import PIPELINE
+
+
+class ParallelValidationTest(GedcomTestCase):
+
+    def assert_same_results(self, name: str, start_method: str) -> None:
+        validators: List = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+        repo: GedcomRepository = self.parse_test_file(name)
+        expected = ValidationEngine(validators).run(repo)
+        results = validate_parallel(repo, validators, processes=2, start_method=start_method)
+
+        self.assertEqual(list(expected), list(results))
+        for validator in validators:
+            self.assertEqual(expected[validator].errors, results[validator].errors)
+            self.assertEqual(str(expected[validator].exception), str(results[validator].exception))
+
+    def test_parallel_validation(self) -> None:
+        """ test validators run in forked workers match serial run """
+        for name in ['test', 'not_unique_ids', 'List_of_deceased']:
+            self.assert_same_results(name, 'fork')
+
+    def test_parallel_validation_snapshot(self) -> None:
+        """ test validators run on a repository snapshot match serial run """
+        self.assert_same_results('test', 'spawn')
@@ -1,8 +1,12 @@
-from typing import List
+from typing import List, Iterator, Tuple
 from gedcom import GedcomRepository
+from gedcom.tags import GedcomFamily, GedcomIndividual
+from gedcom.validation import ValidationRule, family_hook, columns_hook, as_validator, LINKED_SCOPE
+from gedcom.dates import YMD, years_apart, month_day_key
 from datetime import date as Date
 
 
+# year_diff and month_diff fail on a leap day anniversary in a later non-leap year, validators use gedcom.dates
 def year_diff(date1, date2) -> int:
   d1, d2 = (date2, date1) if date1 > date2 else (date1, date2)
   ''' d2 should be larger/later than d1 '''
@@ -19,45 +23,118 @@ def month_diff(date1, date2) -> int:
   return years_apart * 12 + d2.month - d1.month
 
 
-def parents_too_old(repo: GedcomRepository) -> List[str]:
+class ParentsTooOld(ValidationRule):
   ''' US12: Mother should be less than 60 years older than her children and father should be less than 80 years older than his children'''
-  errors: List[str] = []
+  scope = LINKED_SCOPE
 
-  for family in repo.families:
+  @family_hook
+  def check_family(self, family: GedcomFamily) -> Iterator[str]:
+    wifes = family.wifes
+    husbands = family.husbands
     for child in family.children:
 
-      if not child.birth:
+      birth: YMD = child.birth_ymd
+      if not birth:
         continue
 
-      for wife in family.wifes:
-        if wife.birth and year_diff(wife.birth, child.birth) >= 60:
-            errors.append(
-                f'ERROR US12: Child({child.id}) is at least 60 years younger than their mother (at line {child.birth_line_no})')
+      for wife in wifes:
+        if wife.birth_ymd and years_apart(wife.birth_ymd, birth) >= 60:
+            yield f'ERROR US12: Child({child.id}) is at least 60 years younger than their mother (at line {child.birth_line_no})'
 
-      for husband in family.husbands:
-        if husband.birth and year_diff(husband.birth, child.birth) >= 80:
-            errors.append(
-                f'ERROR US12: Child({child.id}) is at least 80 years younger than their father (at line {child.birth_line_no})')
+      for husband in husbands:
+        if husband.birth_ymd and years_apart(husband.birth_ymd, birth) >= 80:
+            yield f'ERROR US12: Child({child.id}) is at least 80 years younger than their father (at line {child.birth_line_no})'
 
-  return errors
 
+parents_too_old = as_validator(ParentsTooOld, 'parents_too_old')
 
-def sibling_spacing(repo: GedcomRepository) -> List[str]:
+
+def compatible_month_diff(d1: YMD, d2: YMD) -> int:
+  ''' month_diff of d1 <= d2 with integer arithmetic '''
+  year1, month1, day1 = d1
+  year2, month2, day2 = d2
+  years: int = year2 - year1 - (1 if month2 < month1 or (month2 == month1 and day2 < day1) else 0)
+  return years * 12 + month2 - month1
+
+
+class SiblingSpacing(ValidationRule):
   ''' US13: Birth dates of siblings should be more than 8 months apart or less than 2 days apart
-    (twins may be born one day apart, e.g. 11:59 PM and 12:02 AM the following calendar day)'''
-  errors: List[str] = []
+    (twins may be born one day apart, e.g. 11:59 PM and 12:02 AM the following calendar day)
+    compatible: report each pair twice in child order, spacing counted in calendar months like month_diff '''
+  scope = LINKED_SCOPE
+  compatible: bool = False
 
-  for family in repo.families:
+  @family_hook
+  def check_family(self, family: GedcomFamily) -> Iterator[str]:
     children = family.children  # list of indis
-    for child in children:
-        for child2 in children:
-            if child is child2 or not child.birth or not child2.birth:
-              continue
-
-            else:
-              month_d = month_diff(child.birth, child2.birth)
-              are_twins = abs((child2.birth - child.birth).days) < 2
-              if month_d <= 8 and not are_twins:
-                errors.append(
-                    f'ERROR US13: Child({child.id}) was born too close in time to another sibling({child2.id}). (at line {child.birth_line_no})')
-  return errors
+    # positions of children with a birth date, by birth date
+    born = sorted((child.birth_ordinal, position) for position, child in enumerate(children) if child.birth)
+    if len(born) < 2:
+      return
+
+    pairs = self.get_compatible_pairs(children, born) if self.compatible else self.get_pairs(children, born)
+    for position, position2 in pairs:
+      child, child2 = children[position], children[position2]
+      yield f'ERROR US13: Child({child.id}) was born too close in time to another sibling({child2.id}). (at line {child.birth_line_no})'
+
+  @columns_hook(check_family)
+  def check_family_columns(self, columns) -> Iterator[str]:
+    if self.compatible:
+      for family in columns.families:
+        yield from self.check_family(family)
+      return
+
+    # same window as get_pairs
+    older, younger = columns.get_birth_pairs(2, 8 * 32)
+    for entry, entry2 in zip(older.tolist(), younger.tolist()):
+      child, child2 = columns.get_child(entry), columns.get_child(entry2)
+      yield f'ERROR US13: Child({child.id}) was born too close in time to another sibling({child2.id}). (at line {child.birth_line_no})'
+
+  def get_pairs(self, children: List[GedcomIndividual], born: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    ''' get (older, younger) positions of siblings born 2 days to 8 months apart, by birth date '''
+    pairs: List[Tuple[int, int]] = []
+    keys: List[int] = [month_day_key(children[position].birth_ymd) for ordinal, position in born]
+    for i, (ordinal, position) in enumerate(born):
+      # only younger siblings within 8 months can be too close
+      for j in range(i + 1, len(born)):
+        if keys[j] - keys[i] > 8 * 32:
+          break
+
+        if born[j][0] - ordinal >= 2:
+          pairs.append((position, born[j][1]))
+
+    return pairs
+
+  def get_compatible_pairs(self, children: List[GedcomIndividual], born: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    ''' get pairs like comparing all children with each other, both ways in child order '''
+    for ordinal, position in born:
+      birth: Date = children[position].birth
+      if birth.month == 2 and birth.day == 29:
+        # month_diff fails on a leap day anniversary in a later non-leap year
+        for ordinal2, position2 in born:
+          if ordinal2 > ordinal:
+            month_diff(birth, children[position2].birth)
+
+    pairs: List[Tuple[int, int]] = []
+    for i, (ordinal, position) in enumerate(born):
+      # month_diff counts whole years and calendar months, it exceeds 8 from two years apart
+      for j in range(i + 1, len(born)):
+        ordinal2, position2 = born[j]
+        if ordinal2 - ordinal > 731:
+          break
+
+        if ordinal2 - ordinal >= 2 and \
+            compatible_month_diff(children[position].birth_ymd, children[position2].birth_ymd) <= 8:
+          pairs += [(position, position2), (position2, position)]
+
+    return sorted(pairs)
+
+
+sibling_spacing = as_validator(SiblingSpacing, 'sibling_spacing')
+
+
+class CompatibleSiblingSpacing(SiblingSpacing):
+  compatible = True
+
+
+sibling_spacing_compatible = as_validator(CompatibleSiblingSpacing, 'sibling_spacing_compatible')
@@ -1,5 +1,5 @@
 from gedcom.testing import GedcomTestCase
-from features.parents_too_old import parents_too_old, sibling_spacing
+from features.parents_too_old import parents_too_old, sibling_spacing, sibling_spacing_compatible
 
 
 class ParentsAgeTest(GedcomTestCase):
@@ -20,8 +20,18 @@ class ParentsAgeTest(GedcomTestCase):
 
         self.assert_file_validation_fails(
             'incorrect_sibling_spacing', sibling_spacing,
+            ["ERROR US13: Child(I02) was born too close in time to another sibling(I01). (at line 13)"])
+
+        self.assert_file_validation_passes(
+            'correct_sibling_spacing', sibling_spacing)
+
+    def test_sibling_spacing_compatible(self) -> None:
+        """ test each pair is reported both ways in compatible mode """
+
+        self.assert_file_validation_fails(
+            'incorrect_sibling_spacing', sibling_spacing_compatible,
             ['ERROR US13: Child(I01) was born too close in time to another sibling(I02). (at line 6)',
              "ERROR US13: Child(I02) was born too close in time to another sibling(I01). (at line 13)"])
 
         self.assert_file_validation_passes(
-            'correct_sibling_spacing', sibling_spacing)
+            'correct_sibling_spacing', sibling_spacing_compatible)
@@ -0,0 +1,114 @@
+from typing import Dict, List
+from os.path import abspath
+from tempfile import TemporaryDirectory
+import os
+import shutil
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.record_index import GedcomIndexedRepository, GedcomRecordIndex, open_indexed_repository, read_record_index, \
+    get_record_index_path
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine
+from index import PIPELINE
+
+
+class RecordIndexTest(GedcomTestCase):
+
+    def setUp(self) -> None:
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def copy_test_file(self, name: str) -> str:
+        path: str = os.path.join(self.directory.name, f'{name}.ged')
+        shutil.copyfile(abspath(f'./test_files/{name}.ged'), path)
+        return path
+
+    def test_lookup_by_id(self) -> None:
+        """ test subjects looked up by ID are parsed as in a full parse, with their line numbers and text """
+        path: str = self.copy_test_file('test')
+        full: GedcomRepository = self.parse_test_file('test')
+        repo: GedcomIndexedRepository = open_indexed_repository(path)
+
+        individual = repo.individual['I04']
+        self.assertEqual(
+            (individual.line_no, individual.name, individual.birth, individual.child_of_id_list),
+            (full.individual['I04'].line_no, full.individual['I04'].name, full.individual['I04'].birth, ['F01']))
+        self.assertEqual([l.data for l in individual.lines], [l.data for l in full.individual['I04'].lines])
+        self.assertEqual(repo.family['F01'].husband.name, 'Grisha /Yaeger/')
+        self.assertIsNone(repo.individual['I99'])
+        self.assertNotIn('F99', repo.family)
+        # only the records looked up are parsed
+        self.assertEqual(len(repo._subjects), 3)
+
+    def test_individual_with_families(self) -> None:
+        """ test individual and its FAMC and FAMS families are loaded together """
+        path: str = self.copy_test_file('test')
+        repo: GedcomIndexedRepository = open_indexed_repository(path)
+
+        individual, families = repo.load_individual_with_families('I03')
+        self.assertEqual(individual.id, 'I03')
+        self.assertEqual([family.id for family in families], ['F03', 'F01', 'F02'])
+        self.assertEqual(len(repo._subjects), 4)
+        self.assertEqual(repo.load_individual_with_families('I99'), (None, []))
+
+    def test_subjects_and_duplicates(self) -> None:
+        """ test all subjects in ID order and duplicate IDs in file order, as in a full parse """
+        for name in ['test', 'not_unique_ids', 'not_corresponding_entries']:
+            full: GedcomRepository = self.parse_test_file(name)
+            repo: GedcomIndexedRepository = open_indexed_repository(self.copy_test_file(name))
+
+            self.assertEqual([(i.id, i.line_no) for i in repo.individuals], [(i.id, i.line_no) for i in full.individuals])
+            self.assertEqual([(f.id, f.line_no) for f in repo.families], [(f.id, f.line_no) for f in full.families])
+            self.assertEqual(list(repo.individual), list(full.individual))
+            self.assertEqual(list(repo.family), list(full.family))
+            self.assertEqual(
+                [(id, [i.line_no for i in repo.individual_duplicates[id]]) for id in repo.individual_duplicates],
+                [(id, [i.line_no for i in subjects]) for id, subjects in full.individual_duplicates.items()])
+            self.assertEqual(
+                [(id, [f.line_no for f in repo.family_duplicates[id]]) for id in repo.family_duplicates],
+                [(id, [f.line_no for f in subjects]) for id, subjects in full.family_duplicates.items()])
+
+    def test_rejected_records(self) -> None:
+        """ test records with the ID after the tag or a rejected ID line are left out, with their diagnostics """
+        path: str = os.path.join(self.directory.name, 'rejected.ged')
+        with open(path, 'w') as file:
+            file.write('0 HEAD\n0 INDI I1\n1 NAME A /B/\n0 I2 INDI\n1 NAME C /D/\n1 FAMS F1\n0 I3 INDI X\n'
+                       '0 F1 FAM\n1 HUSB I2\n0 TRLR\n')
+
+        full: GedcomRepository = read_repository_file(path)
+        repo: GedcomIndexedRepository = open_indexed_repository(path)
+        self.assertEqual([i.id for i in repo.individuals], [i.id for i in full.individuals])
+        self.assertEqual(list(repo.individual), list(full.individual))
+        self.assertEqual(sorted(repo.diagnostics), sorted(full.diagnostics))
+        # families without WIFE look up no wife
+        self.assertEqual(repo.family['F1'].wifes, [])
+        validators: List = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+        expected: Dict = ValidationEngine(validators).run(full)
+        results: Dict = ValidationEngine(validators).run(repo)
+        for validator in validators:
+            self.assertEqual(
+                (results[validator].errors, str(results[validator].exception)),
+                (expected[validator].errors, str(expected[validator].exception)), validator.__name__)
+
+    def test_sidecar(self) -> None:
+        """ test the sidecar is written on first open, reused, and indexed again when the file changes """
+        path: str = self.copy_test_file('test')
+        open_indexed_repository(path)
+        index: GedcomRecordIndex = read_record_index(get_record_index_path(path))
+        self.assertEqual((index.individual_count, index.family_count), (10, 6))
+        row: int = index.get_rows('individual', 'I03')[0]
+        self.assertEqual(
+            [(tag, index.ids[linked_row]) for tag, linked_row in index.get_links(row)],
+            [('FAMS', 'F01'), ('FAMS', 'F02'), ('FAMC', 'F03')])
+
+        repo: GedcomIndexedRepository = open_indexed_repository(path)
+        line_no: int = repo.individual['I03'].line_no
+        with open(path, 'rb') as file:
+            data: bytes = file.read()
+
+        with open(path, 'wb') as file:
+            file.write(b'0 NOTE inserted\r\n' + data)
+
+        self.assertEqual(repo.individual['I03'].line_no, line_no + 1)
+        self.assertEqual(read_record_index(get_record_index_path(path)).size, len(data) + len(b'0 NOTE inserted\r\n'))
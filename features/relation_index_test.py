@@ -0,0 +1,27 @@
+from gedcom.testing import GedcomTestCase
+
+
+class RelationIndexTest(GedcomTestCase):
+
+    def test_relation_index(self) -> None:
+        """ test indexed relations match relations resolved by ID """
+        for name in ['test', 'not_unique_ids']:
+            repo: GedcomRepository = self.parse_test_file(name)
+            self.assertIsNotNone(repo.relations)
+
+            for individual in repo.individuals:
+                self.assertEqual(individual.spouse_of_list,
+                                 individual.get_families_by_id_list(individual.spouse_of_id_list))
+                self.assertEqual(individual.child_of_list,
+                                 individual.get_families_by_id_list(individual.child_of_id_list))
+                self.assertEqual(individual.member_of_list,
+                                 individual.get_families_by_id_list(individual.member_of_id_list))
+
+            for family in repo.families:
+                self.assertEqual(family.husbands,
+                                 repo.individual_duplicates.get(family.husband_id, []))
+                self.assertEqual(family.wifes,
+                                 repo.individual_duplicates.get(family.wife_id, []))
+                self.assertEqual(family.children, [
+                    child for child_id in dict.fromkeys(family.children_id_list)
+                    for child in repo.individual_duplicates.get(child_id, [])])
@@ -0,0 +1,161 @@
+from typing import Any, Dict, List
+from contextlib import redirect_stdout
+from io import StringIO
+from os.path import abspath
+from tempfile import TemporaryDirectory
+from threading import Thread
+import os
+import shutil
+import socket
+import unittest
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.exceptions import GedcomException
+from gedcom.server import GedcomServer, make_server
+from gedcom.testing import GedcomTestCase
+from client import send_request
+from index import PIPELINE
+
+
+VALIDATORS: List = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+
+
+class ServerTest(GedcomTestCase):
+
+    def setUp(self) -> None:
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.path: str = os.path.join(self.directory.name, 'test.ged')
+        shutil.copyfile(abspath('./test_files/test.ged'), self.path)
+        self.gedcom: GedcomServer = GedcomServer(PIPELINE)
+        self.servers: List = []
+
+    def tearDown(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+        self.gedcom.close()
+        self.directory.cleanup()
+
+    def start_server(self, address: str) -> str:
+        ''' serve requests at address in a thread, return the address it is bound to '''
+        server = make_server(self.gedcom, address)
+        self.servers.append(server)
+        Thread(target=server.serve_forever, daemon=True).start()
+        if address.startswith('http'):
+            return f'http://127.0.0.1:{server.server_address[1]}'
+
+        return address
+
+    def run_index(self, path: str) -> str:
+        ''' output of the pipeline of index.py on path '''
+        repo: GedcomRepository = read_repository_file(path)
+        repo.run_validations(VALIDATORS)
+        output: StringIO = StringIO()
+        with redirect_stdout(output):
+            for run, step in PIPELINE:
+                run(repo, step)
+
+        return output.getvalue()
+
+    def test_report(self) -> None:
+        """ test report of the server is what index.py prints """
+        response: Dict[str, Any] = self.gedcom.handle_request({'command': 'report', 'path': self.path})
+        self.assertEqual(response['text'], self.run_index(self.path))
+        # warm request answers from kept results
+        self.assertEqual(self.gedcom.handle_request({'command': 'report', 'path': self.path}), response)
+
+    def test_validate_after_edit(self) -> None:
+        """ test validation results follow edits of the loaded file """
+        self.gedcom.handle_request({'command': 'load', 'path': self.path})
+        with open(self.path, 'rb') as file:
+            data: bytes = file.read()
+
+        # death of I02 before birth
+        with open(self.path, 'wb') as file:
+            file.write(data.replace(b'2 DATE 1 JAN 0845\r\n1 FAMS F01', b'2 DATE 1 JAN 0800\r\n1 FAMS F01', 1))
+
+        response: Dict[str, Any] = self.gedcom.handle_request(
+            {'command': 'validate', 'path': self.path, 'validators': ['birth_before_death']})
+        self.assertEqual(response['results'][0]['validator'], 'birth_before_death')
+        self.assertIn('Individual (I02) died before being born', ' '.join(response['results'][0]['errors']))
+
+        full: GedcomRepository = read_repository_file(self.path).run_validations(VALIDATORS)
+        response = self.gedcom.handle_request({'command': 'validate', 'path': self.path})
+        self.assertEqual(
+            [(result['validator'], result['errors']) for result in response['results']],
+            [(validator.__name__, full._validation_results[validator].errors) for validator in VALIDATORS])
+
+        response = self.gedcom.handle_request({'command': 'validate', 'path': self.path, 'limit': 0})
+        self.assertEqual([result['errors'] for result in response['results']], [[]] * len(VALIDATORS))
+        self.assertEqual([result['count'] for result in response['results']],
+                         [len(full._validation_results[validator].errors) for validator in VALIDATORS])
+
+    def test_query_and_print(self) -> None:
+        """ test subjects and printer tables are answered as table fields """
+        response: Dict[str, Any] = self.gedcom.handle_request(
+            {'command': 'query', 'path': self.path, 'ids': ['I01', 'F01', 'X01']})
+        self.assertEqual(response['subjects']['I01']['Name'], 'Eren /Yaeger/')
+        self.assertEqual(response['subjects']['I01']['line_no'], 3)
+        self.assertEqual(response['subjects']['F01']['Husband ID'], 'I03')
+        self.assertIsNone(response['subjects']['X01'])
+
+        response = self.gedcom.handle_request(
+            {'command': 'print', 'path': self.path, 'printers': ['all_gedcom_individuals']})
+        self.assertEqual([row[0] for row in response['results'][0]['rows']], [i.id for i in self.parse_test_file('test').individuals])
+
+    def test_errors(self) -> None:
+        """ test invalid requests are answered with an error """
+        for request in [None, {'command': 'handle_request'}, {'command': 'validate'},
+                        {'command': 'validate', 'path': self.path, 'validators': ['unknown']},
+                        {'command': 'load', 'path': os.path.join(self.directory.name, 'missing.ged')}]:
+            self.assertIn('error', self.gedcom.handle_request(request), request)
+
+    def test_http(self) -> None:
+        """ test requests over localhost HTTP """
+        address: str = self.start_server('http://127.0.0.1:0')
+        response: Dict[str, Any] = send_request({'command': 'report', 'path': self.path}, address)
+        self.assertEqual(response['text'], self.run_index(self.path))
+        self.assertIn('error', send_request({'command': 'unknown'}, address))
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix sockets are not available')
+    def test_unix_socket(self) -> None:
+        """ test requests over a Unix socket """
+        address: str = self.start_server(f'unix:{os.path.join(self.directory.name, "gedcom.sock")}')
+        response: Dict[str, Any] = send_request({'command': 'status'}, address)
+        self.assertEqual(response, {'files': []})
+        response = send_request({'command': 'load', 'path': self.path}, address)
+        self.assertEqual((response['individuals'], response['families']), (10, 6))
+
+    def test_requests_of_other_files(self) -> None:
+        """ test status and requests of other files are answered while a file is in use """
+        other: str = os.path.join(self.directory.name, 'other.ged')
+        shutil.copyfile(self.path, other)
+        self.gedcom.handle_request({'command': 'load', 'path': self.path})
+        with self.gedcom.get_file_lock(self.path):
+            response: Dict[str, Any] = self.gedcom.handle_request({'command': 'status'})
+            self.assertEqual([file['path'] for file in response['files']], [self.path])
+            response = self.gedcom.handle_request({'command': 'load', 'path': other})
+            self.assertEqual((response['individuals'], response['families']), (10, 6))
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix sockets are not available')
+    def test_unix_socket_in_use(self) -> None:
+        """ test a live server and files which are not sockets are kept, a stale socket is replaced """
+        path: str = os.path.join(self.directory.name, 'gedcom.sock')
+        address: str = self.start_server(f'unix:{path}')
+        with self.assertRaises(GedcomException):
+            make_server(self.gedcom, address)
+
+        self.assertEqual(send_request({'command': 'status'}, address), {'files': []})
+
+        # a socket nothing listens on
+        stale: str = os.path.join(self.directory.name, 'stale.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as unbound:
+            unbound.bind(stale)
+
+        self.start_server(f'unix:{stale}')
+        self.assertEqual(send_request({'command': 'status'}, f'unix:{stale}'), {'files': []})
+
+        with self.assertRaises(GedcomException):
+            make_server(self.gedcom, f'unix:{self.path}')
+
+        self.assertTrue(os.path.isfile(self.path))
@@ -0,0 +1,38 @@
+from os.path import abspath, join
+from tempfile import TemporaryDirectory
+from typing import List
+from gedcom import GedcomRepository, read_repository_sqlite
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine
+from index import PIPELINE
+
+
+class SqliteRepositoryTest(GedcomTestCase):
+
+    def test_sqlite_repository(self) -> None:
+        """ test validators give the same results on SQLite repository """
+        validators: List = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+        with TemporaryDirectory() as directory:
+            for name in ['test', 'not_unique_ids', 'List_of_deceased']:
+                repo: GedcomRepository = self.parse_test_file(name)
+                stored: GedcomRepository = read_repository_sqlite(
+                    abspath(f'./test_files/{name}.ged'), join(directory, f'{name}.sqlite'), cache_size=16)
+
+                self.assertEqual(
+                    [(l.line_no, l.data, l.status) for l in repo.lines],
+                    [(l.line_no, l.data, l.status) for l in stored.lines])
+                self.assertEqual(
+                    [(i.id, i.name, i.birth, [f.id for f in i.spouse_of_list]) for i in repo.individuals],
+                    [(i.id, i.name, i.birth, [f.id for f in i.spouse_of_list]) for i in stored.individuals])
+                self.assertEqual(
+                    [(f.id, f.line_no) for f in repo.families[::-1]],
+                    [(stored.families[-index].id, stored.families[-index].line_no) for index in range(1, len(stored.families) + 1)])
+                self.assertEqual((stored.lines[0].data, stored.lines[-1].data), (repo.lines[0].data, repo.lines[-1].data))
+
+                expected = ValidationEngine(validators).run(repo)
+                results = ValidationEngine(validators).run(stored)
+                for validator in validators:
+                    self.assertEqual(expected[validator].errors, results[validator].errors)
+                    self.assertEqual(str(expected[validator].exception), str(results[validator].exception))
+
+                stored.close()
@@ -0,0 +1,42 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from os.path import abspath
+from gedcom import GedcomRepository, read_repository_file
+from gedcom.testing import GedcomTestCase
+from index import PIPELINE
+
+
+def run_pipeline(repo: GedcomRepository) -> str:
+    ''' output of the pipeline of index.py on repo '''
+    output: StringIO = StringIO()
+    with redirect_stdout(output):
+        for run, step in PIPELINE:
+            run(repo, step)
+
+    return output.getvalue()
+
+
+class StreamingTest(GedcomTestCase):
+
+    def test_streaming_repository(self) -> None:
+        """ test streaming parse matches list parse """
+        repo: GedcomRepository = self.parse_test_file('test')
+        streamed: GedcomRepository = read_repository_file(
+            abspath('./test_files/test.ged'), streaming=True)
+
+        self.assertIsNone(streamed.lines)
+        self.assertEqual(
+            [(i.id, i.line_no, i.name, i.birth) for i in repo.individuals],
+            [(i.id, i.line_no, i.name, i.birth) for i in streamed.individuals])
+        self.assertEqual(
+            [(f.id, f.line_no, f.children_id_list) for f in repo.families],
+            [(f.id, f.line_no, f.children_id_list) for f in streamed.families])
+        self.assertEqual(
+            [f.id for f in streamed.individual['I03'].spouse_of_list], ['F01', 'F01', 'F02'])
+
+    def test_streaming_pipeline(self) -> None:
+        """ test every validator and printer of index.py prints the same in streaming mode """
+        for name in ['test', 'illegitimate_dates', 'List_of_deceased', 'not_unique_ids']:
+            path: str = abspath(f'./test_files/{name}.ged')
+            self.assertEqual(run_pipeline(read_repository_file(path, streaming=True)),
+                             run_pipeline(read_repository_file(path)), name)
@@ -1,39 +1,80 @@
-from typing import List, Tuple
+from typing import Dict, List, Tuple, Iterator
 from collections import defaultdict
 from gedcom import GedcomRepository
+from gedcom.validation import ValidationRule, individual_hook, family_hook, as_validator, LINKED_SCOPE
+from gedcom.duplicates import GedcomDuplicateIndex
 
 
-def unique_name_and_birth(repo):
-  ''' US23: Unique name and birth date '''
-  errors = []
+class UniqueNameAndBirth(ValidationRule):
+  ''' US23: Unique name and birth date
+    near_duplicates: also report clusters of likely duplicates, e.g. with a name typo or a missing birth date '''
+  near_duplicates: bool = False
 
-  individuals_by_combination: Dict[Tuple[str],
-                                   List[GedcomIndividual]] = defaultdict(list)
+  def __init__(self, repo):
+    super().__init__(repo)
+    self.individuals_by_combination: Dict[Tuple[str, int],
+                                          List[GedcomIndividual]] = defaultdict(list)
 
-  for individual in repo.individuals:
+  @individual_hook
+  def collect_individual(self, individual):
     name = individual.name
-    birth = individual.birth
+    birth = individual.birth_ordinal
     if name and birth:
-      combination: Tuple[str] = (name, f'{birth}')
-      individuals_by_combination[combination].append(individual)
+      combination: Tuple[str, int] = (name, birth)
+      self.individuals_by_combination[combination].append(individual)
+
+  def finalize(self):
+    errors = []
+    for (name, birth), individuals in self.individuals_by_combination.items():
+      if len(individuals) > 1:
+        individual_line_info: List[str] = [
+            f'{individual.id} at line {individual.line_no}'
+            for individual in individuals
+        ]
+        errors.append(
+            f'ANOMALY US23: Individuals({", ".join(individual_line_info)}) are not unique by names and birth date: {name}|{individuals[0].birth}')
+
+    if self.near_duplicates:
+      errors.extend(self.get_near_duplicate_errors())
+
+    return errors
+
+  def get_near_duplicate_errors(self) -> Iterator[str]:
+    # clusters of a single name and birth date are reported above
+    combinations: Dict[int, Tuple[str, int]] = {
+        id(individual): combination
+        for combination, individuals in self.individuals_by_combination.items() if len(individuals) > 1
+        for individual in individuals
+    }
+
+    for cluster in GedcomDuplicateIndex(self.repo.individuals):
+      cluster_combinations = {combinations.get(id(individual)) for individual in cluster.individuals}
+      if len(cluster_combinations) == 1 and None not in cluster_combinations:
+        continue
 
-  for combo, individuals in individuals_by_combination.items():
-    if len(individuals) > 1:
       individual_line_info: List[str] = [
           f'{individual.id} at line {individual.line_no}'
-          for individual in individuals
+          for individual in cluster.individuals
       ]
-      errors.append(
-          f'ANOMALY US23: Individuals({", ".join(individual_line_info)}) are not unique by names and birth date: {"|".join(combo)}')
+      yield f'ANOMALY US23: Individuals({", ".join(individual_line_info)}) are likely duplicates (similarity {cluster.score:.2f})'
+
+
+unique_name_and_birth = as_validator(UniqueNameAndBirth, 'unique_name_and_birth')
+
 
-  return errors
+class NearDuplicateNameAndBirth(UniqueNameAndBirth):
+  near_duplicates = True
 
 
-def unique_first_names_in_families(repo):
+near_duplicate_name_and_birth = as_validator(NearDuplicateNameAndBirth, 'near_duplicate_name_and_birth')
+
+
+class UniqueFirstNamesInFamilies(ValidationRule):
   ''' US25: Unique first names in families '''
-  errors = []
+  scope = LINKED_SCOPE
 
-  for family in repo.families:
+  @family_hook
+  def check_family(self, family):
     individuals_by_first_name: Dict[str,
                                     List[GedcomIndividual]] = defaultdict(list)
 
@@ -48,7 +89,7 @@ def unique_first_names_in_families(repo):
             f'{individual.id} at line {individual.name_line_no}'
             for individual in individuals
         ]
-        errors.append(
-            f'ANOMALY US25: Family({family.id} at line{family.line_no}) does not have unique first names ({", ".join(name_line_info)})')
+        yield f'ANOMALY US25: Family({family.id} at line{family.line_no}) does not have unique first names ({", ".join(name_line_info)})'
+
 
-  return errors
+unique_first_names_in_families = as_validator(UniqueFirstNamesInFamilies, 'unique_first_names_in_families')
@@ -1,5 +1,6 @@
 from gedcom.testing import GedcomTestCase
-from features.unique_name_first_names_and_birthdate_validations import unique_name_and_birth, unique_first_names_in_families
+from gedcom.duplicates import GedcomDuplicateIndex, soundex
+from features.unique_name_first_names_and_birthdate_validations import unique_name_and_birth, near_duplicate_name_and_birth, unique_first_names_in_families
 
 
 class uniquenamefirstnamesandbirthdatevalidationsTest(GedcomTestCase):
@@ -14,6 +15,36 @@ class uniquenamefirstnamesandbirthdatevalidationsTest(GedcomTestCase):
         self.assert_file_validation_passes(
             'correct_unique_name_and_birth', unique_name_and_birth)
 
+    def test_near_duplicate_name_and_birth(self) -> None:
+        ''' US23: Test likely duplicates with a name typo or a missing birth date '''
+
+        self.assert_file_validation_fails(
+            'near_duplicate_name_and_birth', near_duplicate_name_and_birth,
+            ['ANOMALY US23: Individuals(I01 at line 3, I06 at line 29) are not unique by names and birth date: Jonathan /Smith/|1950-03-12',
+             'ANOMALY US23: Individuals(I01 at line 3, I02 at line 9, I06 at line 29) are likely duplicates (similarity 0.92)',
+             'ANOMALY US23: Individuals(I04 at line 20, I05 at line 26) are likely duplicates (similarity 0.90)'])
+
+        # exact duplicates are not reported again
+        self.assert_file_validation_fails(
+            'incorrect_unique_name_and_birth', near_duplicate_name_and_birth,
+            ['ANOMALY US23: Individuals(I01 at line 3, I02 at line 10) are not unique by names and birth date: Fatima /Porgho/|1972-02-07'])
+
+        self.assert_file_validation_passes(
+            'correct_unique_name_and_birth', near_duplicate_name_and_birth)
+
+    def test_duplicate_index(self) -> None:
+        ''' Test Soundex codes and duplicate clusters '''
+
+        self.assertEqual([soundex(name) for name in ('Robert', 'Rupert', 'Ashcraft', 'Tymczak', 'Pfister', 'Lee', '')],
+                         ['R163', 'R163', 'A261', 'T522', 'P236', 'L000', ''])
+
+        repo = self.parse_test_file('near_duplicate_name_and_birth')
+        clusters = GedcomDuplicateIndex(repo.individuals).get_clusters()
+        self.assertEqual([cluster.line_numbers for cluster in clusters], [[3, 9, 29], [20, 26]])
+
+        # a window of a single individual has no candidates
+        self.assertFalse(GedcomDuplicateIndex(repo.individuals, window_size=1).get_clusters())
+
     def test_unique_first_names_in_families(self) -> None:
         ''' US25: Test Unique first names in families '''
 
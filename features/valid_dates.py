@@ -1,62 +1,75 @@
 from datetime import date as Date
 from gedcom import GedcomRepository
+from gedcom.validation import ValidationRule, individual_hook, family_hook, columns_hook, as_validator, LINKED_SCOPE, TREE_SCOPE
 
 
-def divorce_before_death(repo: GedcomRepository) -> bool:
+class DivorceBeforeDeath(ValidationRule):
     """ US06: Divorce date occurs before death date"""
-    errors = []
+    scope = LINKED_SCOPE
 
-    for family in repo.families:
+    @family_hook
+    def check_family(self, family):
         divorce_date = family.divorce
 
         if not divorce_date:
-            continue
+            return
 
         for husband in family.husbands:
             if husband.death and husband.death < divorce_date:
                 divorce_line_no = family.divorce_line_no
                 death_line_no = husband.death_line_no
-                errors.append(
-                    f'ERROR US06: Divorce date (at line {divorce_line_no}) for Family({family.id}) occurs after Husband({husband.id}) death date (at line {death_line_no}).')
+                yield f'ERROR US06: Divorce date (at line {divorce_line_no}) for Family({family.id}) occurs after Husband({husband.id}) death date (at line {death_line_no}).'
 
         for wife in family.wifes:
             if wife.death and wife.death < divorce_date:
                 divorce_line_no = family.divorce_line_no
                 death_line_no = wife.death_line_no
-                errors.append(
-                    f'ERROR US06: Divorce date (at line {divorce_line_no}) for Family({family.id}) occurs after Wife({wife.id}) death date (at line {death_line_no}).')
+                yield f'ERROR US06: Divorce date (at line {divorce_line_no}) for Family({family.id}) occurs after Wife({wife.id}) death date (at line {death_line_no}).'
 
-    return errors
 
+divorce_before_death = as_validator(DivorceBeforeDeath, 'divorce_before_death')
 
-def dates_before_current_date(repo: GedcomRepository):
+
+class DatesBeforeCurrentDate(ValidationRule):
     """ US01 Dates occur before current date"""
-    present = Date.today()
-    errors = []
+    # errors depend on the current date
+    scope = TREE_SCOPE
+
+    def __init__(self, repo: GedcomRepository) -> None:
+        super().__init__(repo)
+        self.present = Date.today()
 
-    for family in repo.families:
+    @family_hook
+    def check_family(self, family):
         marriage_date = family.marriage
         divorce_date = family.divorce
 
-        if marriage_date and marriage_date > present:
+        if marriage_date and marriage_date > self.present:
             invalid_date_line_no = family.marriage_line_no
-            errors.append(
-                f'ERROR US01: Family({family.id}) marriage date (at line {invalid_date_line_no}) occurs after current date.')
+            yield f'ERROR US01: Family({family.id}) marriage date (at line {invalid_date_line_no}) occurs after current date.'
 
-        if divorce_date and divorce_date > present:
+        if divorce_date and divorce_date > self.present:
             invalid_date_line_no = family.divorce_line_no
-            errors.append(
-                f'ERROR US01: Family({family.id}) divorce date (at line {invalid_date_line_no}) occurs after current date.')
+            yield f'ERROR US01: Family({family.id}) divorce date (at line {invalid_date_line_no}) occurs after current date.'
 
-    for individual in repo.individuals:
-        if individual.birth and individual.birth > present:
+    @individual_hook
+    def check_individual(self, individual):
+        if individual.birth and individual.birth > self.present:
             invalid_date_line_no = individual.birth_line_no
-            errors.append(
-                f'ERROR US01: Individual({individual.id}) birth date (at line {invalid_date_line_no}) occurs after current date.')
+            yield f'ERROR US01: Individual({individual.id}) birth date (at line {invalid_date_line_no}) occurs after current date.'
 
-        if individual.death and individual.death > present:
+        if individual.death and individual.death > self.present:
             invalid_date_line_no = individual.death_line_no
-            errors.append(
-                f'ERROR US01: Individual({individual.id}) death date (at line {invalid_date_line_no}) occurs after current date.')
+            yield f'ERROR US01: Individual({individual.id}) death date (at line {invalid_date_line_no}) occurs after current date.'
+
+    @columns_hook(check_individual)
+    def check_individual_columns(self, columns):
+        present = self.present.toordinal()
+        birth_after = columns.birth_known & (columns.birth_ordinal > present)
+        death_after = columns.death_known & (columns.death_ordinal > present)
+
+        for row in columns.rows(birth_after | death_after):
+            yield from self.check_individual(columns.individuals[row])
+
 
-    return errors
+dates_before_current_date = as_validator(DatesBeforeCurrentDate, 'dates_before_current_date')
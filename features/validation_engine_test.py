@@ -0,0 +1,45 @@
+from typing import List
+from gedcom.testing import GedcomTestCase
+from gedcom.validation import ValidationEngine, ValidationRule, individual_hook, family_hook, as_validator
+from index import PIPELINE
+from gedcom import GedcomRepository
+
+
+class FailingRule(ValidationRule):
+    ''' rule failing in its second hook '''
+
+    @family_hook
+    def check_family(self, family):
+        yield family.id
+
+    @individual_hook
+    def check_individual(self, individual):
+        raise ValueError(f'failed at {individual.id}')
+
+
+failing_rule = as_validator(FailingRule, 'failing_rule')
+
+
+class ValidationEngineTest(GedcomTestCase):
+
+    def test_fused_validation(self) -> None:
+        """ test single pass results match validators run one after another """
+        validators: List = [step for run, step in PIPELINE if run is GedcomRepository.validate]
+        for name in ['test', 'not_unique_ids', 'incorrect_gender_roles']:
+            repo: GedcomRepository = self.parse_test_file(name)
+            results = ValidationEngine(validators).run(repo)
+
+            for validator in validators:
+                try:
+                    errors: List[str] = validator(repo)
+                except Exception as e:
+                    self.assertEqual(str(e), str(results[validator].exception))
+                else:
+                    self.assertIsNone(results[validator].exception)
+                    self.assertEqual(errors, results[validator].errors)
+
+    def test_failing_rule(self) -> None:
+        """ test failed hook drops rule errors """
+        repo: GedcomRepository = self.parse_test_file('test')
+        with self.assertRaisesRegex(ValueError, 'failed at I01'):
+            failing_rule(repo)
@@ -1,3 +1,5 @@
 from .file import GedcomLine
 from .tags.base import GedcomData
 from .repository import GedcomRepository, read_repository_file, prompt_repository_file
+from .parallel import read_repository_parallel
+from .sqlite_repository import read_repository_sqlite
@@ -0,0 +1,192 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+import gc
+from hashlib import blake2b
+import os
+import pickle
+import tempfile
+from .file import GedcomLineTable
+
+
+# bump when the snapshot layout changes
+CACHE_FORMAT_VERSION: int = 1
+
+# default upper bound of all snapshots in a cache directory
+CACHE_SIZE_LIMIT: int = 4 << 30
+
+# bytes hashed at a time
+HASH_CHUNK_SIZE: int = 1 << 22
+
+# modules whose classes are stored in snapshots
+SNAPSHOT_MODULES: Tuple[str, ...] = (
+    'file.py', 'repository.py', 'relations.py', 'diagnostics.py', 'incremental.py',
+    'tags/base.py', 'tags/date.py', 'tags/individual.py', 'tags/family.py', 'tags/top_level.py')
+
+
+@lru_cache(maxsize=None)
+def get_code_fingerprint() -> str:
+    ''' hash of the sources of snapshot classes, so snapshots are dropped when they change '''
+    digest = blake2b(digest_size=8)
+    package_path: str = os.path.dirname(os.path.abspath(__file__))
+    for module in SNAPSHOT_MODULES:
+        with open(os.path.join(package_path, module), 'rb') as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    ''' pause cyclic garbage collection while (un)pickling millions of objects '''
+    enabled: bool = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def get_content_hash(path: str) -> str:
+    ''' blake2b hash of file content '''
+    digest = blake2b(digest_size=20)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class GedcomRepositoryCache:
+    ''' on-disk snapshots of parsed repositories, keyed by file content hash
+        file size and mtime are remembered per path to skip hashing unchanged files,
+        least recently used snapshots are evicted beyond size_limit '''
+
+    def __init__(self, directory: Optional[str] = None, size_limit: int = CACHE_SIZE_LIMIT) -> None:
+        self.directory: str = directory or os.environ.get('GEDCOM_CACHE_DIR') or \
+            os.path.join(os.path.expanduser('~'), '.cache', 'gedcom')
+        self.size_limit: int = size_limit
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, 'paths.pickle')
+
+    def _load_index(self) -> Dict[str, Tuple[int, int, str]]:
+        ''' get path to (size, mtime, content hash) index '''
+        try:
+            with open(self.index_path, 'rb') as file:
+                return pickle.load(file)
+        except Exception as e:
+            # missing or unreadable index is rebuilt
+            return {}
+
+    def _write(self, path: str, data: bytes) -> None:
+        ''' write file atomically within cache directory '''
+        os.makedirs(self.directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except:
+            os.unlink(temp_path)
+            raise
+
+    def get_key(self, path: str) -> str:
+        ''' get content hash of file, reusing the hash while size and mtime are unchanged '''
+        path = os.path.abspath(path)
+        stat: os.stat_result = os.stat(path)
+        index: Dict[str, Tuple[int, int, str]] = self._load_index()
+
+        size, mtime, content_hash = index.get(path, (None, None, None))
+        if size == stat.st_size and mtime == stat.st_mtime_ns:
+            return content_hash
+
+        content_hash = get_content_hash(path)
+        index[path] = stat.st_size, stat.st_mtime_ns, content_hash
+        try:
+            self._write(self.index_path, pickle.dumps(index, pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            # cache is best effort, hash again next time
+            pass
+
+        return content_hash
+
+    def get_snapshot_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}-v{CACHE_FORMAT_VERSION}-{get_code_fingerprint()}.snapshot')
+
+    def get_incremental_path(self, path: str) -> str:
+        ''' get snapshot path of the incremental repository of file, keyed by path as its content changes '''
+        key: str = blake2b(os.path.abspath(path).encode(), digest_size=20).hexdigest()
+        return os.path.join(self.directory, f'{key}-v{CACHE_FORMAT_VERSION}-{get_code_fingerprint()}.incremental.snapshot')
+
+    def load(self, path: str) -> Optional['GedcomRepository']:
+        ''' get cached repository of file, None if not cached '''
+        repo: Optional['GedcomRepository'] = self._load_snapshot(self.get_snapshot_path(self.get_key(path)))
+
+        # line data is read back from the file the snapshot was loaded for
+        if repo is not None and isinstance(repo.lines, GedcomLineTable):
+            repo.lines.source = path
+
+        return repo
+
+    def load_incremental(self, path: str) -> Optional['GedcomIncrementalRepository']:
+        ''' get incremental repository of file as last stored, None if not cached '''
+        return self._load_snapshot(self.get_incremental_path(path))
+
+    def _load_snapshot(self, snapshot_path: str) -> Optional['GedcomRepository']:
+        try:
+            with open(snapshot_path, 'rb') as file, gc_paused():
+                repo: 'GedcomRepository' = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # drop unreadable snapshot
+            self.discard(snapshot_path)
+            return None
+
+        # mark as recently used
+        os.utime(snapshot_path)
+        return repo
+
+    def store(self, path: str, repo: 'GedcomRepository') -> None:
+        ''' save snapshot of repository parsed from file, then evict over size limit '''
+        self._store_snapshot(self.get_snapshot_path(self.get_key(path)), repo)
+
+    def store_incremental(self, path: str, repo: 'GedcomIncrementalRepository') -> None:
+        ''' save incremental repository of file, replacing the one stored before '''
+        self._store_snapshot(self.get_incremental_path(path), repo)
+
+    def _store_snapshot(self, snapshot_path: str, repo: 'GedcomRepository') -> None:
+        try:
+            with gc_paused():
+                snapshot: bytes = pickle.dumps(repo, pickle.HIGHEST_PROTOCOL)
+
+            self._write(snapshot_path, snapshot)
+            self.evict()
+        except OSError as e:
+            # cache is best effort, parse again next time
+            pass
+
+    def discard(self, snapshot_path: str) -> None:
+        try:
+            os.unlink(snapshot_path)
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        ''' remove least recently used snapshots until within size limit '''
+        snapshots: List[Tuple[float, int, str]] = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.snapshot'):
+                stat: os.stat_result = entry.stat()
+                snapshots.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size: int = sum(size for used, size, snapshot_path in snapshots)
+        for used, size, snapshot_path in sorted(snapshots):
+            if total_size <= self.size_limit:
+                break
+
+            self.discard(snapshot_path)
+            total_size -= size
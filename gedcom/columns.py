@@ -0,0 +1,166 @@
+from typing import List, Optional, Sequence, Tuple
+from datetime import date as Date
+try:
+    import numpy as np
+except ImportError:
+    # rules visit subjects one at a time without NumPy
+    np = None
+
+
+def get_rows(mask: 'np.ndarray') -> List[int]:
+    ''' get rows where mask is True, in order '''
+    return np.flatnonzero(mask).tolist()
+
+
+def month_day_keys(month: 'np.ndarray', day: 'np.ndarray') -> 'np.ndarray':
+    ''' keys of calendar month and day, ordered like (month, day) '''
+    return month * 32 + day
+
+
+class GedcomIndividualColumns:
+    ''' birth and death dates of individuals as NumPy arrays, row n is individuals[n]
+        unknown dates have ordinal, year and month-day 0 and are False in the known masks '''
+
+    def __init__(self, individuals: Sequence['GedcomIndividual']) -> None:
+        self.individuals: Sequence['GedcomIndividual'] = individuals
+
+        # a single pass over the subjects, everything after is array arithmetic
+        birth: List[int] = []
+        death: List[int] = []
+        for individual in individuals:
+            birth_ymd = individual.birth_ymd
+            birth.extend(birth_ymd or (0, 0, 0))
+            death_ymd = individual.death_ymd
+            death.extend(death_ymd or (0, 0, 0))
+
+        birth_array: np.ndarray = np.array(birth, dtype=np.int64).reshape(-1, 3)
+        death_array: np.ndarray = np.array(death, dtype=np.int64).reshape(-1, 3)
+
+        self.birth_known: np.ndarray = birth_array[:, 0] != 0
+        self.birth_year: np.ndarray = birth_array[:, 0]
+        self.birth_month_day: np.ndarray = month_day_keys(birth_array[:, 1], birth_array[:, 2])
+        self.birth_ordinal: np.ndarray = self._get_ordinals(birth_array, self.birth_known)
+
+        self.death_known: np.ndarray = death_array[:, 0] != 0
+        self.death_year: np.ndarray = death_array[:, 0]
+        self.death_month_day: np.ndarray = month_day_keys(death_array[:, 1], death_array[:, 2])
+        self.death_ordinal: np.ndarray = self._get_ordinals(death_array, self.death_known)
+
+    def __len__(self) -> int:
+        return len(self.individuals)
+
+    @staticmethod
+    def _get_ordinals(ymd: 'np.ndarray', known: 'np.ndarray') -> 'np.ndarray':
+        ''' day numbers of (year, month, day) rows, same as date.toordinal() '''
+        year, month, day = ymd[:, 0], ymd[:, 1], ymd[:, 2]
+        # days before month of a common year, leap years add Feb 29 from March on
+        days_before_month: np.ndarray = np.array([0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334], dtype=np.int64)
+        leap: np.ndarray = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        y: np.ndarray = year - 1
+        ordinals: np.ndarray = y * 365 + y // 4 - y // 100 + y // 400 + days_before_month[month] + \
+            ((month > 2) & leap) + day
+        return np.where(known, ordinals, 0)
+
+    def ages_at(self, date: Date) -> 'np.ndarray':
+        ''' full years of each individual at death, or else at date, like GedcomIndividual.age_at
+            rows without a birth date are 0, check birth_known '''
+        died: np.ndarray = self.death_known & (self.death_ordinal < date.toordinal())
+        end_year: np.ndarray = np.where(died, self.death_year, date.year)
+        end_month_day: np.ndarray = np.where(died, self.death_month_day, date.month * 32 + date.day)
+        ages: np.ndarray = end_year - self.birth_year - (end_month_day < self.birth_month_day)
+        return np.where(self.birth_known, ages, 0)
+
+    rows = staticmethod(get_rows)
+
+    def select(self, mask: 'np.ndarray') -> List['GedcomIndividual']:
+        ''' get individuals of rows where mask is True, in order '''
+        return [self.individuals[row] for row in self.rows(mask)]
+
+
+class GedcomFamilyColumns:
+    ''' children of families with their birth dates as NumPy arrays in compressed sparse rows,
+        children of family row f are entries offsets[f]:offsets[f + 1], in the order of family.children '''
+
+    def __init__(self, families: Sequence['GedcomFamily'], children: 'GedcomAdjacency', individual_columns: GedcomIndividualColumns) -> None:
+        self.families: Sequence['GedcomFamily'] = families
+        self.individuals: Sequence['GedcomIndividual'] = individual_columns.individuals
+
+        self.offsets: np.ndarray = np.asarray(children.offsets, dtype=np.int64)
+        self.counts: np.ndarray = np.diff(self.offsets)
+        # individual row and family row of each entry
+        self.children: np.ndarray = np.asarray(children.targets, dtype=np.int64)
+        self.child_family: np.ndarray = np.repeat(np.arange(len(self.counts)), self.counts)
+
+        self.birth_known: np.ndarray = individual_columns.birth_known[self.children]
+        self.birth_ordinal: np.ndarray = individual_columns.birth_ordinal[self.children]
+        # same key as gedcom.dates.month_day_key
+        self.birth_month_key: np.ndarray = individual_columns.birth_year[self.children] * 12 * 32 + \
+            individual_columns.birth_month_day[self.children]
+
+        # entries of born children by family, birth date and family order
+        born: np.ndarray = np.flatnonzero(self.birth_known)
+        self.born: np.ndarray = born[np.lexsort((born, self.birth_ordinal[born], self.child_family[born]))]
+
+    def __len__(self) -> int:
+        return len(self.families)
+
+    rows = staticmethod(get_rows)
+
+    def get_child(self, entry: int) -> 'GedcomIndividual':
+        return self.individuals[self.children[entry]]
+
+    def get_birth_groups(self) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        ''' group children of each family born on the same day
+            get group of each entry of born, first entry and size of each group, groups are ordered like born '''
+        family: np.ndarray = self.child_family[self.born]
+        ordinal: np.ndarray = self.birth_ordinal[self.born]
+        starts: np.ndarray = np.ones(len(self.born), dtype=bool)
+        starts[1:] = (family[1:] != family[:-1]) | (ordinal[1:] != ordinal[:-1])
+
+        group_starts: np.ndarray = np.flatnonzero(starts)
+        sizes: np.ndarray = np.diff(np.append(group_starts, len(self.born)))
+        return np.cumsum(starts) - 1, self.born[group_starts], sizes
+
+    def get_birth_pairs(self, min_days: int, max_month_keys: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        ''' get (older, younger) entries of siblings born at least min_days apart and at most max_month_keys apart
+            in gedcom.dates.month_day_key, ordered like born by the older then the younger sibling '''
+        family: np.ndarray = self.child_family[self.born] << 32
+        # birth dates of siblings are sorted, so both bounds are a single range of later siblings
+        firsts: np.ndarray = np.searchsorted(family + self.birth_ordinal[self.born], family + self.birth_ordinal[self.born] + min_days)
+        month_keys: np.ndarray = family + self.birth_month_key[self.born]
+        ends: np.ndarray = np.searchsorted(month_keys, month_keys + max_month_keys, side='right')
+
+        counts: np.ndarray = np.maximum(ends - firsts, 0)
+        older: np.ndarray = np.repeat(np.arange(len(self.born)), counts)
+        # positions of the younger siblings counted from the first of each range
+        steps: np.ndarray = np.arange(len(older)) - np.repeat(np.cumsum(counts) - counts, counts)
+        younger: np.ndarray = np.repeat(firsts, counts) + steps
+        return self.born[older], self.born[younger]
+
+    def get_grouped_births(self, min_size: int) -> 'np.ndarray':
+        ''' get entries of children born on the same day as at least min_size - 1 siblings,
+            groups follow their first child in family order, children of a group are in family order '''
+        groups, firsts, sizes = self.get_birth_groups()
+        kept: np.ndarray = sizes[groups] >= min_size
+        entries: np.ndarray = self.born[kept]
+        return entries[np.lexsort((entries, firsts[groups[kept]]))]
+
+
+def get_individual_columns(individuals: Sequence['GedcomIndividual']) -> Optional[GedcomIndividualColumns]:
+    ''' get columns of individuals, None without NumPy '''
+    if np is None:
+        return None
+
+    return GedcomIndividualColumns(individuals)
+
+
+def get_family_columns(
+    families: Sequence['GedcomFamily'],
+    relations: Optional['GedcomRelationIndex'],
+    individual_columns: Optional[GedcomIndividualColumns]
+) -> Optional[GedcomFamilyColumns]:
+    ''' get columns of families, None without NumPy or a relation index '''
+    if relations is None or individual_columns is None:
+        return None
+
+    return GedcomFamilyColumns(families, relations.children, individual_columns)
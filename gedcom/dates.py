@@ -0,0 +1,61 @@
+from typing import Optional, Tuple
+from datetime import date as Date
+
+
+# (year, month, day) of a calendar date
+YMD = Tuple[int, int, int]
+
+# days before the first of each month in a common year
+DAYS_BEFORE_MONTH: Tuple[int, ...] = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def is_leap_year(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def to_ordinal(year: int, month: int, day: int) -> int:
+    ''' day number of date, same as date.toordinal() '''
+    y: int = year - 1
+    return y * 365 + y // 4 - y // 100 + y // 400 + DAYS_BEFORE_MONTH[month] + \
+        (1 if month > 2 and is_leap_year(year) else 0) + day
+
+
+def get_ymd(date: Optional[Date]) -> Optional[YMD]:
+    ''' get (year, month, day) of date, None if no date '''
+    return (date.year, date.month, date.day) if date else None
+
+
+def years_between(start: YMD, end: YMD) -> int:
+    ''' full years from start to end, anniversaries of Feb 29 fall on Mar 1 in common years '''
+    start_year, start_month, start_day = start
+    end_year, end_month, end_day = end
+    before_anniversary: bool = end_month < start_month or (end_month == start_month and end_day < start_day)
+    return end_year - start_year - (1 if before_anniversary else 0)
+
+
+def years_apart(date1: YMD, date2: YMD) -> int:
+    ''' full years between two dates in either order '''
+    return years_between(date2, date1) if date1 > date2 else years_between(date1, date2)
+
+
+def months_between(start: YMD, end: YMD) -> int:
+    ''' full months from start to end, a month without the start day completes on the first of the next '''
+    start_year, start_month, start_day = start
+    end_year, end_month, end_day = end
+    return (end_year - start_year) * 12 + end_month - start_month - (1 if end_day < start_day else 0)
+
+
+def month_day_key(date: YMD) -> int:
+    ''' key of calendar month and day, dates N months apart on the same day are N * 32 apart '''
+    year, month, day = date
+    return (year * 12 + month) * 32 + day
+
+
+def anniversary(date: YMD, years: int) -> YMD:
+    ''' date of the given anniversary, Mar 1 for Feb 29 in common years '''
+    year, month, day = date
+    year += years
+    if month == 2 and day == 29 and not is_leap_year(year):
+        return year, 3, 1
+
+    return year, month, day
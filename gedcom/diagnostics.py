@@ -0,0 +1,66 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from collections import Counter
+from operator import itemgetter
+
+
+# line number, tag and reason of a line rejected while parsing
+GedcomDiagnostic = Tuple[int, str, str]
+
+
+class GedcomDiagnostics:
+    ''' lines rejected while parsing and why, in parse order
+        a line is rejected once by the data parsed from it, a subject with a rejected ID line is dropped '''
+    __slots__ = 'items'
+
+    def __init__(self, items: Iterable[GedcomDiagnostic] = ()) -> None:
+        self.items: List[GedcomDiagnostic] = list(items)
+
+    def add(self, line: 'GedcomLine', reason: str) -> None:
+        self.items.append((line.line_no, line.tag, reason))
+
+    def extend(self, diagnostics: Iterable[GedcomDiagnostic]) -> None:
+        self.items.extend(diagnostics)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[GedcomDiagnostic]:
+        return iter(self.items)
+
+    def get_reason_counts(self) -> Dict[str, int]:
+        ''' get count of rejected lines by reason, most common first '''
+        return dict(Counter(reason for line_no, tag, reason in self).most_common())
+
+    def get_line_reasons(self) -> Dict[int, List[str]]:
+        ''' get reasons of each rejected line number '''
+        reasons: Dict[int, List[str]] = {}
+        for line_no, tag, reason in self:
+            reasons.setdefault(line_no, []).append(reason)
+
+        return reasons
+
+
+class GedcomLazyDiagnostics(GedcomDiagnostics):
+    ''' diagnostics of a lazy repository, subjects are parsed on first access and add their lines then,
+        so subjects not parsed yet are parsed on read, and items are read in line order as a full parse lists them '''
+    __slots__ = 'repo'
+
+    def __init__(self, repo: 'GedcomRepository') -> None:
+        super().__init__()
+        self.repo: 'GedcomRepository' = repo
+
+    def parse_subjects(self) -> None:
+        ''' parse subjects not parsed yet, then order items by line number '''
+        for subject in self.repo.individuals + self.repo.families:
+            if not subject.parsed:
+                subject.parse()
+
+        self.items.sort(key=itemgetter(0))
+
+    def __len__(self) -> int:
+        self.parse_subjects()
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[GedcomDiagnostic]:
+        self.parse_subjects()
+        return iter(self.items)
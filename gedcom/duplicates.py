@@ -0,0 +1,270 @@
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from difflib import SequenceMatcher
+from functools import lru_cache
+from .dates import YMD
+
+
+# digit of each consonant in American Soundex, vowels and H, W, Y have none
+SOUNDEX_DIGITS: Dict[str, str] = {
+    **dict.fromkeys('BFPV', '1'), **dict.fromkeys('CGJKQSXZ', '2'), **dict.fromkeys('DT', '3'),
+    'L': '4', **dict.fromkeys('MN', '5'), 'R': '6'}
+
+# individuals compared around each individual in the sorted order of a pass
+WINDOW_SIZE: int = 8
+
+# birth years per block of the birth pass
+YEAR_BUCKET_SIZE: int = 5
+
+# least score of a pair of individuals in a cluster
+THRESHOLD: float = 0.85
+
+# names and name pairs whose Soundex code or similarity is kept
+NAME_CACHE_SIZE: int = 1 << 16
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def soundex(name: str) -> str:
+    ''' American Soundex code of name, '' when name has no letters '''
+    letters: str = ''.join(letter for letter in name.upper() if 'A' <= letter <= 'Z')
+    if not letters:
+        return ''
+
+    code: List[str] = [letters[0]]
+    previous: Optional[str] = SOUNDEX_DIGITS.get(letters[0])
+    for letter in letters[1:]:
+        digit: Optional[str] = SOUNDEX_DIGITS.get(letter)
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        # H and W do not separate letters of the same digit, vowels do
+        if letter not in 'HW':
+            previous = digit
+
+    return ''.join(code).ljust(4, '0')
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def get_name_ratio(name: str, other: str) -> float:
+    ''' difflib similarity of two names, given names and surnames repeat across many individuals '''
+    return SequenceMatcher(None, name, other, autojunk=False).ratio()
+
+
+class GedcomDuplicateRecord:
+    ''' name, birth date and sex of an individual prepared for blocking and scoring '''
+    __slots__ = 'individual', 'position', 'given_name', 'surname', 'given_code', 'surname_code', 'birth', 'sex'
+
+    def __init__(self, individual: 'GedcomIndividual', position: int) -> None:
+        self.individual: 'GedcomIndividual' = individual
+        self.position: int = position
+        self.given_name, self.surname = self.get_name_parts(individual)
+        self.given_code: str = soundex(self.given_name)
+        self.surname_code: str = soundex(self.surname)
+        self.birth: Optional[YMD] = individual.birth_ymd
+        try:
+            self.sex: Optional[str] = individual.sex
+        except AttributeError:
+            # no SEX line
+            self.sex = None
+
+    @staticmethod
+    def get_name_parts(individual: 'GedcomIndividual') -> Tuple[str, str]:
+        ''' get lower case (given name, surname) of NAME given /surname/, both '' without a NAME line '''
+        try:
+            name: str = individual.name or ''
+        except AttributeError:
+            return '', ''
+
+        given_name, _, rest = name.partition('/')
+        return given_name.strip().lower(), rest.partition('/')[0].strip().lower()
+
+
+class GedcomSimilarityScorer:
+    ''' similarity of two individuals from 0 to 1, a weighted mean of given name, surname, birth date and sex similarity
+        names are compared with difflib, a missing birth date or sex is half similar,
+        birth dates differing in one of day, month or year up to max_year_gap are half similar '''
+
+    def __init__(
+        self,
+        given_name_weight: float = 0.45,
+        surname_weight: float = 0.25,
+        birth_weight: float = 0.2,
+        sex_weight: float = 0.1,
+        max_year_gap: int = 2
+    ) -> None:
+        total: float = given_name_weight + surname_weight + birth_weight + sex_weight
+        self.given_name_weight: float = given_name_weight / total
+        self.surname_weight: float = surname_weight / total
+        self.birth_weight: float = birth_weight / total
+        self.sex_weight: float = sex_weight / total
+        self.max_year_gap: int = max_year_gap
+
+    @staticmethod
+    def name_similarity(name: str, other: str) -> float:
+        if name == other:
+            return 1.0
+
+        return get_name_ratio(name, other) if name < other else get_name_ratio(other, name)
+
+    def birth_similarity(self, birth: Optional[YMD], other: Optional[YMD]) -> float:
+        if birth is None or other is None:
+            return 0.5
+        if birth == other:
+            return 1.0
+
+        # a typo changes one of year, month and day
+        year, month, day = birth
+        other_year, other_month, other_day = other
+        if year != other_year:
+            return 0.5 if month == other_month and day == other_day and abs(year - other_year) <= self.max_year_gap else 0.0
+
+        return 0.5 if month == other_month or day == other_day else 0.0
+
+    @staticmethod
+    def sex_similarity(sex: Optional[str], other: Optional[str]) -> float:
+        if not sex or not other:
+            return 0.5
+
+        return 1.0 if sex == other else 0.0
+
+    def bound(self, record: GedcomDuplicateRecord, other: GedcomDuplicateRecord) -> float:
+        ''' upper bound of the score without comparing names, pairs below threshold are not scored '''
+        # name similarity is at most 2 * shorter length / total length
+        given_length, other_given_length = len(record.given_name), len(other.given_name)
+        surname_length, other_surname_length = len(record.surname), len(other.surname)
+        return self.given_name_weight * (
+                2 * (given_length if given_length < other_given_length else other_given_length) /
+                (given_length + other_given_length) if given_length != other_given_length else 1.0) + \
+            self.surname_weight * (
+                2 * (surname_length if surname_length < other_surname_length else other_surname_length) /
+                (surname_length + other_surname_length) if surname_length != other_surname_length else 1.0) + \
+            self.birth_weight * self.birth_similarity(record.birth, other.birth) + \
+            self.sex_weight * self.sex_similarity(record.sex, other.sex)
+
+    def __call__(self, record: GedcomDuplicateRecord, other: GedcomDuplicateRecord) -> float:
+        return self.given_name_weight * self.name_similarity(record.given_name, other.given_name) + \
+            self.surname_weight * self.name_similarity(record.surname, other.surname) + \
+            self.birth_weight * self.birth_similarity(record.birth, other.birth) + \
+            self.sex_weight * self.sex_similarity(record.sex, other.sex)
+
+
+class GedcomDuplicateCluster:
+    ''' individuals which are likely the same person, in repo.individuals order
+        score: least score of the pairs joining the cluster '''
+    __slots__ = 'individuals', 'score'
+
+    def __init__(self, individuals: List['GedcomIndividual'], score: float) -> None:
+        self.individuals: List['GedcomIndividual'] = individuals
+        self.score: float = score
+
+    @property
+    def line_numbers(self) -> List[int]:
+        return [individual.line_no for individual in self.individuals]
+
+    def __repr__(self) -> str:
+        members: str = ', '.join(f'{individual.id} at line {individual.line_no}' for individual in self.individuals)
+        return f'GedcomDuplicateCluster({members}, score={self.score:.2f})'
+
+
+class GedcomDuplicateIndex:
+    ''' candidate duplicate individuals, without comparing every pair
+        records are blocked by surname Soundex code and compared within a sorted neighbourhood window in two passes:
+        by birth year bucket and given name, and by given name Soundex code for missing or distant birth dates,
+        candidate pairs scoring at least threshold are joined into clusters '''
+
+    def __init__(
+        self,
+        individuals: Sequence['GedcomIndividual'],
+        scorer: Optional[Callable[[GedcomDuplicateRecord, GedcomDuplicateRecord], float]] = None,
+        threshold: float = THRESHOLD,
+        window_size: int = WINDOW_SIZE,
+        year_bucket_size: int = YEAR_BUCKET_SIZE
+    ) -> None:
+        self.scorer: Callable[[GedcomDuplicateRecord, GedcomDuplicateRecord], float] = scorer or GedcomSimilarityScorer()
+        self.threshold: float = threshold
+        self.window_size: int = window_size
+        self.year_bucket_size: int = year_bucket_size
+        records: Iterator[GedcomDuplicateRecord] = (
+            GedcomDuplicateRecord(individual, position) for position, individual in enumerate(individuals))
+        self.records: List[GedcomDuplicateRecord] = [record for record in records if record.given_name or record.surname]
+
+    def get_birth_block(self, record: GedcomDuplicateRecord) -> Tuple[str, int]:
+        return record.surname_code, record.birth[0] // self.year_bucket_size
+
+    def get_name_block(self, record: GedcomDuplicateRecord) -> Tuple[str, str]:
+        return record.surname_code, record.given_code
+
+    def get_candidate_pairs(self) -> Set[Tuple[int, int]]:
+        ''' get (earlier, later) record positions of pairs sharing a block within the window of a pass '''
+        pairs: Set[Tuple[int, int]] = set()
+
+        born: List[GedcomDuplicateRecord] = [record for record in self.records if record.birth]
+        born.sort(key=lambda record: (*self.get_birth_block(record), record.given_name, record.surname, record.birth, record.position))
+        self._add_window_pairs(pairs, born, self.get_birth_block)
+
+        named: List[GedcomDuplicateRecord] = sorted(
+            self.records, key=lambda record: (*self.get_name_block(record), record.given_name, record.surname, record.position))
+        self._add_window_pairs(pairs, named, self.get_name_block)
+
+        return pairs
+
+    def _add_window_pairs(
+        self,
+        pairs: Set[Tuple[int, int]],
+        records: List[GedcomDuplicateRecord],
+        get_block: Callable[[GedcomDuplicateRecord], Tuple]
+    ) -> None:
+        blocks: List[Tuple] = [get_block(record) for record in records]
+        for i, record in enumerate(records):
+            for j in range(i + 1, min(i + self.window_size, len(records))):
+                if blocks[j] != blocks[i]:
+                    break
+
+                position, position2 = record.position, records[j].position
+                pairs.add((position, position2) if position < position2 else (position2, position))
+
+    def get_clusters(self) -> List[GedcomDuplicateCluster]:
+        ''' get clusters of likely duplicates ordered by their first individual '''
+        records: Dict[int, GedcomDuplicateRecord] = {record.position: record for record in self.records}
+
+        # union of pairs scoring at least threshold, roots are the earliest position of a cluster and have no parent
+        parents: Dict[int, int] = {}
+        scores: Dict[int, float] = {}
+
+        def find(position: int) -> int:
+            root: int = position
+            while root in parents:
+                root = parents[root]
+            while position != root:
+                parents[position], position = root, parents[position]
+            return root
+
+        # scorers may skip pairs by a cheap upper bound of their score
+        bound: Optional[Callable[[GedcomDuplicateRecord, GedcomDuplicateRecord], float]] = getattr(self.scorer, 'bound', None)
+        for position, position2 in self.get_candidate_pairs():
+            record, record2 = records[position], records[position2]
+            # scores are sums of weights, equal to threshold up to rounding
+            if bound and round(bound(record, record2), 9) < self.threshold:
+                continue
+
+            score: float = round(self.scorer(record, record2), 9)
+            if score < self.threshold:
+                continue
+
+            root, root2 = find(position), find(position2)
+            if root != root2:
+                root, root2 = min(root, root2), max(root, root2)
+                parents[root2] = root
+                scores[root] = min(score, scores.get(root, score), scores.pop(root2, score))
+            else:
+                scores[root] = min(score, scores[root])
+
+        members: Dict[int, List['GedcomIndividual']] = {}
+        for position in sorted(parents):
+            root: int = find(position)
+            members.setdefault(root, [records[root].individual]).append(records[position].individual)
+
+        return [GedcomDuplicateCluster(members[root], scores[root]) for root in sorted(members)]
+
+    def __iter__(self) -> Iterator[GedcomDuplicateCluster]:
+        return iter(self.get_clusters())
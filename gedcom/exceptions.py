@@ -33,3 +33,7 @@ class GedcomDateInvalidFormat(GedcomException):
 
 class GedcomValidationException(GedcomException):
     pass
+
+
+class GedcomRequestException(GedcomException):
+    pass
@@ -1,29 +1,254 @@
-from typing import IO, Iterator
+from typing import Any, IO, Iterator, Iterable, List, Dict, Optional, Sequence, Set, Tuple, Union
+from array import array
+from collections import abc
+from itertools import accumulate
+from bisect import bisect_right
+from mmap import mmap, ACCESS_READ
+import os
+import weakref
 from .exceptions import GedcomLineParsingException, GedcomFileNotFound
 
 
+Arguments = Union[Tuple[str, ...], bytes]
+
+# tags following the ID on level-0 lines
+ID_TAGS = ('INDI', 'FAM')
+RAW_ID_TAGS = (b'INDI', b'FAM')
+
+
+class GedcomLineTable(abc.Sequence):
+    ''' columnar store of parsed GEDCOM lines, one row per line '''
+    __slots__ = 'source', 'levels', 'tag_ids', 'line_nos', 'offsets', 'lengths', 'arguments', 'validated_bits', 'misplaced_rows', 'tags', '_tag_index', '_raw_tag_index', '_data', '_source_file', '__weakref__'
+
+    def __init__(self, source: Optional[str] = None) -> None:
+        self.source: Optional[str] = source
+        self.levels: array = array('i')
+        self.tag_ids: array = array('I')
+        self.line_nos: array = array('q')
+        # byte range of each line in source file
+        self.offsets: array = array('q')
+        self.lengths: array = array('I')
+        # raw bytes are decoded on first access
+        self.arguments: List[Arguments] = []
+        self.validated_bits: bytearray = bytearray()
+        # level-0 rows of INDI/FAM tags not in last position, tokenizers move them
+        self.misplaced_rows: Set[int] = set()
+
+        # interned tags
+        self.tags: List[str] = []
+        self._tag_index: Dict[str, int] = {}
+        self._raw_tag_index: Dict[bytes, int] = {}
+
+        # line text is only kept without a source file to read it back from
+        self._data: Optional[List[str]] = None if source else []
+        self._source_file: Optional[IO] = None
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union['GedcomLine', 'GedcomLineRange']:
+        if isinstance(index, slice):
+            return GedcomLineRange(self, 0, len(self))[index]
+
+        row: int = index + len(self) if index < 0 else index
+        if not 0 <= row < len(self):
+            raise IndexError('line table index out of range')
+
+        return GedcomLine(self, row)
+
+    def __iter__(self) -> Iterator['GedcomLine']:
+        for row in range(len(self)):
+            yield GedcomLine(self, row)
+
+    def tag_id(self, tag: str) -> int:
+        ''' get interned id of tag '''
+        tag_id: Optional[int] = self._tag_index.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_index[tag] = len(self.tags)
+            self.tags.append(tag)
+
+        return tag_id
+
+    def raw_tag_id(self, raw_tag: bytes) -> int:
+        ''' get interned id of undecoded tag '''
+        tag_id: Optional[int] = self._raw_tag_index.get(raw_tag)
+        if tag_id is None:
+            tag_id = self._raw_tag_index[raw_tag] = self.tag_id(raw_tag.decode())
+
+        return tag_id
+
+    def append(self, level: int, tag_id: int, arguments: Arguments, line_no: int, offset: int, length: int, data: Optional[str] = None) -> int:
+        ''' add a parsed line, return its row '''
+        row: int = len(self.levels)
+        self.levels.append(level)
+        self.tag_ids.append(tag_id)
+        self.line_nos.append(line_no)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.arguments.append(arguments)
+        if not row & 7:
+            self.validated_bits.append(0)
+
+        if self._data is not None:
+            self._data.append(data)
+
+        return row
+
+    def get_tag(self, row: int) -> str:
+        return self.tags[self.tag_ids[row]]
+
+    def get_arguments(self, row: int) -> Tuple[str, ...]:
+        arguments: Arguments = self.arguments[row]
+        if isinstance(arguments, bytes):
+            arguments = self.arguments[row] = tuple(arguments.decode().split())
+
+        return arguments
+
+    def is_validated(self, row: int) -> bool:
+        return bool(self.validated_bits[row >> 3] & (1 << (row & 7)))
+
+    def set_validated(self, row: int, validated: bool) -> None:
+        if validated:
+            self.validated_bits[row >> 3] |= 1 << (row & 7)
+        else:
+            self.validated_bits[row >> 3] &= ~(1 << (row & 7)) & 0xff
+
+    def get_data(self, row: int) -> str:
+        ''' get line text, read back from source file if not kept '''
+        if self._data is not None:
+            return self._data[row]
+
+        if not self._source_file:
+            self._source_file = open(self.source, 'rb')
+            # closed with the table if not closed before
+            weakref.finalize(self, self._source_file.close)
+
+        self._source_file.seek(self.offsets[row])
+        raw_line: bytes = self._source_file.read(self.lengths[row])
+        return raw_line.decode().rstrip('\r\n')
+
+    def is_id_line(self, row: int) -> bool:
+        ''' whether tag of level-0 row is its last token, as of an ID line '''
+        if self._data is not None:
+            return self._data[row].split()[-1] == self.get_tag(row)
+
+        return row not in self.misplaced_rows
+
+    def close(self) -> None:
+        ''' close source file opened for line text '''
+        if self._source_file:
+            self._source_file.close()
+            self._source_file = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        ''' pickle columns without the open source file '''
+        return {name: getattr(self, name) for name in self.__slots__ if name not in ('_source_file', '__weakref__')}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+        self._source_file = None
+
+
+class GedcomLineChain(abc.Sequence):
+    ''' lines of several line tables or line ranges as one sequence, in table order '''
+    __slots__ = 'tables', '_stops'
+
+    def __init__(self, tables: List[Sequence['GedcomLine']]) -> None:
+        self.tables: List[Sequence['GedcomLine']] = tables
+        # accumulated line counts up to each table
+        self._stops: List[int] = list(accumulate(len(table) for table in tables))
+
+    def __len__(self) -> int:
+        return self._stops[-1] if self._stops else 0
+
+    def __getitem__(self, index: int) -> 'GedcomLine':
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('line chain index out of range')
+
+        i: int = bisect_right(self._stops, index)
+        return self.tables[i][index - (self._stops[i - 1] if i else 0)]
+
+    def __iter__(self) -> Iterator['GedcomLine']:
+        for table in self.tables:
+            yield from table
+
+
+class GedcomLineRange(abc.Sequence):
+    ''' contiguous rows of GedcomLineTable as a sequence of lines '''
+    __slots__ = 'table', 'start', 'stop'
+
+    def __init__(self, table: GedcomLineTable, start: int, stop: int) -> None:
+        self.table: GedcomLineTable = table
+        self.start: int = start
+        self.stop: int = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: Union[int, slice]) -> Union['GedcomLine', 'GedcomLineRange']:
+        if index.__class__ is int:
+            row: int = self.start + index if index >= 0 else self.stop + index
+            if self.start <= row < self.stop:
+                return GedcomLine(self.table, row)
+
+            raise IndexError('line range index out of range')
+
+        start, stop, step = index.indices(self.stop - self.start)
+        if step != 1:
+            raise ValueError('line range step not supported')
+
+        return GedcomLineRange(self.table, self.start + start, self.start + max(start, stop))
+
+    def __iter__(self) -> Iterator['GedcomLine']:
+        for row in range(self.start, self.stop):
+            yield GedcomLine(self.table, row)
+
+
 class GedcomLine:
-    ''' parsed GEDCOM file line '''
-    __slots__ = 'line_no', 'data', 'level', 'tag', 'arguments', 'validated'
+    ''' parsed GEDCOM file line, a view over one row of GedcomLineTable '''
+    __slots__ = 'table', 'row'
 
-    def __init__(self, line: str, line_no: int) -> None:
-        try:
-            level, *tokens = line.split()
-            self.level: int = int(level)
+    def __init__(self, table: GedcomLineTable, row: int) -> None:
+        self.table: GedcomLineTable = table
+        self.row: int = row
 
-            # handles special tag positions
-            indi_or_fam: bool = level == '0' and tokens[-1] in ('INDI', 'FAM')
-            tag, *arguments = [tokens[1], tokens[0]] if indi_or_fam else tokens
+    @property
+    def line_no(self) -> int:
+        return self.table.line_nos[self.row]
 
-            self.line_no: int = line_no
-            self.data: str = line
-            self.tag: str = tag
-            self.arguments: List[str] = arguments
-            self.validated: bool = False
+    @property
+    def level(self) -> int:
+        return self.table.levels[self.row]
 
-        except:
-            # error in tokens counts or integer cast
-            raise GedcomLineParsingException('line parsing failed')
+    @property
+    def tag(self) -> str:
+        table: GedcomLineTable = self.table
+        return table.tags[table.tag_ids[self.row]]
+
+    @property
+    def arguments(self) -> Tuple[str, ...]:
+        arguments: Arguments = self.table.arguments[self.row]
+        if arguments.__class__ is bytes:
+            return self.table.get_arguments(self.row)
+
+        return arguments
+
+    @property
+    def data(self) -> str:
+        return self.table.get_data(self.row)
+
+    @property
+    def validated(self) -> bool:
+        row: int = self.row
+        return bool(self.table.validated_bits[row >> 3] & (1 << (row & 7)))
+
+    @validated.setter
+    def validated(self, validated: bool) -> None:
+        self.table.set_validated(self.row, validated)
 
     @property
     def argument(self) -> str:
@@ -38,31 +263,229 @@ class GedcomLine:
         return "Y" if self.validated else "N"
 
 
-def get_lines_from_file(file: IO) -> Iterator[GedcomLine]:
-    ''' a generator yielding lines from file object '''
+def line_range(lines: List[GedcomLine]) -> Sequence[GedcomLine]:
+    ''' get contiguous lines of one table as GedcomLineRange, other lists unchanged '''
+    if not lines:
+        return lines
+
+    first: GedcomLine = lines[0]
+    table: GedcomLineTable = first.table
+    start: int = first.row
+    for index in range(1, len(lines)):
+        line: GedcomLine = lines[index]
+        if line.table is not table or line.row != start + index:
+            return lines
+
+    return GedcomLineRange(table, start, start + len(lines))
+
+
+def tokenize_line(line: str) -> Tuple[int, str, Tuple[str, ...]]:
+    ''' split line text into level, tag and arguments '''
+    try:
+        level, *tokens = line.split()
+
+        # handles special tag positions
+        indi_or_fam: bool = level == '0' and tokens[-1] in ID_TAGS
+        tag, *arguments = [tokens[1], tokens[0]] if indi_or_fam else tokens
+
+        return int(level), tag, tuple(arguments)
+
+    except:
+        # error in tokens counts or integer cast
+        raise GedcomLineParsingException('line parsing failed')
+
+
+def tokenize_bytes(raw: bytes) -> Tuple[int, bytes, Arguments]:
+    ''' split raw line into level, undecoded tag and arguments, argument bytes are left undecoded '''
+    fields: List[bytes] = raw.split(None, 2)
+
+    try:
+        level: int = _level_cache.get(fields[0])
+        if level is None:
+            level = int(fields[0])
+
+        if level == 0 and fields[0] == b'0':
+            # handles special tag positions
+            tokens: List[bytes] = raw.split()
+            if tokens[-1] in RAW_ID_TAGS:
+                return level, tokens[2], (tokens[1].decode(),)
+
+        return level, fields[1], fields[2] if len(fields) > 2 else ()
+
+    except (IndexError, ValueError):
+        # error in tokens counts or integer cast
+        raise GedcomLineParsingException('line parsing failed')
+
+
+# levels by raw bytes for tokenize_bytes
+_level_cache: Dict[bytes, int] = {f'{level}'.encode(): level for level in range(10)}
+
+
+def read_rows_from_file(file: IO, table: GedcomLineTable) -> Iterator[int]:
+    ''' a generator filling table from text file object, yielding rows '''
     with file:
         # loop through file line sequence
         line_no: int = 0
+        offset: int = 0
         for raw_line in file:
             # remove trailing new line
             line: str = raw_line.rstrip('\n')
             line_no += 1
-            yield GedcomLine(line, line_no)
+            level, tag, arguments = tokenize_line(line)
+            yield table.append(level, table.tag_id(tag), arguments, line_no, offset, len(raw_line), line)
+            offset += len(raw_line)
+
+
+def read_rows_from_binary_file(file: IO, table: GedcomLineTable) -> Iterator[int]:
+    ''' a generator filling table from binary file object, yielding rows '''
+    with file:
+        # loop through file line sequence
+        line_no: int = 0
+        offset: int = 0
+        for raw_line in file:
+            # remove trailing new line
+            line: str = raw_line.decode().rstrip('\r\n')
+            line_no += 1
+            level, tag, arguments = tokenize_line(line)
+            row: int = table.append(level, table.tag_id(tag), arguments, line_no, offset, len(raw_line))
+            if not level and tag in ID_TAGS and line.rsplit(None, 1)[-1] != tag:
+                table.misplaced_rows.add(row)
+
+            yield row
+            offset += len(raw_line)
 
 
-def get_lines_from_path(path: str) -> Iterator[GedcomLine]:
-    ''' a generator yielding lines of file from path '''
+def read_rows_from_mapped_file(file: IO, table: GedcomLineTable, start: int = 0, stop: Optional[int] = None, line_no: int = 0) -> Iterator[int]:
+    ''' a generator filling table from memory-mapped binary file object, yielding rows
+        start, stop: byte range of lines to read, line_no: count of lines before start '''
+    with file:
+        # empty files cannot be mapped
+        if not os.fstat(file.fileno()).st_size:
+            return
+
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+            yield from read_rows_from_buffer(mapped, table, start, len(mapped) if stop is None else stop, line_no)
+
+
+def read_rows_from_buffer(buffer: IO, table: GedcomLineTable, start: int, stop: int, line_no: int = 0) -> Iterator[int]:
+    ''' a generator filling table from lines within byte range of a seekable bytes buffer (mmap or BytesIO), yielding rows
+        line_no: count of lines before start '''
+    buffer.seek(start)
+
+    # loop through raw line sequence
+    offset: int = start
+    while offset < stop:
+        raw_line: bytes = buffer.readline()
+        if not raw_line:
+            break
+
+        # remove trailing new line
+        line: bytes = raw_line.rstrip(b'\r\n')
+        line_no += 1
+        level, raw_tag, arguments = tokenize_bytes(line)
+        row: int = table.append(level, table.raw_tag_id(raw_tag), arguments, line_no, offset, len(raw_line))
+        # ID lines in tag last position are tokenized into argument tuples
+        if not level and raw_tag in RAW_ID_TAGS and arguments.__class__ is bytes:
+            table.misplaced_rows.add(row)
+
+        yield row
+        offset += len(raw_line)
+
+
+def get_record_starts(data: bytes) -> List[int]:
+    ''' get byte offset of each level-0 record of file content '''
+    starts: List[int] = [0] if data else []
+    position: int = data.find(b'\n0 ')
+    while position >= 0:
+        starts.append(position + 1)
+        position = data.find(b'\n0 ', position + 1)
+
+    return starts
+
+
+def get_lines_from_file(file: IO) -> Iterator[GedcomLine]:
+    ''' a generator yielding lines from file object '''
+    table: GedcomLineTable = GedcomLineTable()
+    for row in read_rows_from_file(file, table):
+        yield GedcomLine(table, row)
+
+
+def get_records_from_lines(lines: Iterable[GedcomLine]) -> Iterator[Sequence[GedcomLine]]:
+    ''' a generator grouping lines into level-0 records (INDI/FAM/NOTE/HEAD/TRLR) '''
+    if isinstance(lines, GedcomLineTable):
+        # group rows of table by level column
+        start: int = 0
+        for row, level in enumerate(lines.levels):
+            if level == 0 and row > start:
+                yield GedcomLineRange(lines, start, row)
+                start = row
+
+        if start < len(lines):
+            yield GedcomLineRange(lines, start, len(lines))
+
+        return
+
+    record: List[GedcomLine] = []
+    for line in lines:
+        # a level-0 line starts a new record
+        if line.level == 0 and record:
+            yield line_range(record)
+            record = []
+
+        record.append(line)
+
+    # last record of input
+    if record:
+        yield line_range(record)
+
+
+def open_line_rows(path: str, table: GedcomLineTable, mapped: bool = False) -> Iterator[int]:
+    ''' a generator filling table from file at path, yielding rows '''
     # read file from path
     try:
-        file: IO = open(path)
+        file: IO = open(path, 'rb')
 
     # handle file not found
     except FileNotFoundError:
         raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
 
+    return read_rows_from_mapped_file(file, table) if mapped else read_rows_from_binary_file(file, table)
+
+
+def get_lines_from_path(path: str, mapped: bool = False) -> Iterator[GedcomLine]:
+    ''' a generator yielding lines of file from path
+        mapped: tokenize raw bytes of memory-mapped file instead of decoded text '''
+    table: GedcomLineTable = GedcomLineTable(path)
+    rows: Iterator[int] = open_line_rows(path, table, mapped)
+
     # yield lines form a generator function
-    else:
-        return get_lines_from_file(file)
+    return (GedcomLine(table, row) for row in rows)
+
+
+def read_line_table(path: str, mapped: bool = False) -> GedcomLineTable:
+    ''' tokenize all lines of file from path into a line table '''
+    table: GedcomLineTable = GedcomLineTable(path)
+    for row in open_line_rows(path, table, mapped):
+        pass
+
+    return table
+
+
+def copy_lines(lines: Sequence[GedcomLine], table: Optional[GedcomLineTable] = None) -> GedcomLineRange:
+    ''' copy lines into a line table of their own, keeping their text, so the table they were read into can be released
+        table: append to this table instead of a new one '''
+    if table is None:
+        table = GedcomLineTable()
+
+    start: int = len(table)
+    for line in lines:
+        source: GedcomLineTable = line.table
+        row: int = table.append(
+            line.level, table.tag_id(line.tag), line.arguments, line.line_no,
+            source.offsets[line.row], source.lengths[line.row], line.data)
+        table.set_validated(row, line.validated)
+
+    return GedcomLineRange(table, start, len(table))
 
 
 def prompt_input_file(prompt_message: str, default_file_path: str = '') -> str:
@@ -0,0 +1,345 @@
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+from collections import deque
+from functools import lru_cache
+from hashlib import blake2b
+from io import BytesIO
+import os
+import sys
+from .tags import GedcomIndividual, GedcomFamily, GedcomNote, GedcomHeader, GedcomTrailer
+from .tags.base import GedcomSubjectData
+from .file import GedcomLineTable, GedcomLineRange, GedcomLineChain, read_rows_from_buffer, get_records_from_lines, get_record_starts
+from .repository import GedcomRepository, Validator
+from .diagnostics import GedcomDiagnostic
+from .validation import ValidationRule, ValidationResult, LINKED_SCOPE, TREE_SCOPE
+from .instrumentation import GedcomInstrumentation, measure
+from .exceptions import GedcomFileNotFound
+
+
+# content hash, byte range and count of lines before a level-0 record of a file
+RecordSpan = Tuple[bytes, int, int, int]
+
+
+def get_record_spans(data: bytes) -> List[RecordSpan]:
+    ''' split file content into level-0 records and hash each of them '''
+    starts: List[int] = get_record_starts(data)
+    spans: List[RecordSpan] = []
+    line_no: int = 0
+    view: memoryview = memoryview(data)
+    for start, stop in zip(starts, starts[1:] + [len(data)]):
+        spans.append((blake2b(view[start:stop], digest_size=16).digest(), start, stop, line_no))
+        line_no += data.count(b'\n', start, stop)
+
+    return spans
+
+
+@lru_cache(maxsize=None)
+def get_rule_fingerprint(rule_class: Type[ValidationRule]) -> str:
+    ''' hash of the source of the module of rule, so kept errors are dropped when it changes '''
+    digest = blake2b(digest_size=8)
+    with open(sys.modules[rule_class.__module__].__file__, 'rb') as file:
+        digest.update(file.read())
+
+    return f'{rule_class.__qualname__}-{digest.hexdigest()}'
+
+
+class GedcomParsedRecord:
+    ''' lines of a level-0 record of the file and data parsed from them, kept while its content is unchanged '''
+    __slots__ = 'digest', 'start', 'line_no', 'lines', 'individuals', 'families', 'notes', 'header', 'trailer', 'diagnostics'
+
+    def __init__(self, digest: bytes, start: int, line_no: int, lines: GedcomLineRange) -> None:
+        self.digest: bytes = digest
+        # byte offset and count of lines before the record
+        self.start: int = start
+        self.line_no: int = line_no
+        self.lines: GedcomLineRange = lines
+        self.individuals: List[GedcomIndividual] = []
+        self.families: List[GedcomFamily] = []
+        self.notes: List[GedcomNote] = []
+        self.header: Optional[GedcomHeader] = None
+        self.trailer: Optional[GedcomTrailer] = None
+        self.diagnostics: List[GedcomDiagnostic] = []
+
+    @property
+    def subjects(self) -> List[GedcomSubjectData]:
+        return [*self.individuals, *self.families]
+
+    def move(self, start: int, line_no: int) -> None:
+        ''' shift line numbers and byte offsets of lines to where the record is found in the edited file '''
+        line_shift: int = line_no - self.line_no
+        offset_shift: int = start - self.start
+        table: GedcomLineTable = self.lines.table
+        for row in range(self.lines.start, self.lines.stop):
+            table.line_nos[row] += line_shift
+            table.offsets[row] += offset_shift
+
+        self.diagnostics = [(no + line_shift, tag, reason) for no, tag, reason in self.diagnostics]
+        self.start = start
+        self.line_no = line_no
+
+
+class GedcomUpdate:
+    ''' records parsed, moved to other lines and removed by an update of the repository, in file order
+        records moved keep their lines, records only shifted to other bytes are not listed '''
+    __slots__ = 'parsed', 'moved', 'removed'
+
+    def __init__(self) -> None:
+        self.parsed: List[GedcomParsedRecord] = []
+        self.moved: List[GedcomParsedRecord] = []
+        self.removed: List[GedcomParsedRecord] = []
+
+
+class GedcomRuleState:
+    ''' subjects a rule has checked and errors its hooks reported on them, kept between runs '''
+    __slots__ = 'fingerprint', 'checked', 'errors'
+
+    def __init__(self, rule_class: Type[ValidationRule]) -> None:
+        self.fingerprint: str = get_rule_fingerprint(rule_class)
+        self.checked: Set[GedcomSubjectData] = set()
+        # errors of each hook, only subjects with errors are kept
+        self.errors: List[Dict[GedcomSubjectData, List[str]]] = [{} for hook in rule_class.hooks]
+
+    def discard(self, subjects: Iterable[GedcomSubjectData]) -> None:
+        ''' forget results of subjects, they are checked again on the next run '''
+        for subject in subjects:
+            self.checked.discard(subject)
+            for errors in self.errors:
+                errors.pop(subject, None)
+
+
+class GedcomIncrementalRepository(GedcomRepository):
+    ''' repository of a file kept across edits of the file, update() re-parses only level-0 records whose content changed
+        rules of SUBJECT_SCOPE or LINKED_SCOPE are re-run only on subjects within the scope of changed records,
+        other validators are run on every subject '''
+    __slots__ = 'path', 'records', 'rule_states', 'cache'
+
+    def __init__(
+        self,
+        path: str,
+        instrumentation: Optional[GedcomInstrumentation] = None,
+        cache: Optional['GedcomRepositoryCache'] = None
+    ) -> None:
+        ''' parse file at path, cache: where store() keeps the repository for read_repository_incremental() '''
+        self.path: str = path
+        self.instrumentation: Optional[GedcomInstrumentation] = instrumentation
+        self.cache: Optional['GedcomRepositoryCache'] = cache
+        self.lazy: bool = False
+        self.compact: bool = False
+        self.records: List[GedcomParsedRecord] = []
+        self.rule_states: Dict[Type[ValidationRule], GedcomRuleState] = {}
+        self.update()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        ''' pickle with kept rule states, without the cache '''
+        state: Dict[str, Any] = super().__getstate__()
+        state['cache'] = None
+        return state
+
+    def update(self) -> GedcomUpdate:
+        ''' read the file again, parse records not found in the previous read, move kept records to their lines '''
+        with self.measure('parse', 'read'):
+            try:
+                with open(self.path, 'rb') as file:
+                    data: bytes = file.read()
+            except FileNotFoundError:
+                raise GedcomFileNotFound(f'Cannot open file "{self.path}"!', self.path)
+
+        with self.measure('parse', 'hash'):
+            spans: List[RecordSpan] = get_record_spans(data)
+
+        # previous records by content, records of the same content are kept in file order
+        previous: Dict[bytes, Deque[GedcomParsedRecord]] = {}
+        for record in self.records:
+            previous.setdefault(record.digest, deque()).append(record)
+
+        update: GedcomUpdate = GedcomUpdate()
+        records: List[GedcomParsedRecord] = []
+        table: GedcomLineTable = GedcomLineTable(self.path)
+        buffer: BytesIO = BytesIO(data)
+        with self.measure('parse', 'subjects'):
+            # subjects of new records are collected by the containers of the repository
+            self.reset_containers()
+            for digest, start, stop, line_no in spans:
+                matches: Optional[Deque[GedcomParsedRecord]] = previous.get(digest)
+                if matches:
+                    record: GedcomParsedRecord = matches.popleft()
+                    if record.line_no != line_no:
+                        update.moved.append(record)
+                    if record.start != start or record.line_no != line_no:
+                        record.move(start, line_no)
+                else:
+                    row: int = len(table)
+                    for _ in read_rows_from_buffer(buffer, table, start, stop, line_no):
+                        pass
+
+                    record = GedcomParsedRecord(digest, start, line_no, GedcomLineRange(table, row, len(table)))
+                    self.parse_new_record(record)
+                    update.parsed.append(record)
+
+                records.append(record)
+
+        update.removed = [record for matches in previous.values() for record in matches]
+        self.records = records
+
+        # line text of kept records is read back from the edited file
+        for table in {record.lines.table for record in records}:
+            table.source = self.path
+            table.close()
+
+        with self.measure('parse', 'merge'):
+            self.merge_records()
+
+        with self.measure('parse', 'sort'):
+            self.sort_subjects()
+
+        with self.measure('parse', 'relations'):
+            self.index_relations()
+
+        self.discard_rule_results(update)
+        return update
+
+    def parse_new_record(self, record: GedcomParsedRecord) -> None:
+        ''' parse lines of record, keeping data added to the repository by them in the record '''
+        individual_count: int = len(self._individuals)
+        family_count: int = len(self._families)
+        note_count: int = len(self._notes)
+        diagnostic_count: int = len(self.diagnostics)
+        self._header = self._trailer = None
+
+        for record_lines in get_records_from_lines(record.lines):
+            self.parse_record(record_lines)
+
+        record.individuals = self._individuals[individual_count:]
+        record.families = self._families[family_count:]
+        record.notes = self._notes[note_count:]
+        record.header, record.trailer = self._header, self._trailer
+        record.diagnostics = self.diagnostics.items[diagnostic_count:]
+
+    def merge_records(self) -> None:
+        ''' collect lines and data of records in file order, as a full parse of the file does '''
+        self.reset_containers()
+        self.lines = GedcomLineChain([record.lines for record in self.records])
+        self._header = self._trailer = None
+
+        for record in self.records:
+            self.diagnostics.extend(record.diagnostics)
+            for individual in record.individuals:
+                self.add_individual(individual)
+
+            for family in record.families:
+                self.add_family(family)
+
+            self._notes.extend(record.notes)
+            self._header = record.header or self._header
+            self._trailer = record.trailer or self._trailer
+
+    def discard_rule_results(self, update: GedcomUpdate) -> None:
+        ''' forget results of subjects within the scope of records parsed, moved or removed '''
+        if not self.rule_states:
+            return
+
+        # line numbers in errors of moved subjects change
+        stale: Set[GedcomSubjectData] = {subject for record in update.moved + update.removed for subject in record.subjects}
+        linked: Set[GedcomSubjectData] = set(stale)
+
+        # subjects referring to an ID of a changed subject, or to a duplicate of it
+        changed: List[GedcomParsedRecord] = update.parsed + update.moved + update.removed
+        individual_ids: Set[str] = {individual.id for record in changed for individual in record.individuals}
+        family_ids: Set[str] = {family.id for record in changed for family in record.families}
+        if family_ids:
+            linked.update(
+                individual for individual in self._individuals if not family_ids.isdisjoint(individual.member_of_id_list))
+        if individual_ids:
+            linked.update(
+                family for family in self._families
+                if family.husband_id in individual_ids or family.wife_id in individual_ids
+                or not individual_ids.isdisjoint(family.children_id_list))
+
+        for rule_class, state in self.rule_states.items():
+            state.discard(linked if rule_class.scope == LINKED_SCOPE else stale)
+
+    def run_validations(self, validators: Sequence[Validator], processes: Optional[int] = None) -> 'GedcomRepository':
+        ''' run validators like GedcomRepository.run_validations(), rules of SUBJECT_SCOPE or LINKED_SCOPE
+            only check subjects not checked since they or a subject in their scope were parsed, moved or removed '''
+        validators_run_again: List[Validator] = []
+        for validator in validators:
+            rule_class: Optional[Type[ValidationRule]] = getattr(validator, 'rule', None)
+            if processes or rule_class is None or rule_class.scope == TREE_SCOPE:
+                validators_run_again.append(validator)
+                continue
+
+            with self.measure('validator', validator.__name__) as stats:
+                result: ValidationResult = self.run_rule(rule_class)
+
+            stats.items += len(result.errors)
+            if result.exception is not None:
+                stats.exceptions.append(result.exception)
+
+            self._validation_results[validator] = result
+
+        if validators_run_again:
+            super().run_validations(validators_run_again, processes)
+
+        # return self for piping
+        return self
+
+    def run_rule(self, rule_class: Type[ValidationRule]) -> ValidationResult:
+        ''' run hooks of rule on subjects not checked since the last run, errors of the others are kept
+            columns hooks are not used, errors are kept per subject '''
+        state: Optional[GedcomRuleState] = self.rule_states.get(rule_class)
+        if state is None or state.fingerprint != get_rule_fingerprint(rule_class):
+            state = self.rule_states[rule_class] = GedcomRuleState(rule_class)
+
+        rule: ValidationRule = rule_class(self)
+        unchecked: Dict[str, List[GedcomSubjectData]] = {
+            'individual': [individual for individual in self._individuals if individual not in state.checked],
+            'family': [family for family in self._families if family not in state.checked]}
+
+        errors: List[str] = []
+        for hook, hook_errors in zip(rule_class.hooks, state.errors):
+            method = hook.__get__(rule)
+            for subject in unchecked[hook.visits]:
+                try:
+                    subject_errors: Optional[Iterable[str]] = method(subject)
+                    subject_errors = list(subject_errors) if subject_errors else None
+                except Exception as e:
+                    # a failed hook fails the rule, as in a full run, every subject is checked again next run
+                    del self.rule_states[rule_class]
+                    return ValidationResult([], e)
+
+                if subject_errors:
+                    hook_errors[subject] = subject_errors
+
+            # errors in order of subjects, positions are numbered by the relation index
+            for subject in sorted(hook_errors, key=lambda subject: subject._index):
+                errors.extend(hook_errors[subject])
+
+        state.checked.update(unchecked['individual'])
+        state.checked.update(unchecked['family'])
+        return ValidationResult(errors)
+
+    def store(self) -> None:
+        ''' keep repository and results of its rules in cache, for read_repository_incremental() of the edited file '''
+        self.cache.store_incremental(self.path, self)
+
+
+def read_repository_incremental(
+    path: str,
+    cache: Optional['GedcomRepositoryCache'] = None,
+    instrumentation: Optional[GedcomInstrumentation] = None
+) -> GedcomIncrementalRepository:
+    ''' get repository of file from cache as last stored, updated to the file as it is now
+        cache: GedcomRepositoryCache the repository is loaded from and stored to, the default cache if not given '''
+    from .cache import GedcomRepositoryCache
+    cache = cache or GedcomRepositoryCache()
+
+    with measure(instrumentation, 'parse', 'load'):
+        repo: Optional[GedcomIncrementalRepository] = cache.load_incremental(path)
+
+    if repo is None:
+        return GedcomIncrementalRepository(path, instrumentation, cache)
+
+    repo.path = path
+    repo.instrumentation = instrumentation
+    repo.cache = cache
+    repo.update()
+    return repo
@@ -0,0 +1,132 @@
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager, nullcontext
+from time import perf_counter, process_time
+import cProfile
+import tracemalloc
+
+
+class GedcomStageStats:
+    ''' measurements of one parse phase, validator or printer, summed over its calls '''
+    __slots__ = 'kind', 'name', 'calls', 'wall_time', 'cpu_time', 'allocated', 'items', 'exceptions'
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind: str = kind
+        self.name: str = name
+        self.calls: int = 0
+        self.wall_time: float = 0.0
+        self.cpu_time: float = 0.0
+        # peak bytes traced above the start of a call, None without allocation tracing
+        self.allocated: Optional[int] = None
+        # errors of a validator, rows of a printer
+        self.items: int = 0
+        self.exceptions: List[Exception] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'name': self.name,
+            'calls': self.calls,
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'allocated': self.allocated,
+            'items': self.items,
+            'exceptions': [f'{type(e).__name__}: {e}' for e in self.exceptions],
+        }
+
+
+class GedcomInstrumentation:
+    ''' record time, allocations, error counts and exceptions of parse phases, validators and printers
+        trace_allocations: measure peak allocations of each stage with tracemalloc, slows the run down
+        profile_stage: name of the stage to run under cProfile, stats are dumped to profile_path '''
+
+    def __init__(
+        self,
+        trace_allocations: bool = False,
+        profile_stage: Optional[str] = None,
+        profile_path: Optional[str] = None
+    ) -> None:
+        self.trace_allocations: bool = trace_allocations
+        self.profile_stage: Optional[str] = profile_stage
+        self.profile_path: str = profile_path or f'{profile_stage}.prof'
+        self.profiler: Optional[cProfile.Profile] = None
+        self.stages: Dict[Tuple[str, str], GedcomStageStats] = {}
+
+    def get_stats(self, kind: str, name: str) -> GedcomStageStats:
+        ''' get stats of stage, stages are reported in first call order '''
+        stats: Optional[GedcomStageStats] = self.stages.get((kind, name))
+        if stats is None:
+            stats = self.stages[kind, name] = GedcomStageStats(kind, name)
+
+        return stats
+
+    @contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[GedcomStageStats]:
+        ''' measure a call of stage, exceptions are recorded and raised again '''
+        stats: GedcomStageStats = self.get_stats(kind, name)
+
+        tracing: bool = self.trace_allocations
+        if tracing:
+            started_tracing: bool = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            traced: int = tracemalloc.get_traced_memory()[0]
+
+        profiling: bool = name == self.profile_stage
+        if profiling:
+            self.profiler = self.profiler or cProfile.Profile()
+            self.profiler.enable()
+
+        wall_start: float = perf_counter()
+        cpu_start: float = process_time()
+        try:
+            yield stats
+        except Exception as e:
+            stats.exceptions.append(e)
+            raise
+        finally:
+            stats.wall_time += perf_counter() - wall_start
+            stats.cpu_time += process_time() - cpu_start
+            stats.calls += 1
+
+            if profiling:
+                self.profiler.disable()
+                # stats of all calls so far
+                self.profiler.dump_stats(self.profile_path)
+
+            if tracing:
+                allocated: int = tracemalloc.get_traced_memory()[1] - traced
+                stats.allocated = max(stats.allocated or 0, allocated)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def report(self) -> List[Dict[str, Any]]:
+        ''' get stats of every stage as plain data '''
+        return [stats.as_dict() for stats in self.stages.values()]
+
+    def print_report(self) -> None:
+        ''' print stats of every stage with PrettyTable, slowest first '''
+        from prettytable import PrettyTable
+        table: PrettyTable = PrettyTable()
+        table.field_names = ['Kind', 'Name', 'Calls', 'Wall (s)', 'CPU (s)', 'Allocated (KiB)', 'Items', 'Exceptions']
+        for stats in sorted(self.stages.values(), key=lambda stats: -stats.wall_time):
+            table.add_row([
+                stats.kind,
+                stats.name,
+                stats.calls,
+                f'{stats.wall_time:.4f}',
+                f'{stats.cpu_time:.4f}',
+                'NA' if stats.allocated is None else f'{stats.allocated / 1024:.1f}',
+                stats.items,
+                '; '.join(f'{type(e).__name__}: {e}' for e in stats.exceptions) or 'NA',
+            ])
+
+        print(table)
+
+
+def measure(instrumentation: Optional[GedcomInstrumentation], kind: str, name: str) -> ContextManager[GedcomStageStats]:
+    ''' measure a stage with instrumentation if given, stats are discarded without it '''
+    if instrumentation is None:
+        return nullcontext(GedcomStageStats(kind, name))
+
+    return instrumentation.measure(kind, name)
@@ -0,0 +1,259 @@
+from typing import Any, Iterator, Optional, List, Dict, Sequence, Tuple, Union
+from multiprocessing import Pool, get_context, get_all_start_methods
+from array import array
+from datetime import date as Date
+from itertools import accumulate
+from mmap import mmap, ACCESS_READ
+import os
+import pickle
+from .tags import GedcomNote, GedcomHeader, GedcomTrailer, GedcomCompactIndividual, GedcomCompactFamily
+from .tags.compact import GedcomCompactSubject
+from .file import GedcomLine, GedcomLineTable, GedcomLineChain, read_rows_from_mapped_file, get_records_from_lines
+from .repository import GedcomRepository, Validator, read_repository_file
+from .diagnostics import GedcomDiagnostic
+from .validation import ValidationEngine, ValidationResult, RulePart, as_validator, run_rule_part, join_rule_parts
+from .exceptions import GedcomFileNotFound
+
+
+# compact subjects of one type as columns, in file order: IDs, ID line numbers, a column of each kept field,
+# and errors of kept properties by subject index
+SubjectColumns = Tuple[List[str], array, List[Sequence[Any]], Dict[int, Dict[str, Tuple[type, Tuple[Any, ...]]]]]
+
+# parsed records of one shard, individuals and families as columns, lines rejected while parsing them,
+# and DATE lines not validated
+Shard = Tuple[SubjectColumns, SubjectColumns, List[GedcomNote], Optional[GedcomHeader], Optional[GedcomTrailer],
+              List[GedcomDiagnostic], GedcomLineTable]
+
+# bytes read at a time when counting lines
+COUNT_CHUNK_SIZE: int = 1 << 22
+
+# validator index, part and part count of a validation task
+ValidationTask = Tuple[int, int, int]
+
+# repository and validators of validation workers, inherited on fork or loaded from a snapshot
+_validation_state: Optional[Tuple[GedcomRepository, List[Validator]]] = None
+
+
+def get_shard_offsets(path: str, shard_count: int) -> List[Tuple[int, int]]:
+    ''' split file into byte ranges, each starting at a level-0 line '''
+    size: int = os.path.getsize(path)
+    if not size:
+        return []
+
+    starts: List[int] = [0]
+    with open(path, 'rb') as file, mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+        for shard in range(1, shard_count):
+            # find first level-0 line after the even split point
+            target: int = max(size * shard // shard_count, starts[-1] + 1)
+            position: int = mapped.find(b'\n0 ', target - 1)
+            if position < 0:
+                break
+
+            if position + 1 > starts[-1]:
+                starts.append(position + 1)
+
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def count_lines(path: str, start: int, stop: int) -> int:
+    ''' count line breaks within byte range of file '''
+    count: int = 0
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining: int = stop - start
+        while remaining > 0:
+            chunk: bytes = file.read(min(COUNT_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+
+            count += chunk.count(b'\n')
+            remaining -= len(chunk)
+
+    return count
+
+
+def get_subject_columns(subjects: List[GedcomCompactSubject]) -> SubjectColumns:
+    ''' pack values kept by compact subjects into a column per field,
+        dates as day numbers and line numbers as integers, both 0 for None '''
+    if not subjects:
+        return [], array('q'), [], {}
+
+    subject_type: type = type(subjects[0])
+    columns: List[Sequence[Any]] = []
+    for index, field in enumerate(subject_type.fields):
+        values: List[Any] = [subject._values[index] for subject in subjects]
+        if field in subject_type.date_fields:
+            columns.append(array('i', [value.toordinal() if value else 0 for value in values]))
+        elif field.endswith('_line_no'):
+            columns.append(array('q', [value or 0 for value in values]))
+        else:
+            columns.append(values)
+
+    return ([subject.id for subject in subjects], array('q', [subject.line_no for subject in subjects]), columns,
+            {index: subject._errors for index, subject in enumerate(subjects) if subject._errors})
+
+
+def get_column_subjects(subject_type: type, columns: SubjectColumns, repo: GedcomRepository) -> List[GedcomCompactSubject]:
+    ''' unpack subjects of columns from get_subject_columns, in file order '''
+    ids, line_nos, field_columns, errors = columns
+    dates: Dict[int, Date] = {}
+    values: List[Sequence[Any]] = []
+    for field, column in zip(subject_type.fields, field_columns):
+        if field in subject_type.date_fields:
+            # repeated dates share one object, as parse_date_arguments does
+            column = [(dates.get(day) or dates.setdefault(day, Date.fromordinal(day))) if day else None for day in column]
+        elif field.endswith('_line_no'):
+            column = [line_no or None for line_no in column]
+
+        values.append(column)
+
+    return [subject_type.from_values(repo, id, line_no, subject_values, errors.get(index))
+            for index, (id, line_no, subject_values) in enumerate(zip(ids, line_nos, zip(*values)))]
+
+
+def parse_shard(path: str, start: int, stop: int, line_no: int) -> Shard:
+    ''' tokenize and parse records within byte range of file into compact subjects, in a worker process,
+        subjects are sent back as columns to be rebuilt without parsing '''
+    table: GedcomLineTable = GedcomLineTable(path)
+    repo: GedcomRepository = GedcomRepository([], keep_lines=False, compact=True)
+    rows: Iterator[int] = read_rows_from_mapped_file(open(path, 'rb'), table, start, stop, line_no)
+    for record_lines in get_records_from_lines(GedcomLine(table, row) for row in rows):
+        repo.parse_record(record_lines)
+        repo.keep_date_lines(record_lines)
+
+    header: Optional[GedcomHeader] = getattr(repo, '_header', None)
+    trailer: Optional[GedcomTrailer] = getattr(repo, '_trailer', None)
+
+    # send records back without the worker repository
+    for data in [*repo._notes, header, trailer]:
+        if data:
+            data.attach(None)
+
+    return (get_subject_columns(repo._individuals), get_subject_columns(repo._families),
+            repo._notes, header, trailer, repo.diagnostics.items, repo._date_lines)
+
+
+def merge_shards(shards: List[Shard]) -> GedcomRepository:
+    ''' build one compact repository from shards in file order '''
+    repo: GedcomRepository = GedcomRepository([], keep_lines=False, compact=True)
+    repo._date_lines = GedcomLineChain([shard[-1] for shard in shards])
+
+    for individual_columns, family_columns, notes, header, trailer, diagnostics, date_lines in shards:
+        repo.diagnostics.extend(diagnostics)
+
+        # keep first occurrence and duplicates in file order
+        for individual in get_column_subjects(GedcomCompactIndividual, individual_columns, repo):
+            repo.add_individual(individual)
+
+        for family in get_column_subjects(GedcomCompactFamily, family_columns, repo):
+            repo.add_family(family)
+
+        for note in notes:
+            note.attach(repo)
+            repo._notes.append(note)
+
+        if header:
+            header.attach(repo)
+            repo._header = header
+
+        if trailer:
+            trailer.attach(repo)
+            repo._trailer = trailer
+
+    repo.sort_subjects()
+    repo.index_relations()
+    return repo
+
+
+def read_repository_parallel(path: str, processes: Optional[int] = None, shard_count: Optional[int] = None) -> GedcomRepository:
+    ''' creat GEDCOM repository from input file, parsing shards of records in a process pool,
+        subjects are compact as with read_repository_file(path, compact=True)
+        processes: worker count, defaults to CPU count
+        shard_count: byte ranges to split the file into, defaults to 4 per worker '''
+    if not os.path.isfile(path):
+        raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        # a single worker would only add the cost of sending subjects back
+        return read_repository_file(path, compact=True)
+
+    offsets: List[Tuple[int, int]] = get_shard_offsets(path, shard_count or processes * 4)
+
+    with Pool(processes) as pool:
+        # line numbers continue from lines of previous shards
+        counts: List[int] = pool.starmap(
+            count_lines, [(path, start, stop) for start, stop in offsets])
+        line_nos: List[int] = list(accumulate([0] + counts[:-1]))
+
+        shards: List[Shard] = pool.starmap(
+            parse_shard, [(path, start, stop, line_no) for (start, stop), line_no in zip(offsets, line_nos)])
+
+    return merge_shards(shards)
+
+
+def init_validation_worker(snapshot: Optional[bytes]) -> None:
+    ''' load repository and validators in a worker process without fork '''
+    global _validation_state
+    if snapshot is not None:
+        repo, validators = pickle.loads(snapshot)
+        # rules travel as classes with validator names, validator functions are rebuilt from them
+        _validation_state = repo, [as_validator(*v) if isinstance(v, tuple) else v for v in validators]
+
+
+def run_validation_task(index: int, part: int, part_count: int) -> Union[ValidationResult, RulePart]:
+    ''' run a validator, or a part of a partitionable rule, in a worker process '''
+    repo, validators = _validation_state
+    validator: Validator = validators[index]
+    if part_count > 1:
+        return run_rule_part(repo, validator.rule, part, part_count)
+
+    return ValidationEngine([validator]).run(repo)[validator]
+
+
+def validate_parallel(
+    repo: GedcomRepository,
+    validators: Sequence[Validator],
+    processes: Optional[int] = None,
+    start_method: Optional[str] = None
+) -> Dict[Validator, ValidationResult]:
+    ''' run validators in a process pool, same results as ValidationEngine
+        partitionable rules are split into a part per worker, other validators run whole
+        start_method: multiprocessing start method, fork shares the repository without serializing it '''
+    global _validation_state
+    processes = processes or os.cpu_count() or 1
+    start_method = start_method or ('fork' if 'fork' in get_all_start_methods() else None)
+    context = get_context(start_method)
+
+    tasks: List[ValidationTask] = []
+    for index, validator in enumerate(validators):
+        rule = getattr(validator, 'rule', None)
+        part_count: int = processes if rule and rule.partitionable and processes > 1 else 1
+        tasks.extend((index, part, part_count) for part in range(part_count))
+
+    snapshot: Optional[bytes] = None
+    if context.get_start_method() == 'fork':
+        _validation_state = repo, list(validators)
+    else:
+        snapshot = pickle.dumps((repo, [(v.rule, v.__name__) if hasattr(v, 'rule') else v for v in validators]))
+
+    try:
+        with context.Pool(processes, init_validation_worker, (snapshot,)) as pool:
+            # results come back in task order
+            outputs: List[Union[ValidationResult, RulePart]] = pool.starmap(run_validation_task, tasks, chunksize=1)
+    finally:
+        _validation_state = None
+
+    parts: Dict[int, List[RulePart]] = {}
+    results: Dict[Validator, ValidationResult] = {}
+    for (index, part, part_count), output in zip(tasks, outputs):
+        if part_count == 1:
+            results[validators[index]] = output
+            continue
+
+        parts.setdefault(index, []).append(output)
+        if part == part_count - 1:
+            results[validators[index]] = join_rule_parts(parts.pop(index))
+
+    # keep validator order of the engine
+    return {validator: results[validator] for validator in validators}
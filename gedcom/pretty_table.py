@@ -38,8 +38,8 @@ def individuals_display(individuals: Optional[List[GedcomIndividual]] = []) -> s
     return id_list_display(id_list)
 
 
-def pretty_print_individuals(title: str, individuals: List[GedcomIndividual]) -> None:
-    ''' print individuals' data with PrettyTable '''
+def get_individual_table(individuals: List[GedcomIndividual]) -> PrettyTable:
+    ''' get PrettyTable of individuals' data '''
     individual_fields: List[str] = [
         'ID',
         'Name',
@@ -79,12 +79,17 @@ def pretty_print_individuals(title: str, individuals: List[GedcomIndividual]) ->
             id_list_display(spouse_id_list),
         ])
 
+    return individual_table
+
+
+def pretty_print_individuals(title: str, individuals: List[GedcomIndividual]) -> None:
+    ''' print individuals' data with PrettyTable '''
     print(title)
-    print(individual_table)
+    print(get_individual_table(individuals))
 
 
-def pretty_print_families(title: str, families: List[GedcomFamily]) -> None:
-    ''' print families' data with PrettyTable '''
+def get_family_table(families: List[GedcomFamily]) -> PrettyTable:
+    ''' get PrettyTable of families' data '''
     family_fields: List[str] = [
         'ID',
         'Married',
@@ -114,5 +119,10 @@ def pretty_print_families(title: str, families: List[GedcomFamily]) -> None:
             id_list_display(family.children_id_list),
         ])
 
+    return family_table
+
+
+def pretty_print_families(title: str, families: List[GedcomFamily]) -> None:
+    ''' print families' data with PrettyTable '''
     print(title)
-    print(family_table)
+    print(get_family_table(families))
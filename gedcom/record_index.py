@@ -0,0 +1,490 @@
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import abc
+import os
+import struct
+import sys
+import tempfile
+from .tags import GedcomIndividual, GedcomFamily
+from .tags.base import GedcomSubjectData
+from .file import GedcomLine, GedcomLineTable, GedcomLineRange, read_rows_from_buffer, get_record_starts, tokenize_bytes
+from .repository import GedcomRepository
+from .diagnostics import GedcomDiagnostics
+from .instrumentation import GedcomInstrumentation
+from .exceptions import GedcomFileNotFound, GedcomLineParsingException
+
+
+# bump when the sidecar layout changes
+INDEX_FORMAT_VERSION: int = 2
+
+# magic, format version, byte order of arrays, source size and mtime, counts of individuals, families, links and
+# rejected records
+INDEX_HEADER: struct.Struct = struct.Struct('<6sHcqqqqqq')
+
+INDEX_MAGIC: bytes = b'GEDIDX'
+
+# level-1 tags linking records, in the order of their codes in the adjacency section
+LINK_TAGS: Tuple[str, ...] = ('FAMC', 'FAMS', 'HUSB', 'WIFE', 'CHIL')
+
+# tags linking each kind of record to the other kind
+LINK_CODES: Dict[str, Dict[bytes, int]] = {
+    'individual': {b'FAMC': 0, b'FAMS': 1},
+    'family': {b'HUSB': 2, b'WIFE': 3, b'CHIL': 4},
+}
+
+# ID, byte offset, byte length, count of lines before and (tag code, linked ID) of an INDI/FAM record
+IndexedRecord = Tuple[str, int, int, int, List[Tuple[int, str]]]
+
+# byte offset, byte length and count of lines before of an INDI/FAM record with the ID after the tag
+RejectedRecord = Tuple[int, int, int]
+
+
+class GedcomRecordIndex:
+    ''' byte range and line number of each INDI/FAM record of a file by ID, and the FAMC/FAMS/HUSB/WIFE/CHIL links
+        between records, written to a sidecar file next to the file
+        individuals are rows [0, individual_count), families the rows after, each sorted by ID with duplicates in file order,
+        file_order lists the rows of individuals and then of families in file order,
+        links of row are link_targets[link_starts[row]:link_starts[row + 1]], to the first record of each linked ID,
+        records with the ID after the tag have no ID and no row, they are kept as rejected_* to be parsed for diagnostics '''
+    __slots__ = 'size', 'mtime', 'individual_count', 'ids', 'offsets', 'lengths', 'line_nos', 'file_order', 'link_starts', \
+        'link_targets', 'link_tags', 'rejected_offsets', 'rejected_lengths', 'rejected_line_nos'
+
+    def __init__(self, size: int, mtime: int, individual_count: int, ids: List[str]) -> None:
+        # size and mtime of the source file when it was indexed
+        self.size: int = size
+        self.mtime: int = mtime
+        self.individual_count: int = individual_count
+        self.ids: List[str] = ids
+        self.offsets: array = array('q')
+        self.lengths: array = array('q')
+        self.line_nos: array = array('q')
+        self.file_order: array = array('q')
+        self.link_starts: array = array('q', [0])
+        self.link_targets: array = array('q')
+        self.link_tags: array = array('B')
+        self.rejected_offsets: array = array('q')
+        self.rejected_lengths: array = array('q')
+        self.rejected_line_nos: array = array('q')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def family_count(self) -> int:
+        return len(self.ids) - self.individual_count
+
+    def is_current(self, path: str) -> bool:
+        ''' check if file is unchanged since it was indexed '''
+        stat: os.stat_result = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime)
+
+    def get_kind(self, row: int) -> str:
+        return 'individual' if row < self.individual_count else 'family'
+
+    def get_kind_rows(self, kind: str) -> range:
+        return range(0, self.individual_count) if kind == 'individual' else range(self.individual_count, len(self.ids))
+
+    def get_file_order(self, kind: str) -> array:
+        ''' get rows of records of kind in file order '''
+        rows: range = self.get_kind_rows(kind)
+        return self.file_order[rows.start:rows.stop]
+
+    def get_rows(self, kind: str, id: str) -> range:
+        ''' get rows of records of kind with ID, in file order, none for a missing ID '''
+        if not isinstance(id, str):
+            return range(0)
+
+        rows: range = self.get_kind_rows(kind)
+        return range(bisect_left(self.ids, id, rows.start, rows.stop), bisect_right(self.ids, id, rows.start, rows.stop))
+
+    def get_links(self, row: int) -> List[Tuple[str, int]]:
+        ''' get (tag, row) of records linked from record of row, in line order '''
+        start, stop = self.link_starts[row], self.link_starts[row + 1]
+        return [(LINK_TAGS[self.link_tags[link]], self.link_targets[link]) for link in range(start, stop)]
+
+    def to_bytes(self) -> bytes:
+        header: bytes = INDEX_HEADER.pack(
+            INDEX_MAGIC, INDEX_FORMAT_VERSION, sys.byteorder[0].encode(), self.size, self.mtime,
+            self.individual_count, self.family_count, len(self.link_targets), len(self.rejected_offsets))
+        ids: bytes = '\n'.join(self.ids).encode()
+        return b''.join([header, self.offsets.tobytes(), self.lengths.tobytes(), self.line_nos.tobytes(),
+                         self.file_order.tobytes(), self.link_starts.tobytes(), self.link_targets.tobytes(),
+                         self.link_tags.tobytes(), self.rejected_offsets.tobytes(), self.rejected_lengths.tobytes(),
+                         self.rejected_line_nos.tobytes(), ids])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional['GedcomRecordIndex']:
+        ''' get index from sidecar content, None if it was written by another format or machine byte order '''
+        if len(data) < INDEX_HEADER.size:
+            return None
+
+        magic, version, byteorder, size, mtime, individual_count, family_count, link_count, rejected_count = \
+            INDEX_HEADER.unpack_from(data)
+        if (magic, version, byteorder) != (INDEX_MAGIC, INDEX_FORMAT_VERSION, sys.byteorder[0].encode()):
+            return None
+
+        count: int = individual_count + family_count
+        index: GedcomRecordIndex = cls(size, mtime, individual_count, [])
+        index.link_starts = array('q')
+        position: int = INDEX_HEADER.size
+        for column, length in [('offsets', count), ('lengths', count), ('line_nos', count), ('file_order', count),
+                               ('link_starts', count + 1), ('link_targets', link_count), ('link_tags', link_count),
+                               ('rejected_offsets', rejected_count), ('rejected_lengths', rejected_count),
+                               ('rejected_line_nos', rejected_count)]:
+            values: array = getattr(index, column)
+            stop: int = position + length * values.itemsize
+            values.frombytes(data[position:stop])
+            position = stop
+
+        index.ids = data[position:].decode().split('\n') if count else []
+        return index if len(index.ids) == count else None
+
+
+def scan_records(data: bytes) -> Tuple[List[IndexedRecord], List[IndexedRecord], List[RejectedRecord]]:
+    ''' get individual and family records of file content, and records with the ID after the tag, in file order '''
+    records: Dict[bytes, List[IndexedRecord]] = {b'INDI': [], b'FAM': []}
+    rejected: List[RejectedRecord] = []
+    line_no: int = 0
+    starts: List[int] = get_record_starts(data)
+    for start, stop in zip(starts, starts[1:] + [len(data)]):
+        lines: List[bytes] = data[start:stop].split(b'\n')
+        try:
+            level, tag, arguments = tokenize_bytes(lines[0].rstrip(b'\r'))
+        except GedcomLineParsingException:
+            tag = None
+
+        # ID lines in tag last position are tokenized into argument tuples, as read_rows_from_buffer() checks
+        if tag in records and arguments.__class__ is bytes:
+            rejected.append((start, stop - start, line_no))
+
+        elif tag in records and arguments:
+            codes: Dict[bytes, int] = LINK_CODES['individual' if tag == b'INDI' else 'family']
+            links: List[Tuple[int, str]] = []
+            for line in lines[1:]:
+                fields: List[bytes] = line.split()
+                if len(fields) == 3 and fields[0] == b'1' and fields[1] in codes:
+                    links.append((codes[fields[1]], fields[2].decode()))
+
+            records[tag].append((arguments[0], start, stop - start, line_no, links))
+
+        line_no += len(lines) - 1
+
+    return records[b'INDI'], records[b'FAM'], rejected
+
+
+def build_record_index(path: str) -> GedcomRecordIndex:
+    ''' scan file for INDI/FAM records and their links, without parsing them '''
+    try:
+        stat: os.stat_result = os.stat(path)
+        with open(path, 'rb') as file:
+            data: bytes = file.read()
+    except FileNotFoundError:
+        raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
+
+    individuals, families, rejected = scan_records(data)
+    # stable sort keeps duplicates of an ID in file order
+    individuals.sort(key=lambda record: record[0])
+    families.sort(key=lambda record: record[0])
+    records: List[IndexedRecord] = individuals + families
+
+    index: GedcomRecordIndex = GedcomRecordIndex(
+        stat.st_size, stat.st_mtime_ns, len(individuals), [record[0] for record in records])
+
+    # links resolve to the first record of the linked ID
+    first_rows: Dict[str, Dict[str, int]] = {'individual': {}, 'family': {}}
+    for row, record in enumerate(records):
+        first_rows[index.get_kind(row)].setdefault(record[0], row)
+
+    for row, (id, offset, length, line_no, links) in enumerate(records):
+        index.offsets.append(offset)
+        index.lengths.append(length)
+        index.line_nos.append(line_no)
+        # family links of individuals, individual links of families, links to missing IDs are left out
+        linked_rows: Dict[str, int] = first_rows['family' if row < len(individuals) else 'individual']
+        for code, linked_id in links:
+            linked_row: Optional[int] = linked_rows.get(linked_id)
+            if linked_row is not None:
+                index.link_targets.append(linked_row)
+                index.link_tags.append(code)
+
+        index.link_starts.append(len(index.link_targets))
+
+    for kind in ('individual', 'family'):
+        index.file_order.extend(sorted(index.get_kind_rows(kind), key=index.line_nos.__getitem__))
+
+    for offset, length, line_no in rejected:
+        index.rejected_offsets.append(offset)
+        index.rejected_lengths.append(length)
+        index.rejected_line_nos.append(line_no)
+
+    return index
+
+
+def get_record_index_path(path: str) -> str:
+    return f'{path}.idx'
+
+
+def read_record_index(index_path: str) -> Optional[GedcomRecordIndex]:
+    ''' get index from sidecar file, None if it is missing or unreadable '''
+    try:
+        with open(index_path, 'rb') as file:
+            return GedcomRecordIndex.from_bytes(file.read())
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def write_record_index(path: str, index_path: Optional[str] = None) -> GedcomRecordIndex:
+    ''' index file and write the sidecar atomically, index_path defaults to path + ".idx" '''
+    index_path = index_path or get_record_index_path(path)
+    index: GedcomRecordIndex = build_record_index(path)
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_path)), suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(index.to_bytes())
+
+        os.replace(temp_path, index_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return index
+
+
+def load_record_index(path: str, index_path: Optional[str] = None) -> GedcomRecordIndex:
+    ''' get index of file from its sidecar, which is written again if missing or the file size or mtime changed '''
+    if not os.path.isfile(path):
+        raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
+
+    index_path = index_path or get_record_index_path(path)
+    index: Optional[GedcomRecordIndex] = read_record_index(index_path)
+    if index is not None and index.is_current(path):
+        return index
+
+    try:
+        return write_record_index(path, index_path)
+    except OSError:
+        # sidecar is best effort, a file in a read-only directory is indexed on every open
+        return build_record_index(path)
+
+
+class GedcomIndexedIdMap(abc.Mapping):
+    ''' first subject of each id, like repo.individual / repo.family, None for missing ids '''
+
+    def __init__(self, repo: 'GedcomIndexedRepository', kind: str) -> None:
+        self.repo: 'GedcomIndexedRepository' = repo
+        self.kind: str = kind
+
+    def __getitem__(self, id: str) -> Optional[GedcomSubjectData]:
+        rows: range = self.repo.get_rows(self.kind, id)
+        return self.repo.load_subject(rows[0]) if rows else None
+
+    def __contains__(self, id: Any) -> bool:
+        return bool(self.repo.get_rows(self.kind, id))
+
+    def __len__(self) -> int:
+        return len(set(self.repo.record_index.ids[row] for row in self.repo.get_kind_rows(self.kind)))
+
+    def __iter__(self) -> Iterator[str]:
+        # ids in the file order of their first record, the first row of each ID in the sorted index
+        ids: List[str] = self.repo.record_index.ids
+        start: int = self.repo.get_kind_rows(self.kind).start
+        for row in self.repo.record_index.get_file_order(self.kind):
+            if row == start or ids[row - 1] != ids[row]:
+                yield ids[row]
+
+
+class GedcomIndexedDuplicatesMap(GedcomIndexedIdMap):
+    ''' all subjects of each id in file order, like repo.individual_duplicates, empty for missing ids '''
+
+    def __getitem__(self, id: str) -> List[GedcomSubjectData]:
+        subjects: List[Optional[GedcomSubjectData]] = [self.repo.load_subject(row) for row in self.repo.get_rows(self.kind, id)]
+        return [subject for subject in subjects if subject is not None]
+
+
+class GedcomIndexedSubjects(abc.Sequence):
+    ''' subjects of the index ordered by id, like repo.individuals / repo.families
+        records are parsed on first access to leave out those whose ID line is rejected '''
+
+    def __init__(self, repo: 'GedcomIndexedRepository', kind: str) -> None:
+        self.repo: 'GedcomIndexedRepository' = repo
+        self.kind: str = kind
+
+    def __len__(self) -> int:
+        return len(self.repo.get_subject_rows(self.kind))
+
+    def __getitem__(self, index: int) -> GedcomSubjectData:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        return self.repo.load_subject(self.repo.get_subject_rows(self.kind)[index])
+
+
+class GedcomIndexedRepository(GedcomRepository):
+    ''' GEDCOM repository of a file with a record index, a subject is parsed from its record with a single seek when first
+        looked up, relations are looked up by ID
+        subjects are dropped and the file is indexed again when its size or mtime changes '''
+    __slots__ = 'path', 'index_path', 'record_index', '_subjects', '_subject_rows', '_table', '_file'
+
+    def __init__(
+        self,
+        path: str,
+        index_path: Optional[str] = None,
+        instrumentation: Optional[GedcomInstrumentation] = None
+    ) -> None:
+        self.path: str = path
+        self.index_path: Optional[str] = index_path
+        self.instrumentation: Optional[GedcomInstrumentation] = instrumentation
+        with self.measure('parse', 'index'):
+            self.record_index: GedcomRecordIndex = load_record_index(path, index_path)
+
+        self.lines = self._date_lines = None
+        self.lazy = self.compact = False
+        self._notes = []
+        self._header = self._trailer = None
+        self.relations = None
+        self._individual_columns = self._family_columns = None
+        self._validation_results = {}
+        self._file: Optional[IO] = None
+        self.reset_subjects()
+
+    def reset_subjects(self) -> None:
+        self.close()
+        # subject of each row parsed so far, None for records whose ID line is rejected
+        self._subjects: Dict[int, Optional[GedcomSubjectData]] = {}
+        # rows of subjects of each kind whose ID line is not rejected, found when first listed
+        self._subject_rows: Dict[str, List[int]] = {}
+        # lines of parsed subjects, their text is read back from the file
+        self._table: GedcomLineTable = GedcomLineTable(self.path)
+        # lines rejected while parsing subjects so far, starting with the ID lines of records left out of the index
+        self.diagnostics: GedcomDiagnostics = GedcomDiagnostics()
+        for offset, length, line_no in zip(
+                self.record_index.rejected_offsets, self.record_index.rejected_lengths, self.record_index.rejected_line_nos):
+            self.parse_record(offset, length, line_no)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+        if getattr(self, '_table', None) is not None:
+            self._table.close()
+
+    def refresh(self) -> bool:
+        ''' index the file again if it changed since it was indexed, return whether it did '''
+        if self.record_index.is_current(self.path):
+            return False
+
+        with self.measure('parse', 'index'):
+            self.record_index = load_record_index(self.path, self.index_path)
+
+        self.reset_subjects()
+        return True
+
+    def get_rows(self, kind: str, id: str) -> range:
+        if not isinstance(id, str):
+            return range(0)
+
+        self.refresh()
+        return self.record_index.get_rows(kind, id)
+
+    def get_kind_rows(self, kind: str) -> range:
+        self.refresh()
+        return self.record_index.get_kind_rows(kind)
+
+    def get_subject_rows(self, kind: str) -> List[int]:
+        ''' get rows of kind whose records are not rejected, in ID order '''
+        rows: range = self.get_kind_rows(kind)
+        if kind not in self._subject_rows:
+            self._subject_rows[kind] = [row for row in rows if self.load_subject(row) is not None]
+
+        return self._subject_rows[kind]
+
+    def parse_record(self, offset: int, length: int, line_no: int) -> GedcomSubjectData:
+        ''' parse INDI/FAM record of length bytes at offset of the file, after line_no lines '''
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+
+        with self.measure('parse', 'record'):
+            table_row: int = len(self._table)
+            for _ in read_rows_from_buffer(self._file, self._table, offset, offset + length, line_no):
+                pass
+
+            subject_type: type = GedcomIndividual if self._table[table_row].tag == 'INDI' else GedcomFamily
+            return subject_type(GedcomLineRange(self._table, table_row, len(self._table)), self)
+
+    def load_subject(self, row: int) -> Optional[GedcomSubjectData]:
+        ''' get subject of row of the index, parsed from its record on first access '''
+        if row in self._subjects:
+            return self._subjects[row]
+
+        subject: GedcomSubjectData = self.parse_record(
+            self.record_index.offsets[row], self.record_index.lengths[row], self.record_index.line_nos[row])
+        self._subjects[row] = subject if subject.validated else None
+        return self._subjects[row]
+
+    def load_individual_with_families(self, individual_id: str) -> Tuple[Optional[GedcomIndividual], List[GedcomFamily]]:
+        ''' get individual and the families it is a child or spouse of, records are read in file order '''
+        rows: range = self.get_rows('individual', individual_id)
+        if not rows:
+            return None, []
+
+        # FAMC families first, as in member_of_list
+        family_rows: List[int] = list(dict.fromkeys(
+            linked_row for tag, linked_row in sorted(self.record_index.get_links(rows[0]), key=lambda link: link[0] != 'FAMC')))
+        for row in sorted([rows[0]] + family_rows, key=self.record_index.offsets.__getitem__):
+            self.load_subject(row)
+
+        families: List[Optional[GedcomFamily]] = [self._subjects[row] for row in family_rows]
+        return self._subjects[rows[0]], [family for family in families if family is not None]
+
+    @property
+    def date_lines(self) -> Iterator[GedcomLine]:
+        ''' get DATE lines of every record, parsing records not accessed yet '''
+        for kind in ('individual', 'family'):
+            self.get_subject_rows(kind)
+
+        return (line for line in self._table if line.tag == 'DATE')
+
+    @property
+    def individual(self) -> GedcomIndexedIdMap:
+        return GedcomIndexedIdMap(self, 'individual')
+
+    @property
+    def family(self) -> GedcomIndexedIdMap:
+        return GedcomIndexedIdMap(self, 'family')
+
+    @property
+    def individuals(self) -> GedcomIndexedSubjects:
+        return GedcomIndexedSubjects(self, 'individual')
+
+    @property
+    def families(self) -> GedcomIndexedSubjects:
+        return GedcomIndexedSubjects(self, 'family')
+
+    @property
+    def individual_duplicates(self) -> GedcomIndexedDuplicatesMap:
+        return GedcomIndexedDuplicatesMap(self, 'individual')
+
+    @property
+    def family_duplicates(self) -> GedcomIndexedDuplicatesMap:
+        return GedcomIndexedDuplicatesMap(self, 'family')
+
+
+def open_indexed_repository(
+    path: str,
+    index_path: Optional[str] = None,
+    instrumentation: Optional[GedcomInstrumentation] = None
+) -> GedcomIndexedRepository:
+    ''' open GEDCOM repository of file with random access to records by ID
+        index_path: sidecar index, defaults to path + ".idx", written on first open and whenever the file size or mtime
+        changes '''
+    return GedcomIndexedRepository(path, index_path, instrumentation)
+
+
+if __name__ == '__main__':
+    # python -m gedcom.record_index {file} ... writes the sidecar index of each file
+    for path in sys.argv[1:]:
+        index: GedcomRecordIndex = write_record_index(path)
+        print(f'{get_record_index_path(path)}: {index.individual_count} individuals, {index.family_count} families, '
+              f'{len(index.link_targets)} links')
@@ -0,0 +1,91 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+# subject, tag of the reference (FAMS/FAMC/HUSB/WIFE/CHIL), ID it refers to and position among references of the tag
+GedcomReference = Tuple['GedcomSubjectData', str, str, int]
+
+# subject, tag, ID and line number of a reference, and the subject referred to or None when no subject has the ID
+GedcomBrokenReference = Tuple['GedcomSubjectData', str, str, int, Optional['GedcomSubjectData']]
+
+# edge set of each reference tag, a spouse may be either HUSB or WIFE
+EDGES: Dict[str, str] = {'FAMS': 'FAMS', 'FAMC': 'FAMC', 'HUSB': 'SPOUSE', 'WIFE': 'SPOUSE', 'CHIL': 'CHIL'}
+
+# edge set expected back for each reference tag
+BACK_EDGES: Dict[str, str] = {'FAMS': 'SPOUSE', 'FAMC': 'CHIL', 'HUSB': 'FAMS', 'WIFE': 'FAMS', 'CHIL': 'FAMC'}
+
+
+class GedcomReferenceIndex:
+    ''' individual-family references in both directions, collected in a single pass over the subjects
+        a reference is one-sided when the subject referred to has no reference back, dangling when no subject has the ID,
+        references are checked against every subject of a duplicate ID '''
+
+    def __init__(self, individuals: Sequence['GedcomIndividual'], families: Sequence['GedcomFamily']) -> None:
+        # references of individuals by tag, of families in line order
+        self.spouse_of: List[GedcomReference] = []
+        self.child_of: List[GedcomReference] = []
+        self.members: List[GedcomReference] = []
+
+        # subjects of each ID in file order
+        self.individuals: Dict[str, List['GedcomIndividual']] = {}
+        self.families: Dict[str, List['GedcomFamily']] = {}
+
+        # (subject identity, ID referred to) of the references in each edge set
+        self.edges: Dict[str, Set[Tuple[int, str]]] = {edges: set() for edges in BACK_EDGES.values()}
+
+        for individual in individuals:
+            self.individuals.setdefault(individual.id, []).append(individual)
+            self._add(self.spouse_of, individual, 'FAMS', individual.spouse_of_id_list)
+            self._add(self.child_of, individual, 'FAMC', individual.child_of_id_list)
+
+        for family in families:
+            self.families.setdefault(family.id, []).append(family)
+            if family.husband_id:
+                self._add(self.members, family, 'HUSB', [family.husband_id])
+            if family.wife_id:
+                self._add(self.members, family, 'WIFE', [family.wife_id])
+            self._add(self.members, family, 'CHIL', family.children_id_list)
+
+    def _add(self, references: List[GedcomReference], subject: 'GedcomSubjectData', tag: str, ids: List[str]) -> None:
+        if ids:
+            subject_key: int = id(subject)
+            references.extend([(subject, tag, id_, position) for position, id_ in enumerate(ids)])
+            self.edges[EDGES[tag]].update([(subject_key, id_) for id_ in ids])
+
+    @staticmethod
+    def get_line_no(subject: 'GedcomSubjectData', tag: str, position: int) -> int:
+        ''' get line number of reference, only looked up for broken references '''
+        if tag == 'FAMS':
+            return subject.spouse_of_line_no_list[position]
+        if tag == 'FAMC':
+            return subject.child_of_line_no_list[position]
+        if tag == 'HUSB':
+            return subject.husband_line_no
+        if tag == 'WIFE':
+            return subject.wife_line_no
+
+        return subject.children_line_no_list[position]
+
+    def _join(self, references: List[GedcomReference], targets: Dict[str, List['GedcomSubjectData']]) -> Iterator[GedcomBrokenReference]:
+        ''' get references without a reference back from every subject of the target ID '''
+        for subject, tag, id_, position in references:
+            subjects: Optional[List['GedcomSubjectData']] = targets.get(id_)
+            if not subjects:
+                yield subject, tag, id_, self.get_line_no(subject, tag, position), None
+                continue
+
+            back_edges: Set[Tuple[int, str]] = self.edges[BACK_EDGES[tag]]
+            for target in subjects:
+                if (id(target), subject.id) not in back_edges:
+                    yield subject, tag, id_, self.get_line_no(subject, tag, position), target
+
+    def broken_spouse_of(self) -> Iterator[GedcomBrokenReference]:
+        ''' FAMS of individuals without HUSB/WIFE back '''
+        return self._join(self.spouse_of, self.families)
+
+    def broken_child_of(self) -> Iterator[GedcomBrokenReference]:
+        ''' FAMC of individuals without CHIL back '''
+        return self._join(self.child_of, self.families)
+
+    def broken_members(self) -> Iterator[GedcomBrokenReference]:
+        ''' HUSB/WIFE/CHIL of families without FAMS/FAMC back '''
+        return self._join(self.members, self.individuals)
@@ -0,0 +1,109 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from array import array
+
+
+class GedcomAdjacency:
+    ''' compact adjacency list, targets of row i are targets[offsets[i]:offsets[i + 1]] '''
+    __slots__ = 'offsets', 'targets', 'rows'
+
+    def __init__(self) -> None:
+        self.offsets: array = array('I', [0])
+        self.targets: array = array('i')
+        # rows resolved to subjects, only kept while validators run
+        self.rows: Optional[List[List[Any]]] = None
+
+    def append(self, targets: Iterable[int]) -> None:
+        ''' add next row of targets '''
+        self.targets.extend(targets)
+        self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> array:
+        return self.targets[self.offsets[row]:self.offsets[row + 1]]
+
+    def get(self, row: int, subjects: Sequence[Any]) -> List[Any]:
+        ''' get subjects at targets of row '''
+        if self.rows is not None:
+            return self.rows[row]
+
+        return [subjects[target] for target in self.targets[self.offsets[row]:self.offsets[row + 1]]]
+
+    def resolve(self, subjects: Sequence[Any]) -> None:
+        ''' keep every row resolved to subjects '''
+        offsets: array = self.offsets
+        targets: array = self.targets
+        self.rows = [[subjects[target] for target in targets[offsets[row]:offsets[row + 1]]]
+                     for row in range(len(offsets) - 1)]
+
+
+class GedcomRelationIndex:
+    ''' individual-family relations resolved to positions in repo.individuals / repo.families
+        rows of spouse_of/child_of follow repo.individuals, rows of husbands/wifes/children follow repo.families,
+        targets of an id include all duplicates of it in file order '''
+    __slots__ = 'spouse_of', 'child_of', 'husbands', 'wifes', 'children'
+
+    def __init__(self, individuals: Sequence['GedcomIndividual'], families: Sequence['GedcomFamily']) -> None:
+        self.spouse_of: GedcomAdjacency = GedcomAdjacency()
+        self.child_of: GedcomAdjacency = GedcomAdjacency()
+        self.husbands: GedcomAdjacency = GedcomAdjacency()
+        self.wifes: GedcomAdjacency = GedcomAdjacency()
+        self.children: GedcomAdjacency = GedcomAdjacency()
+
+        # positions of every occurrence of an id, subjects are sorted by id with a stable sort
+        individual_positions: Dict[str, List[int]] = self._index_positions(individuals)
+        family_positions: Dict[str, List[int]] = self._index_positions(families)
+
+        for individual in individuals:
+            self.spouse_of.append(self._resolve(
+                family_positions, individual.spouse_of_id_list))
+            self.child_of.append(self._resolve(
+                family_positions, individual.child_of_id_list))
+
+        for family in families:
+            self.husbands.append(self._resolve(
+                individual_positions, [family.husband_id]))
+            self.wifes.append(self._resolve(
+                individual_positions, [family.wife_id]))
+            self.children.append(self._resolve(
+                individual_positions, family.children_id_list))
+
+    @staticmethod
+    def _index_positions(subjects: Sequence['GedcomSubjectData']) -> Dict[str, List[int]]:
+        ''' number subjects by position and group positions by id '''
+        positions: Dict[str, List[int]] = {}
+        for position, subject in enumerate(subjects):
+            subject._index = position
+            positions.setdefault(subject.id, []).append(position)
+
+        return positions
+
+    @staticmethod
+    def _resolve(positions: Dict[str, List[int]], id_list: List[str]) -> List[int]:
+        ''' get positions of all subjects by ID list, each ID once '''
+        result: List[int] = []
+        visited: Set[str] = set()
+        for id in id_list:
+            if not id in visited:
+                visited.add(id)
+                result.extend(positions.get(id, ()))
+
+        return result
+
+    @property
+    def resolved(self) -> bool:
+        return self.children.rows is not None
+
+    def resolve(self, individuals: Sequence['GedcomIndividual'], families: Sequence['GedcomFamily']) -> None:
+        ''' resolve all rows to subject lists, for repeated lookups while validators run '''
+        self.spouse_of.resolve(families)
+        self.child_of.resolve(families)
+        self.husbands.resolve(individuals)
+        self.wifes.resolve(individuals)
+        self.children.resolve(individuals)
+
+    def release(self) -> None:
+        ''' drop resolved subject lists '''
+        for adjacency in (self.spouse_of, self.child_of, self.husbands, self.wifes, self.children):
+            adjacency.rows = None
@@ -1,7 +1,15 @@
-from typing import Callable, Optional, List, Dict, Iterator, Tuple, Any, DefaultDict
+from typing import Callable, ContextManager, Optional, List, Dict, Iterator, Iterable, Sequence, Tuple, Any, DefaultDict, Union
+import os
 from collections import defaultdict
 from .tags import *
-from .file import GedcomLine, prompt_input_file, get_lines_from_path
+from .tags.base import GedcomSubjectData
+from .file import GedcomLine, GedcomLineTable, prompt_input_file, get_lines_from_path, get_records_from_lines, read_line_table, copy_lines
+from .relations import GedcomRelationIndex
+from .columns import GedcomIndividualColumns, GedcomFamilyColumns, get_individual_columns, get_family_columns
+from .validation import ValidationEngine, ValidationResult
+from .diagnostics import GedcomDiagnostics, GedcomLazyDiagnostics
+from .instrumentation import GedcomInstrumentation, GedcomStageStats, measure
+from .exceptions import GedcomException, GedcomFileNotFound
 from .pretty_table import pretty_print_individuals, pretty_print_families
 
 
@@ -12,11 +20,39 @@ Printer = Callable[['GedcomRepository'], Optional[Tuple[Any]]]
 
 class GedcomRepository:
     ''' A Repository for GEDCOM file data '''
-    __slots__ = 'lines', '_notes', '_header', '_trailer', '_individuals', '_families', '_individual_dict', '_family_dict', '_individual_keys', '_family_keys', 'individual_duplicates',  'family_duplicates'
-
-    def __init__(self, lines: List[GedcomLine]) -> None:
-        ''' construct GedcomRepository '''
-        self.parse_and_validate_lines(lines)
+    __slots__ = 'lines', '_notes', '_header', '_trailer', '_individuals', '_families', '_individual_dict', '_family_dict', '_individual_keys', '_family_keys', 'individual_duplicates',  'family_duplicates', 'relations', '_individual_columns', '_family_columns', '_validation_results', 'instrumentation', 'lazy', 'compact', 'diagnostics', '_date_lines'
+
+    def __init__(
+        self,
+        lines: Iterable[GedcomLine],
+        keep_lines: bool = True,
+        instrumentation: Optional[GedcomInstrumentation] = None,
+        lazy: bool = False,
+        compact: bool = False
+    ) -> None:
+        ''' construct GedcomRepository, keep_lines=False drops lines after each record is parsed,
+            only DATE lines not validated are kept for validators of dates
+            instrumentation: record parse phases, validators and printers of this repository
+            lazy: only scan IDs and line ranges of subjects, their lines are parsed on first access,
+            relations are looked up by ID, reading diagnostics parses the subjects not accessed yet
+            compact: subjects keep their parsed values and line numbers and release their lines '''
+        self.instrumentation: Optional[GedcomInstrumentation] = instrumentation
+        self.lazy: bool = lazy
+        self.compact: bool = compact
+        self.parse_and_validate_lines(lines, keep_lines)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        ''' pickle parsed data without validation results, columns and instrumentation '''
+        names: List[str] = [name for klass in type(self).__mro__ for name in getattr(klass, '__slots__', ())]
+        state: Dict[str, Any] = {name: getattr(self, name) for name in names if hasattr(self, name)}
+        state['_individual_columns'] = state['_family_columns'] = None
+        state['_validation_results'] = {}
+        state['instrumentation'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
 
     @property
     def individual(self) -> Dict[str, GedcomIndividual]:
@@ -40,87 +76,161 @@ class GedcomRepository:
         # return [self.family[id] for id in self._family_keys]
         return self._families
 
+    @property
+    def individual_columns(self) -> Optional[GedcomIndividualColumns]:
+        ''' get dates of individuals as NumPy arrays, built on first use, None without NumPy '''
+        if self._individual_columns is None:
+            self._individual_columns = get_individual_columns(self.individuals)
+
+        return self._individual_columns
+
+    @property
+    def family_columns(self) -> Optional[GedcomFamilyColumns]:
+        ''' get children of families with their birth dates as NumPy arrays, built on first use, None without NumPy '''
+        if self._family_columns is None:
+            self._family_columns = get_family_columns(self.families, self.relations, self.individual_columns)
+
+        return self._family_columns
+
+    @property
+    def date_lines(self) -> Iterable[GedcomLine]:
+        ''' get DATE lines, only those not validated while parsing when lines are not kept '''
+        if self.lines is not None:
+            return (line for line in self.lines if line.tag == 'DATE')
+
+        return self._date_lines
+
+    def measure(self, kind: str, name: str) -> ContextManager[GedcomStageStats]:
+        ''' measure a stage with instrumentation of repository '''
+        return measure(self.instrumentation, kind, name)
+
     def reset_containers(self) -> None:
         self._notes: List[GedcomNotes] = []
         self._individuals: List[GedcomIndividual] = []
         self._families: List[GedcomFamily] = []
         self._individual_keys: List[str] = []
         self._family_keys: List[str] = []
-        self._individual_dict: Dict[str, GedcomIndividual] = defaultdict(lambda: None)
-        self._family_dict: Dict[str, GedcomFamily] = defaultdict(lambda: None)
+        self._individual_dict: Dict[str, GedcomIndividual] = defaultdict(type(None))
+        self._family_dict: Dict[str, GedcomFamily] = defaultdict(type(None))
         self.individual_duplicates: DefaultDict[str, List[GedcomIndividual]] = defaultdict(list)
         self.family_duplicates: DefaultDict[str, List[GedcomFamily]] = defaultdict(list)
-
-    def parse_and_validate_lines(self, lines: List[GedcomLine]) -> None:
+        self.relations: Optional[GedcomRelationIndex] = None
+        self._individual_columns: Optional[GedcomIndividualColumns] = None
+        self._family_columns: Optional[GedcomFamilyColumns] = None
+        self._validation_results: Dict[Validator, ValidationResult] = {}
+        # lines rejected while parsing
+        self.diagnostics: Optional[GedcomDiagnostics] = GedcomLazyDiagnostics(self) if self.lazy else GedcomDiagnostics()
+
+    def parse_and_validate_lines(self, lines: Iterable[GedcomLine], keep_lines: bool = True) -> None:
         ''' get data from lines and validate '''
 
         # cleanse data
-        self.lines: List[GedcomLine] = lines
+        if keep_lines and not isinstance(lines, Sequence):
+            with self.measure('parse', 'tokenize'):
+                lines = list(lines)
+
+        self.lines: Optional[Sequence[GedcomLine]] = lines if keep_lines else None
         self.reset_containers()
+        # DATE lines validators check against invalid dates outlive the lines they were read from
+        self._date_lines: Optional[GedcomLineTable] = None if keep_lines else GedcomLineTable()
+
+        # consume lines one level-0 record at a time
+        with self.measure('parse', 'subjects'):
+            for record_lines in get_records_from_lines(lines):
+                self.parse_record(record_lines)
+                if not keep_lines:
+                    self.keep_date_lines(record_lines)
+
+        with self.measure('parse', 'sort'):
+            self.sort_subjects()
+
+        # resolving relations would parse every subject
+        if not self.lazy:
+            with self.measure('parse', 'relations'):
+                self.index_relations()
+        # end of parse_and_validate_lines
+
+    def add_individual(self, individual: GedcomIndividual) -> None:
+        ''' add parsed individual, in file order '''
+        # maintain occurrences
+        self.individual_duplicates[individual.id].append(individual)
+        self._individuals.append(individual)
+        # save the first occurrence to dictionary
+        if individual.id not in self._individual_dict:
+            self._individual_dict[individual.id] = individual
+
+    def add_family(self, family: GedcomFamily) -> None:
+        ''' add parsed family, in file order '''
+        # maintain occurrences
+        self.family_duplicates[family.id].append(family)
+        self._families.append(family)
+        # save the first occurrence to dictionary
+        if family.id not in self._family_dict:
+            self._family_dict[family.id] = family
+
+    def sort_subjects(self) -> None:
+        ''' sort individuals and family by key once all subjects are added '''
+        self._individual_keys = sorted(self._individual_dict.keys())
+        self._family_keys = sorted(self._family_dict.keys())
+        self._individuals.sort(key=lambda individual: individual.id)
+        self._families.sort(key=lambda family: family.id)
 
-        _individuals: List[GedcomIndividual] = []
-        _families: List[GedcomFamily] = []
-
-        i: int = 0
-        while i < len(lines):
-            line = lines[i]
-            level: str = line.level
-            tag: str = line.tag
-
-            data_lines: [GedcomLine] = [line]
-            if tag in ('INDI', 'FAM'):
-                i += 1
-                while lines[i].level != 0:
-                    data_lines.append(lines[i])
-                    i += 1
-
-                try:
-                    if tag == 'INDI':
-                        individual = GedcomIndividual(data_lines, self)
-                        _individuals.append(individual)
-                        # maintain occurrences
-                        self.individual_duplicates[individual.id].append(individual)
-                        # save the first occurrence to dictionary
-                        if individual.id not in self._individual_dict:
-                            self._individual_dict[individual.id] = individual
-
-                    if tag == 'FAM':
-                        family = GedcomFamily(data_lines, self)
-                        _families.append(family)
-                        # maintain occurrences
-                        self.family_duplicates[family.id].append(family)
-                        # save the first occurrence to dictionary
-                        if family.id not in self._family_dict:
-                            self._family_dict[family.id] = family
-
-                except Exception as e:
-                    # skip invalid subject(INDI/FaM)
-                    # along with following lines without a valid subject
-                    pass
+    def index_relations(self) -> None:
+        ''' resolve family memberships once all subjects are added and sorted '''
+        self.relations = GedcomRelationIndex(self._individuals, self._families)
 
+    @property
+    def subject_types(self) -> Tuple[type, type]:
+        ''' get (individual, family) types subjects are parsed into '''
+        if self.lazy:
+            return GedcomLazyIndividual, GedcomLazyFamily
+        if self.compact:
+            return GedcomCompactIndividual, GedcomCompactFamily
+
+        return GedcomIndividual, GedcomFamily
+
+    def parse_record(self, record_lines: Sequence[GedcomLine]) -> None:
+        ''' get data from lines of a single level-0 record '''
+        line: GedcomLine = record_lines[0]
+        tag: str = line.tag
+
+        if tag in ('INDI', 'FAM'):
+            individual_type, family_type = self.subject_types
+            subject: GedcomSubjectData = (individual_type if tag == 'INDI' else family_type)(record_lines, self)
+
+            # skip invalid subject(INDI/FaM) along with its lines, the reason is in diagnostics
+            if not subject.validated:
+                return
+
+            if tag == 'INDI':
+                self.add_individual(subject)
             else:
-                try:
-                    if tag == 'NOTE':
-                        self._notes.append(GedcomNote(data_lines, self))
+                self.add_family(subject)
 
-                    elif tag == 'HEAD':
-                        self._header = GedcomHeader(data_lines, self)
+            return
 
-                    elif tag == 'TRLR':
-                        self._trailer = GedcomTrailer(data_lines, self)
+        # lines of other records are handled one by one
+        for line in record_lines:
+            data_lines: Sequence[GedcomLine] = [line]
+            # kept lines of a compact repository do not hold on to the lines of the whole file
+            if self.compact and line.tag in ('NOTE', 'HEAD', 'TRLR'):
+                data_lines = copy_lines(data_lines)
 
-                except Exception as e:
-                    # skip invalid top level tags
-                    pass
+            # invalid top level tags are kept, the reason is in diagnostics
+            if line.tag == 'NOTE':
+                self._notes.append(GedcomNote(data_lines, self))
 
-                i += 1
+            elif line.tag == 'HEAD':
+                self._header = GedcomHeader(data_lines, self)
 
-        # sort individuals and family by key
-        self._individual_keys = sorted(self._individual_dict.keys())
-        self._family_keys = sorted(self._family_dict.keys())
-        self._individuals = sorted(_individuals, key=lambda individual: individual.id)
-        self._families = sorted(_families, key=lambda family: family.id)
-        # end of parse_and_validate_lines
+            elif line.tag == 'TRLR':
+                self._trailer = GedcomTrailer(data_lines, self)
+
+    def keep_date_lines(self, record_lines: Sequence[GedcomLine]) -> None:
+        ''' copy DATE lines of a parsed record not validated by their event, valid dates need no line to check '''
+        for line in record_lines:
+            if line.tag == 'DATE' and not line.validated:
+                copy_lines([line], self._date_lines)
 
     def print_parse_report(self) -> None:
         ''' print parsed line data and validation status '''
@@ -130,10 +240,47 @@ class GedcomRepository:
             print(
                 f'<-- {l.level}|{l.tag}|{l.status}|{" ".join(l.arguments)}')
 
+    def run_validations(self, validators: Sequence[Validator], processes: Optional[int] = None) -> 'GedcomRepository':
+        ''' run validators together in a single pass, results are printed by validate()
+            processes: run validators in a process pool of this size instead '''
+        if processes:
+            from .parallel import validate_parallel
+            with self.measure('validation', 'run_validations'):
+                self._validation_results.update(validate_parallel(self, validators, processes))
+        elif self.instrumentation:
+            # validators run one at a time to be measured on their own
+            for validator in validators:
+                self._validation_results.update(self._run_measured(validator))
+        else:
+            self._validation_results.update(ValidationEngine(validators).run(self))
+
+        # return self for piping
+        return self
+
+    def _run_measured(self, validator: Validator) -> Dict[Validator, ValidationResult]:
+        ''' run validator with ValidationEngine and record its result '''
+        with self.measure('validator', validator.__name__) as stats:
+            results: Dict[Validator, ValidationResult] = ValidationEngine([validator]).run(self)
+
+        result: ValidationResult = results[validator]
+        stats.items += len(result.errors)
+        if result.exception is not None:
+            stats.exceptions.append(result.exception)
+
+        return results
+
     def validate(self, validator: Validator) -> 'GedcomRepository':
-        ''' run validator on GEDCOM data '''
+        ''' run validator on GEDCOM data, or print its result from run_validations() '''
+        result: Optional[ValidationResult] = self._validation_results.get(validator)
         try:
-            errors: List[str] = validator(self)
+            if result is None:
+                with self.measure('validator', validator.__name__) as stats:
+                    errors: List[str] = validator(self)
+                    stats.items += len(errors or [])
+            elif result.exception is not None:
+                raise result.exception
+            else:
+                errors = result.errors
         except Exception as e:
             # catch and print validator internal erros
             print(e)
@@ -147,30 +294,35 @@ class GedcomRepository:
 
     def print_individuals(self, individual_printer: Printer) -> None:
         ''' print specified individual data with PrettyTable '''
-        # get table content from printer
-        print_info = individual_printer(self)
-        if print_info:
-            title, individual_list = print_info
-            # print with PrettyTable
-            pretty_print_individuals(title, individual_list)
+        with self.measure('printer', individual_printer.__name__) as stats:
+            # get table content from printer
+            print_info = individual_printer(self)
+            if print_info:
+                title, individual_list = print_info
+                stats.items += len(individual_list)
+                # print with PrettyTable
+                pretty_print_individuals(title, individual_list)
         # return self for piping
         return self;
 
     def print_families(self, family_printer: Printer) -> None:
         ''' print specified family data with PrettyTable '''
-        # get table content from printer
-        print_info = family_printer(self)
-        if print_info:
-            title, family_list = print_info
-            # print with PrettyTable
-            pretty_print_families(title, family_list)
+        with self.measure('printer', family_printer.__name__) as stats:
+            # get table content from printer
+            print_info = family_printer(self)
+            if print_info:
+                title, family_list = print_info
+                stats.items += len(family_list)
+                # print with PrettyTable
+                pretty_print_families(title, family_list)
         # return self for piping
         return self;
 
     def showcase(self, display: Callable[['GedcomRepository'], None]) -> 'GedcomRepository':
         ''' display specified GEDCOM data '''
         try:
-            result: bool = display(self)
+            with self.measure('showcase', display.__name__):
+                result: bool = display(self)
         except Exception as e:
             # catch unexpected error
             pass
@@ -179,19 +331,91 @@ class GedcomRepository:
         return self
 
 
-def read_repository_file(path: str) -> GedcomRepository:
-    ''' creat GEDCOM repository from input file '''
+def read_repository_file(
+    path: str,
+    streaming: bool = False,
+    mapped: bool = False,
+    cache: Union[bool, 'GedcomRepositoryCache'] = False,
+    instrumentation: Optional[GedcomInstrumentation] = None,
+    lazy: bool = False,
+    compact: bool = False,
+    incremental: bool = False
+) -> GedcomRepository:
+    ''' creat GEDCOM repository from input file
+        streaming: parse records straight from the line generator without keeping repo.lines, subjects still hold
+        the lines they were parsed from, compact releases those too
+        mapped: tokenize the memory-mapped file on raw bytes
+        cache: load from and save to a GedcomRepositoryCache, True for the default cache
+        instrumentation: record parse phases, validators and printers of the repository
+        lazy: parse subjects on first access, lines are kept
+        compact: keep parsed values of subjects and release their lines, lines are streamed
+        incremental: update the repository of path stored in cache by its last store(), parsing only changed records,
+        a GedcomRepositoryCache given as cache is used
+        streaming, lazy, compact and incremental are exclusive, only incremental is combined with cache '''
+
+    modes: List[str] = [name for name, enabled in (
+        ('streaming', streaming), ('lazy', lazy), ('compact', compact), ('incremental', incremental)) if enabled]
+    if len(modes) > 1:
+        raise GedcomException(f'{" and ".join(modes)} repositories cannot be combined')
+    if cache and modes and not incremental:
+        raise GedcomException(f'{modes[0]} repositories are not cached')
+
+    if incremental:
+        from .incremental import read_repository_incremental
+        return read_repository_incremental(path, cache if cache is not True else None, instrumentation)
+
+    if lazy:
+        with measure(instrumentation, 'parse', 'tokenize'):
+            lines = read_line_table(path, mapped)
+
+        return GedcomRepository(lines, instrumentation=instrumentation, lazy=True)
+
+    if compact:
+        # no line outlives the record it belongs to
+        line_generator: Iterator[GedcomLine] = get_lines_from_path(path, mapped)
+        return GedcomRepository(line_generator, keep_lines=False, instrumentation=instrumentation, compact=True)
+
+    if streaming:
+        # lines are tokenized while subjects are parsed
+        line_generator: Iterator[GedcomLine] = get_lines_from_path(path, mapped)
+        return GedcomRepository(line_generator, keep_lines=False, instrumentation=instrumentation)
+
+    if cache:
+        from .cache import GedcomRepositoryCache
+        if cache is True:
+            cache = GedcomRepositoryCache()
+
+        if not os.path.isfile(path):
+            raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
+
+        with measure(instrumentation, 'parse', 'load'):
+            repo: Optional[GedcomRepository] = cache.load(path)
+
+        if repo is None:
+            with measure(instrumentation, 'parse', 'tokenize'):
+                lines: GedcomLineTable = read_line_table(path, mapped)
+
+            repo = GedcomRepository(lines, instrumentation=instrumentation)
+            with measure(instrumentation, 'parse', 'store'):
+                cache.store(path, repo)
+
+        repo.instrumentation = instrumentation
+        return repo
+
+    with measure(instrumentation, 'parse', 'tokenize'):
+        lines = read_line_table(path, mapped)
 
-    line_generator: Iterator[GedcomLine] = get_lines_from_path(path)
-    lines: List[GedcomLine] = list(line_generator)
-    return GedcomRepository(lines)
+    return GedcomRepository(lines, instrumentation=instrumentation)
 
 
 def prompt_repository_file(
     prompt_message: str = 'Enter GEDCOM file (i.g. "test.ged" or "./test.ged"): ',
-    default_file_path: str = 'test.ged'
+    default_file_path: str = 'test.ged',
+    cache: Union[bool, 'GedcomRepositoryCache'] = False,
+    instrumentation: Optional[GedcomInstrumentation] = None,
+    incremental: bool = False
 ) -> GedcomRepository:
     ''' prompt for input file to creat GEDCOM repository '''
 
     path: str = prompt_input_file(prompt_message, default_file_path)
-    return read_repository_file(path)
+    return read_repository_file(path, cache=cache, instrumentation=instrumentation, incremental=incremental)
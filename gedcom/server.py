@@ -0,0 +1,427 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from contextlib import redirect_stdout
+from datetime import date as Date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from stat import S_ISSOCK
+from threading import Event, Lock, Thread
+from urllib.parse import urlsplit
+import json
+import os
+import socket
+import socketserver
+from .repository import GedcomRepository, Validator, Printer
+from .incremental import GedcomIncrementalRepository, read_repository_incremental
+from .validation import ValidationResult
+from .pretty_table import get_individual_table, get_family_table
+from .exceptions import GedcomException, GedcomFileNotFound, GedcomRequestException
+
+
+# repository method of index.py and the validator or printer it runs
+PipelineStep = Tuple[Callable, Callable]
+
+# seconds between checks of loaded files for changes
+WATCH_INTERVAL: float = 1.0
+
+# table of the subjects returned by printers of each repository method
+PRINTER_TABLES: Dict[Callable, Callable] = {
+    GedcomRepository.print_individuals: get_individual_table,
+    GedcomRepository.print_families: get_family_table,
+}
+
+# commands answered by GedcomServer.handle_{command}()
+COMMANDS: Tuple[str, ...] = ('load', 'unload', 'status', 'validate', 'print', 'query', 'report')
+
+# size and modification time of a file
+FileStat = Tuple[int, int]
+
+
+def get_file_stat(path: str) -> FileStat:
+    try:
+        stat: os.stat_result = os.stat(path)
+    except OSError:
+        raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+class GedcomLoadedFile:
+    ''' repository of a file kept by the server, updated when the size or mtime of the file changes '''
+    __slots__ = 'path', 'repo', 'stat', 'validated_on'
+
+    def __init__(self, path: str, cache: Optional['GedcomRepositoryCache'] = None) -> None:
+        self.path: str = path
+        # stat is taken before reading, an edit while reading is picked up by the next refresh
+        self.stat: FileStat = get_file_stat(path)
+        self.repo: GedcomIncrementalRepository = \
+            read_repository_incremental(path, cache) if cache else GedcomIncrementalRepository(path)
+        # results of validators depending on the current date expire with it
+        self.validated_on: Date = Date.today()
+
+    def refresh(self) -> bool:
+        ''' update repository if the file changed since it was read, return whether it was updated '''
+        stat: FileStat = get_file_stat(self.path)
+        if stat == self.stat:
+            return False
+
+        self.stat = stat
+        self.repo.update()
+        return True
+
+    def validate(self, validators: Sequence[Validator]) -> Dict[Validator, ValidationResult]:
+        ''' get results of validators, only validators without a result since the last update are run '''
+        if self.validated_on != Date.today():
+            self.repo._validation_results.clear()
+            self.validated_on = Date.today()
+
+        missing: List[Validator] = [validator for validator in validators if validator not in self.repo._validation_results]
+        if missing:
+            self.repo.run_validations(missing)
+
+        return {validator: self.repo._validation_results[validator] for validator in validators}
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'size': self.stat[0],
+            'individuals': len(self.repo.individuals),
+            'families': len(self.repo.families),
+            'diagnostics': len(self.repo.diagnostics),
+        }
+
+
+def get_validation_output(result: ValidationResult) -> str:
+    ''' text GedcomRepository.validate() prints for result '''
+    if result.exception is not None:
+        return f'{result.exception}\n'
+
+    return ''.join(f'{error}\n' for error in result.errors)
+
+
+class GedcomServer:
+    ''' repositories of files kept in memory and the validators and printers of a pipeline run on them,
+        requests are JSON objects with a command and the path of a file, which is loaded on first request
+        a thread checks loaded files for changes every watch_interval seconds, requests check them as well
+        requests of a file run one at a time, requests of other files and status do not wait for them
+        cache: GedcomRepositoryCache repositories are loaded from and stored to on close() '''
+
+    def __init__(
+        self,
+        pipeline: Sequence[PipelineStep],
+        cache: Optional['GedcomRepositoryCache'] = None,
+        watch_interval: float = WATCH_INTERVAL
+    ) -> None:
+        self.pipeline: List[PipelineStep] = list(pipeline)
+        self.validators: Dict[str, Validator] = {
+            step.__name__: step for run, step in self.pipeline if run is GedcomRepository.validate}
+        self.printers: Dict[str, PipelineStep] = {
+            step.__name__: (run, step) for run, step in self.pipeline if run is not GedcomRepository.validate}
+        self.cache: Optional['GedcomRepositoryCache'] = cache
+        self.watch_interval: float = watch_interval
+        self.files: Dict[str, GedcomLoadedFile] = {}
+        # guards files and _file_locks only, loading or validating a file holds the lock of its path
+        self._lock: Lock = Lock()
+        self._file_locks: Dict[str, Lock] = {}
+        self._stopped: Event = Event()
+        self._watcher: Optional[Thread] = None
+
+    def start_watching(self) -> None:
+        self._watcher = Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.watch_interval):
+            with self._lock:
+                files: List[GedcomLoadedFile] = list(self.files.values())
+
+            for file in files:
+                lock: Lock = self.get_file_lock(file.path)
+                # a file in use by a request is refreshed by the request
+                if not lock.acquire(blocking=False):
+                    continue
+
+                try:
+                    file.refresh()
+                except Exception:
+                    # a file being written or replaced is read again on the next check or request
+                    pass
+                finally:
+                    lock.release()
+
+    def close(self) -> None:
+        ''' stop watching files, store repositories in cache '''
+        self._stopped.set()
+        if self._watcher:
+            self._watcher.join()
+
+        with self._lock:
+            files: List[GedcomLoadedFile] = list(self.files.values())
+
+        if self.cache:
+            for file in files:
+                with self.get_file_lock(file.path):
+                    self.cache.store_incremental(file.path, file.repo)
+
+        with self._lock:
+            self.files.clear()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        ''' run command of request, errors are returned as {"error": message} '''
+        try:
+            if not isinstance(request, dict):
+                raise GedcomRequestException('Request must be a JSON object')
+
+            command: Any = request.get('command')
+            if command not in COMMANDS:
+                raise GedcomRequestException(f'Unknown command "{command}"')
+
+            if command == 'status':
+                with self._lock:
+                    return self.handle_status(request)
+
+            with self.get_file_lock(self.get_path(request)):
+                return getattr(self, f'handle_{command}')(request)
+        except Exception as e:
+            # as GedcomRepository.validate() prints errors of validators, the server keeps answering
+            return {'error': str(e)}
+
+    def get_path(self, request: Dict[str, Any]) -> str:
+        path: Any = request.get('path')
+        if not isinstance(path, str) or not path:
+            raise GedcomRequestException('Request requires a path')
+
+        return os.path.abspath(path)
+
+    def get_file_lock(self, path: str) -> Lock:
+        ''' lock held while a request loads, updates or runs steps on the file of path '''
+        with self._lock:
+            return self._file_locks.setdefault(path, Lock())
+
+    def get_file(self, request: Dict[str, Any]) -> GedcomLoadedFile:
+        ''' get loaded file of the path of request, load it or update it to the file as it is now,
+            the caller holds the lock of the path '''
+        path: str = self.get_path(request)
+        with self._lock:
+            file: Optional[GedcomLoadedFile] = self.files.get(path)
+
+        if file is None:
+            file = GedcomLoadedFile(path, self.cache)
+            with self._lock:
+                self.files[path] = file
+        else:
+            file.refresh()
+
+        return file
+
+    def get_steps(self, request: Dict[str, Any], key: str, steps: Dict[str, Any]) -> List[Any]:
+        ''' get steps named by key of request, all steps if not given '''
+        names: Any = request.get(key)
+        if names is None:
+            return list(steps.values())
+
+        if not isinstance(names, list):
+            raise GedcomRequestException(f'{key} must be a list of names')
+
+        unknown: List[str] = [name for name in names if name not in steps]
+        if unknown:
+            raise GedcomRequestException(f'Unknown {key}: {", ".join(map(str, unknown))}')
+
+        return [steps[name] for name in names]
+
+    def run_printer(self, file: GedcomLoadedFile, run: Callable, printer: Printer) -> Dict[str, Any]:
+        ''' run printer as run(repo, printer) does, with the printed text and the rows of its table '''
+        output: StringIO = StringIO()
+        # printers may print tables of their own
+        with redirect_stdout(output), file.repo.measure('printer', printer.__name__):
+            print_info: Optional[Tuple[Any]] = printer(file.repo)
+
+        result: Dict[str, Any] = {'printer': printer.__name__, 'title': None, 'fields': [], 'rows': []}
+        if print_info:
+            title, subjects = print_info
+            table = PRINTER_TABLES[run](subjects)
+            output.write(f'{title}\n{table}\n')
+            result.update(title=title, fields=table.field_names, rows=table.rows)
+
+        result['text'] = output.getvalue()
+        return result
+
+    def handle_load(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self.get_file(request).get_status()
+
+    def handle_unload(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            file: Optional[GedcomLoadedFile] = self.files.pop(self.get_path(request), None)
+
+        return {'unloaded': file is not None}
+
+    def handle_status(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {'files': [file.get_status() for file in self.files.values()]}
+
+    def handle_validate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        ''' errors of validators, {"validators": [names]} selects validators of the pipeline,
+            {"limit": n} answers the first n errors of each, count is the number of all of them '''
+        file: GedcomLoadedFile = self.get_file(request)
+        validators: List[Validator] = self.get_steps(request, 'validators', self.validators)
+        limit: Any = request.get('limit')
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise GedcomRequestException('limit must be a non-negative integer')
+
+        results: Dict[Validator, ValidationResult] = file.validate(validators)
+        return {'results': [{
+            'validator': validator.__name__,
+            'count': len(result.errors),
+            'errors': result.errors if limit is None else result.errors[:limit],
+            'exception': None if result.exception is None else str(result.exception),
+        } for validator, result in results.items()]}
+
+    def handle_print(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        ''' tables of printers, {"printers": [names]} selects printers of the pipeline '''
+        file: GedcomLoadedFile = self.get_file(request)
+        steps: List[PipelineStep] = self.get_steps(request, 'printers', self.printers)
+        return {'results': [self.run_printer(file, run, printer) for run, printer in steps]}
+
+    def handle_query(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        ''' individuals and families of {"ids": [IDs]} as the fields of their tables, null if not found '''
+        file: GedcomLoadedFile = self.get_file(request)
+        subjects: Dict[str, Optional[Dict[str, Any]]] = {}
+        ids: Any = request.get('ids') or []
+        if not isinstance(ids, list):
+            raise GedcomRequestException('ids must be a list of IDs')
+
+        for subject_id in ids:
+            individual = file.repo.individual.get(subject_id)
+            family = file.repo.family.get(subject_id)
+            if individual is None and family is None:
+                subjects[subject_id] = None
+                continue
+
+            table = get_individual_table([individual]) if individual is not None else get_family_table([family])
+            subjects[subject_id] = dict(zip(table.field_names, table.rows[0]))
+            subjects[subject_id]['line_no'] = (individual or family).line_no
+
+        return {'subjects': subjects}
+
+    def handle_report(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        ''' text index.py prints for the file, validators and printers in pipeline order '''
+        file: GedcomLoadedFile = self.get_file(request)
+        results: Dict[Validator, ValidationResult] = file.validate(list(self.validators.values()))
+        output: List[str] = []
+        for run, step in self.pipeline:
+            if run is GedcomRepository.validate:
+                output.append(get_validation_output(results[step]))
+            else:
+                output.append(self.run_printer(file, run, step)['text'])
+
+        return {'text': ''.join(output)}
+
+
+def parse_address(address: str) -> Tuple[str, Union[str, Tuple[str, int]]]:
+    ''' get transport and socket address of "unix:{path}" or "http://{host}:{port}" '''
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+
+    url = urlsplit(address)
+    if url.scheme != 'http' or not url.hostname:
+        raise GedcomRequestException(f'Invalid server address "{address}"')
+
+    return 'http', (url.hostname, url.port or 80)
+
+
+def encode_response(response: Dict[str, Any]) -> bytes:
+    return json.dumps(response, default=str).encode()
+
+
+class GedcomHTTPRequestHandler(BaseHTTPRequestHandler):
+    ''' POST /{command} with a JSON object body, the command may also be given in the body '''
+
+    def do_POST(self) -> None:
+        try:
+            request: Any = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        except ValueError:
+            request = None
+
+        if isinstance(request, dict) and self.path.strip('/'):
+            request.setdefault('command', self.path.strip('/'))
+
+        response: Dict[str, Any] = self.server.gedcom.handle_request(request)
+        body: bytes = encode_response(response)
+        self.send_response(400 if 'error' in response else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # requests are not logged
+        pass
+
+
+class GedcomHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], gedcom: GedcomServer) -> None:
+        self.gedcom: GedcomServer = gedcom
+        super().__init__(address, GedcomHTTPRequestHandler)
+
+
+class GedcomStreamRequestHandler(socketserver.StreamRequestHandler):
+    ''' a JSON object per line, answered by a JSON object per line, until the client closes the connection '''
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request: Any = json.loads(line)
+            except ValueError:
+                request = None
+
+            self.wfile.write(encode_response(self.server.gedcom.handle_request(request)) + b'\n')
+            self.wfile.flush()
+
+
+if hasattr(socket, 'AF_UNIX'):
+    def remove_stale_socket(path: str) -> None:
+        ''' remove socket left at path by a server which did not close it,
+            raise if a server still answers at path or path is not a socket '''
+        try:
+            mode: int = os.lstat(path).st_mode
+        except FileNotFoundError:
+            return
+
+        if not S_ISSOCK(mode):
+            raise GedcomException(f'Cannot serve at "{path}", it is not a socket')
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(path)
+            except ConnectionRefusedError:
+                os.unlink(path)
+                return
+
+        raise GedcomException(f'Cannot serve at "{path}", a server is already serving at it')
+
+    class GedcomUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path: str, gedcom: GedcomServer) -> None:
+            self.gedcom: GedcomServer = gedcom
+            remove_stale_socket(path)
+            super().__init__(path, GedcomStreamRequestHandler)
+            # a socket bound at path after this server closed is not removed by it
+            self.socket_inode: int = os.lstat(path).st_ino
+
+        def server_close(self) -> None:
+            super().server_close()
+            try:
+                if os.lstat(self.server_address).st_ino == self.socket_inode:
+                    os.unlink(self.server_address)
+            except FileNotFoundError:
+                pass
+
+
+def make_server(gedcom: GedcomServer, address: str) -> socketserver.BaseServer:
+    ''' bind server to "unix:{path}" or "http://{host}:{port}", requests are answered by serve_forever() '''
+    transport, socket_address = parse_address(address)
+    if transport == 'unix':
+        return GedcomUnixServer(socket_address, gedcom)
+
+    return GedcomHTTPServer(socket_address, gedcom)
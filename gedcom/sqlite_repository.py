@@ -0,0 +1,606 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from array import array
+from collections import OrderedDict, abc
+from datetime import date as Date
+import builtins
+import json
+import os
+import sqlite3
+from .file import GedcomLine, GedcomLineTable, read_rows_from_mapped_file, get_records_from_lines
+from .repository import GedcomRepository
+from .parallel import get_shard_offsets
+from .cache import get_code_fingerprint
+from .dates import YMD, get_ymd
+from .tags import GedcomIndividual, GedcomFamily, GedcomNote
+from .exceptions import GedcomFileNotFound
+
+
+# bump when tables change
+SCHEMA_VERSION: int = 1
+
+# bytes of source file parsed at a time while building the database
+BUILD_CHUNK_SIZE: int = 64 << 20
+
+# records kept in memory per subject type
+RECORD_CACHE_SIZE: int = 1 << 16
+
+# lines loaded per line table while iterating repo.lines
+LINE_BATCH_SIZE: int = 1 << 12
+
+SCHEMA: str = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE lines (line_no INTEGER PRIMARY KEY, level INTEGER, tag TEXT, arguments TEXT, validated INTEGER, data TEXT);
+CREATE TABLE individuals (
+    seq INTEGER PRIMARY KEY, id TEXT, line_no INTEGER, name TEXT, name_line_no INTEGER, sex TEXT, sex_line_no INTEGER,
+    surname TEXT, birth TEXT, birth_line_no INTEGER, death TEXT, death_line_no INTEGER, errors TEXT);
+CREATE TABLE families (
+    seq INTEGER PRIMARY KEY, id TEXT, line_no INTEGER, husband_id TEXT, husband_line_no INTEGER, wife_id TEXT, wife_line_no INTEGER,
+    marriage TEXT, marriage_line_no INTEGER, divorce TEXT, divorce_line_no INTEGER, errors TEXT);
+CREATE TABLE members (individual_seq INTEGER, relation TEXT, family_id TEXT, line_no INTEGER);
+CREATE TABLE children (family_seq INTEGER, individual_id TEXT, line_no INTEGER);
+'''
+
+INDEXES: str = '''
+CREATE INDEX individuals_id ON individuals (id, seq);
+CREATE INDEX individuals_birth ON individuals (birth);
+CREATE INDEX individuals_death ON individuals (death);
+CREATE INDEX individuals_surname ON individuals (surname);
+CREATE INDEX families_id ON families (id, seq);
+CREATE INDEX families_marriage ON families (marriage);
+CREATE INDEX families_divorce ON families (divorce);
+CREATE INDEX members_individual ON members (individual_seq);
+CREATE INDEX members_family ON members (family_id);
+CREATE INDEX children_family ON children (family_seq);
+CREATE INDEX children_individual ON children (individual_id);
+'''
+
+# row columns after seq and id, read back by record properties
+INDIVIDUAL_COLUMNS: Tuple[str, ...] = (
+    'line_no', 'name', 'name_line_no', 'sex', 'sex_line_no', 'last_name',
+    'birth', 'birth_line_no', 'death', 'death_line_no')
+FAMILY_COLUMNS: Tuple[str, ...] = (
+    'line_no', 'husband_id', 'husband_line_no', 'wife_id', 'wife_line_no',
+    'marriage', 'marriage_line_no', 'divorce', 'divorce_line_no')
+
+DATE_COLUMNS: Tuple[str, ...] = 'birth', 'death', 'marriage', 'divorce'
+
+
+def get_row_values(subject: Any, columns: Tuple[str, ...]) -> Tuple[List[Any], Optional[str]]:
+    ''' get property values of parsed subject, with errors raised by properties '''
+    values: List[Any] = []
+    errors: Dict[str, Tuple[str, str]] = {}
+    for column in columns:
+        try:
+            value: Any = getattr(subject, column)
+        except Exception as e:
+            errors[column] = type(e).__name__, [*e.args]
+            value = None
+
+        values.append(value.isoformat() if column in DATE_COLUMNS and value else value)
+
+    return values, json.dumps(errors, default=str) if errors else None
+
+
+class GedcomRecord:
+    ''' subject read from a database row, property values come from row columns '''
+    # row index of each column
+    column_index: Dict[str, int] = {}
+
+    def __init__(self, repo: 'GedcomSqliteRepository', row: Tuple[Any, ...]) -> None:
+        self._repo: 'GedcomSqliteRepository' = repo
+        self._seq: int = row[0]
+        self.id: str = row[1]
+        self._row: Tuple[Any, ...] = row
+        self._errors: Optional[Dict[str, List[Any]]] = json.loads(row[-1]) if row[-1] else None
+
+    def _get(self, column: str) -> Any:
+        ''' get column value, raise the error the parsed property raised '''
+        if self._errors and column in self._errors:
+            error_type, args = self._errors[column]
+            raise getattr(builtins, error_type, Exception)(*args)
+
+        value: Any = self._row[self.column_index[column]]
+        if column in DATE_COLUMNS and value:
+            return Date.fromisoformat(value)
+
+        return value
+
+    @property
+    def line_no(self) -> int:
+        return self._get('line_no')
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} {self.id} at line {self._row[2]}>'
+
+
+class GedcomIndividualRecord(GedcomRecord, GedcomIndividual):
+    ''' individual read from GedcomSqliteRepository '''
+    column_index = {column: index for index, column in enumerate(INDIVIDUAL_COLUMNS, 2)}
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._get('name')
+
+    @property
+    def name_line_no(self) -> Optional[int]:
+        return self._get('name_line_no')
+
+    @property
+    def sex(self) -> Optional[str]:
+        return self._get('sex')
+
+    @property
+    def sex_line_no(self) -> Optional[int]:
+        return self._get('sex_line_no')
+
+    @property
+    def birth(self) -> Optional[Date]:
+        return self._get('birth')
+
+    @property
+    def birth_line_no(self) -> Optional[int]:
+        return self._get('birth_line_no')
+
+    @property
+    def birth_ordinal(self) -> Optional[int]:
+        date: Optional[Date] = self.birth
+        return date.toordinal() if date else None
+
+    @property
+    def birth_ymd(self) -> Optional[YMD]:
+        return get_ymd(self.birth)
+
+    @property
+    def death(self) -> Optional[Date]:
+        return self._get('death')
+
+    @property
+    def death_line_no(self) -> Optional[int]:
+        return self._get('death_line_no')
+
+    @property
+    def death_ordinal(self) -> Optional[int]:
+        date: Optional[Date] = self.death
+        return date.toordinal() if date else None
+
+    @property
+    def death_ymd(self) -> Optional[YMD]:
+        return get_ymd(self.death)
+
+    def _get_memberships(self, relation: Optional[str] = None) -> List[Tuple[str, int]]:
+        ''' get (family_id, line_no) of FAMC/FAMS lines, FAMC first when relation is None '''
+        return [(family_id, line_no) for member_relation, family_id, line_no in self._repo.get_memberships(self._seq)
+                if member_relation == relation or relation is None]
+
+    @property
+    def spouse_of_id_list(self) -> List[str]:
+        return [family_id for family_id, line_no in self._get_memberships('FAMS')]
+
+    @property
+    def spouse_of_line_no_list(self) -> List[int]:
+        return [line_no for family_id, line_no in self._get_memberships('FAMS')]
+
+    @property
+    def spouse_of_list(self) -> List['GedcomFamily']:
+        return self._repo.get_member_families(self._seq, 'FAMS')
+
+    @property
+    def child_of_id_list(self) -> List[str]:
+        return [family_id for family_id, line_no in self._get_memberships('FAMC')]
+
+    @property
+    def child_of_line_no_list(self) -> List[int]:
+        return [line_no for family_id, line_no in self._get_memberships('FAMC')]
+
+    @property
+    def child_of_list(self) -> List['GedcomFamily']:
+        return self._repo.get_member_families(self._seq, 'FAMC')
+
+    @property
+    def member_of_id_list(self) -> List[str]:
+        return [family_id for family_id, line_no in self._get_memberships()]
+
+    @property
+    def member_of_line_no_list(self) -> List[int]:
+        return [line_no for family_id, line_no in self._get_memberships()]
+
+    @property
+    def member_of_list(self) -> List['GedcomFamily']:
+        return self._repo.get_member_families(self._seq)
+
+
+class GedcomFamilyRecord(GedcomRecord, GedcomFamily):
+    ''' family read from GedcomSqliteRepository '''
+    column_index = {column: index for index, column in enumerate(FAMILY_COLUMNS, 2)}
+
+    @property
+    def husband_id(self) -> Optional[str]:
+        return self._get('husband_id')
+
+    @property
+    def husbands(self) -> List['GedcomIndividual']:
+        return self._repo.individual_duplicates[self.husband_id]
+
+    @property
+    def husband_line_no(self) -> Optional[int]:
+        return self._get('husband_line_no')
+
+    @property
+    def wife_id(self) -> Optional[str]:
+        return self._get('wife_id')
+
+    @property
+    def wifes(self) -> List['GedcomIndividual']:
+        return self._repo.individual_duplicates[self.wife_id]
+
+    @property
+    def wife_line_no(self) -> Optional[int]:
+        return self._get('wife_line_no')
+
+    @property
+    def children_id_list(self) -> List[str]:
+        return [child_id for child_id, line_no in self._repo.get_children(self._seq)]
+
+    @property
+    def children_line_no_list(self) -> List[int]:
+        return [line_no for child_id, line_no in self._repo.get_children(self._seq)]
+
+    @property
+    def children(self) -> List['GedcomIndividual']:
+        return self._repo.get_child_individuals(self._seq)
+
+    @property
+    def marriage(self) -> Optional[Date]:
+        return self._get('marriage')
+
+    @property
+    def marriage_line_no(self) -> Optional[int]:
+        return self._get('marriage_line_no')
+
+    @property
+    def marriage_ordinal(self) -> Optional[int]:
+        date: Optional[Date] = self.marriage
+        return date.toordinal() if date else None
+
+    @property
+    def marriage_ymd(self) -> Optional[YMD]:
+        return get_ymd(self.marriage)
+
+    @property
+    def divorce(self) -> Optional[Date]:
+        return self._get('divorce')
+
+    @property
+    def divorce_line_no(self) -> Optional[int]:
+        return self._get('divorce_line_no')
+
+    @property
+    def divorce_ordinal(self) -> Optional[int]:
+        date: Optional[Date] = self.divorce
+        return date.toordinal() if date else None
+
+    @property
+    def divorce_ymd(self) -> Optional[YMD]:
+        return get_ymd(self.divorce)
+
+
+class GedcomSqliteSubjects(abc.Sequence):
+    ''' subjects of a database table ordered by id, like repo.individuals / repo.families '''
+
+    def __init__(self, repo: 'GedcomSqliteRepository', kind: str) -> None:
+        self.repo: 'GedcomSqliteRepository' = repo
+        self.kind: str = kind
+
+    def __len__(self) -> int:
+        return len(self.repo.get_order(self.kind))
+
+    def __getitem__(self, index: int) -> GedcomRecord:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        try:
+            seq: int = self.repo.get_order(self.kind)[index]
+        except IndexError:
+            raise IndexError(f'{self.kind} index out of range')
+
+        row: Tuple[Any, ...] = self.repo.connection.execute(f'SELECT * FROM {self.kind} WHERE seq = ?', (seq,)).fetchone()
+        return self.repo.get_record(self.kind, row)
+
+    def __iter__(self) -> Iterator[GedcomRecord]:
+        for row in self.repo.connection.execute(f'SELECT * FROM {self.kind} ORDER BY id, seq'):
+            yield self.repo.get_record(self.kind, row)
+
+
+class GedcomSqliteIdMap(abc.Mapping):
+    ''' first subject of each id, like repo.individual / repo.family, None for missing ids '''
+
+    def __init__(self, repo: 'GedcomSqliteRepository', kind: str) -> None:
+        self.repo: 'GedcomSqliteRepository' = repo
+        self.kind: str = kind
+
+    def __getitem__(self, id: str) -> Optional[GedcomRecord]:
+        row: Optional[Tuple[Any, ...]] = self.repo.connection.execute(
+            f'SELECT * FROM {self.kind} WHERE id = ? ORDER BY seq LIMIT 1', (id,)).fetchone()
+        return self.repo.get_record(self.kind, row) if row else None
+
+    def __contains__(self, id: Any) -> bool:
+        return self[id] is not None
+
+    def __len__(self) -> int:
+        return self.repo.connection.execute(f'SELECT COUNT(DISTINCT id) FROM {self.kind}').fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        # ids in order of first occurrence
+        for id, in self.repo.connection.execute(f'SELECT id FROM {self.kind} GROUP BY id ORDER BY MIN(seq)'):
+            yield id
+
+
+class GedcomSqliteDuplicatesMap(GedcomSqliteIdMap):
+    ''' all subjects of each id in file order, like repo.individual_duplicates, empty for missing ids '''
+
+    def __getitem__(self, id: str) -> List[GedcomRecord]:
+        return [self.repo.get_record(self.kind, row) for row in self.repo.connection.execute(
+            f'SELECT * FROM {self.kind} WHERE id = ? ORDER BY seq', (id,))]
+
+    def __contains__(self, id: Any) -> bool:
+        return bool(self[id])
+
+    def items(self) -> Iterator[Tuple[str, List[GedcomRecord]]]:
+        ''' get (id, subjects) in order of first occurrence, with a single query '''
+        id: Optional[str] = None
+        subjects: List[GedcomRecord] = []
+        for row in self.repo.connection.execute(
+                f'SELECT * FROM {self.kind} ORDER BY MIN(seq) OVER (PARTITION BY id), seq'):
+            if subjects and row[1] != id:
+                yield id, subjects
+                subjects = []
+
+            id = row[1]
+            subjects.append(self.repo.get_record(self.kind, row))
+
+        if subjects:
+            yield id, subjects
+
+
+class GedcomSqliteLines(abc.Sequence):
+    ''' lines of the database in file order, loaded into small line tables '''
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection: sqlite3.Connection = connection
+
+    def __len__(self) -> int:
+        # line numbers count lines from 1
+        return self.connection.execute('SELECT MAX(line_no) FROM lines').fetchone()[0] or 0
+
+    def _load(self, rows: List[Tuple[Any, ...]]) -> GedcomLineTable:
+        ''' get line table of rows '''
+        table: GedcomLineTable = GedcomLineTable()
+        for line_no, level, tag, arguments, validated, data in rows:
+            row: int = table.append(level, table.tag_id(tag), tuple(arguments.split(' ')) if arguments else (), line_no, 0, 0, data)
+            table.set_validated(row, validated)
+
+        return table
+
+    def __getitem__(self, index: int) -> GedcomLine:
+        rows: List[Tuple[Any, ...]] = self.connection.execute(
+            'SELECT * FROM lines WHERE line_no = ?', ((index + len(self) if index < 0 else index) + 1,)).fetchall()
+        if not rows:
+            raise IndexError('lines index out of range')
+
+        return GedcomLine(self._load(rows), 0)
+
+    def __iter__(self) -> Iterator[GedcomLine]:
+        cursor: sqlite3.Cursor = self.connection.execute('SELECT * FROM lines ORDER BY line_no')
+        while True:
+            rows: List[Tuple[Any, ...]] = cursor.fetchmany(LINE_BATCH_SIZE)
+            if not rows:
+                return
+
+            yield from self._load(rows)
+
+
+class GedcomSqliteRepository(GedcomRepository):
+    ''' GEDCOM repository stored in a SQLite database, for trees larger than memory
+        subjects are read back as records through a bounded record cache '''
+    __slots__ = 'connection', 'cache_size', '_records', '_orders'
+
+    def __init__(self, database_path: str, cache_size: int = RECORD_CACHE_SIZE) -> None:
+        self.connection: sqlite3.Connection = sqlite3.connect(database_path)
+        self.cache_size: int = cache_size
+        self._records: Dict[str, OrderedDict] = {'individuals': OrderedDict(), 'families': OrderedDict()}
+        # seq of subjects of each table in id order, for index access
+        self._orders: Dict[str, array] = {}
+        self._notes: List[GedcomNote] = []
+        self.relations = None
+        self._individual_columns = self._family_columns = None
+        self._validation_results = {}
+        self.instrumentation = None
+        # lines rejected while parsing are not stored in the database
+        self.diagnostics = None
+
+    def get_record(self, kind: str, row: Tuple[Any, ...]) -> GedcomRecord:
+        ''' get record of row, least recently used records are dropped over cache_size '''
+        records: OrderedDict = self._records[kind]
+        record: Optional[GedcomRecord] = records.get(row[0])
+        if record is not None:
+            records.move_to_end(row[0])
+            return record
+
+        record = (GedcomIndividualRecord if kind == 'individuals' else GedcomFamilyRecord)(self, row)
+        records[row[0]] = record
+        if len(records) > self.cache_size:
+            records.popitem(last=False)
+
+        return record
+
+    def get_order(self, kind: str) -> array:
+        ''' get seq of subjects of kind ordered by id, read on first use '''
+        order: Optional[array] = self._orders.get(kind)
+        if order is None:
+            order = self._orders[kind] = array('q', (seq for seq, in self.connection.execute(
+                f'SELECT seq FROM {kind} ORDER BY id, seq')))
+
+        return order
+
+    def get_memberships(self, individual_seq: int) -> List[Tuple[str, str, int]]:
+        ''' get (relation, family_id, line_no) of individual, FAMC first then FAMS, in line order '''
+        return self.connection.execute(
+            'SELECT relation, family_id, line_no FROM members WHERE individual_seq = ? ORDER BY relation, rowid',
+            (individual_seq,)).fetchall()
+
+    def get_member_families(self, individual_seq: int, relation: Optional[str] = None) -> List[GedcomRecord]:
+        ''' get all families of FAMC/FAMS family ids of individual, including duplicates '''
+        rows: List[Tuple[Any, ...]] = self.connection.execute(
+            'SELECT families.* FROM members JOIN families ON families.id = members.family_id '
+            'WHERE members.individual_seq = ? AND (? IS NULL OR members.relation = ?) '
+            'ORDER BY members.relation, members.rowid, families.seq', (individual_seq, relation, relation)).fetchall()
+        return [self.get_record('families', row) for row in rows]
+
+    def get_children(self, family_seq: int) -> List[Tuple[str, int]]:
+        ''' get (individual_id, line_no) of CHIL lines of family '''
+        return self.connection.execute(
+            'SELECT individual_id, line_no FROM children WHERE family_seq = ? ORDER BY rowid', (family_seq,)).fetchall()
+
+    def get_child_individuals(self, family_seq: int) -> List[GedcomRecord]:
+        ''' get all individuals of CHIL ids of family, including duplicates '''
+        rows: List[Tuple[Any, ...]] = self.connection.execute(
+            'SELECT individuals.* FROM children JOIN individuals ON individuals.id = children.individual_id '
+            'WHERE children.family_seq = ? ORDER BY children.rowid, individuals.seq', (family_seq,)).fetchall()
+        return [self.get_record('individuals', row) for row in rows]
+
+    @property
+    def lines(self) -> GedcomSqliteLines:
+        return GedcomSqliteLines(self.connection)
+
+    @property
+    def individual(self) -> GedcomSqliteIdMap:
+        return GedcomSqliteIdMap(self, 'individuals')
+
+    @property
+    def family(self) -> GedcomSqliteIdMap:
+        return GedcomSqliteIdMap(self, 'families')
+
+    @property
+    def individuals(self) -> GedcomSqliteSubjects:
+        return GedcomSqliteSubjects(self, 'individuals')
+
+    @property
+    def families(self) -> GedcomSqliteSubjects:
+        return GedcomSqliteSubjects(self, 'families')
+
+    @property
+    def individual_duplicates(self) -> GedcomSqliteDuplicatesMap:
+        return GedcomSqliteDuplicatesMap(self, 'individuals')
+
+    @property
+    def family_duplicates(self) -> GedcomSqliteDuplicatesMap:
+        return GedcomSqliteDuplicatesMap(self, 'families')
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def write_database(path: str, connection: sqlite3.Connection) -> None:
+    ''' parse file chunk by chunk into an empty database '''
+    connection.executescript(SCHEMA)
+    line_no: int = 0
+    individual_seq: int = 0
+    family_seq: int = 0
+
+    chunk_count: int = os.path.getsize(path) // BUILD_CHUNK_SIZE + 1
+    with open(path, 'rb') as source:
+        for start, stop in get_shard_offsets(path, chunk_count):
+            # parse records of chunk on its own line table
+            table: GedcomLineTable = GedcomLineTable(path)
+            for row in read_rows_from_mapped_file(open(path, 'rb'), table, start, stop, line_no):
+                pass
+
+            repo: GedcomRepository = GedcomRepository([])
+            for record_lines in get_records_from_lines(table):
+                repo.parse_record(record_lines)
+
+            source.seek(start)
+            chunk: bytes = source.read(stop - start)
+            connection.executemany('INSERT INTO lines VALUES (?, ?, ?, ?, ?, ?)', (
+                (table.line_nos[row], table.levels[row], table.get_tag(row), ' '.join(table.get_arguments(row)),
+                 table.is_validated(row),
+                 chunk[table.offsets[row] - start:table.offsets[row] - start + table.lengths[row]].decode().rstrip('\r\n'))
+                for row in range(len(table))))
+
+            # subjects are still in file order before sorting
+            for individual in repo._individuals:
+                values, errors = get_row_values(individual, INDIVIDUAL_COLUMNS)
+                connection.execute('INSERT INTO individuals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   (individual_seq, individual.id, *values, errors))
+                connection.executemany('INSERT INTO members VALUES (?, ?, ?, ?)', [
+                    *((individual_seq, 'FAMC', family_id, line_no) for family_id, line_no in zip(
+                        individual.child_of_id_list, individual.child_of_line_no_list)),
+                    *((individual_seq, 'FAMS', family_id, line_no) for family_id, line_no in zip(
+                        individual.spouse_of_id_list, individual.spouse_of_line_no_list))])
+                individual_seq += 1
+
+            for family in repo._families:
+                values, errors = get_row_values(family, FAMILY_COLUMNS)
+                connection.execute('INSERT INTO families VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   (family_seq, family.id, *values, errors))
+                connection.executemany('INSERT INTO children VALUES (?, ?, ?)', (
+                    (family_seq, child_id, child_line_no) for child_id, child_line_no in zip(
+                        family.children_id_list, family.children_line_no_list)))
+                family_seq += 1
+
+            line_no += len(table)
+            table.close()
+
+    connection.executescript(INDEXES)
+
+
+def get_source_meta(path: str) -> Dict[str, Any]:
+    ''' get values identifying source file and database layout '''
+    stat: os.stat_result = os.stat(path)
+    return {
+        'source': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'schema': SCHEMA_VERSION,
+        'code': get_code_fingerprint(),
+    }
+
+
+def read_repository_sqlite(path: str, database_path: Optional[str] = None, cache_size: int = RECORD_CACHE_SIZE) -> GedcomSqliteRepository:
+    ''' creat SQLite-backed GEDCOM repository from input file
+        database_path: defaults to path + ".sqlite", reused while the file is unchanged '''
+    if not os.path.isfile(path):
+        raise GedcomFileNotFound(f'Cannot open file "{path}"!', path)
+
+    database_path = database_path or f'{path}.sqlite'
+    meta: Dict[str, Any] = get_source_meta(path)
+
+    if os.path.isfile(database_path):
+        connection: sqlite3.Connection = sqlite3.connect(database_path)
+        try:
+            stored_meta: Dict[str, Any] = dict(connection.execute('SELECT key, value FROM meta'))
+        except sqlite3.DatabaseError as e:
+            stored_meta = {}
+        finally:
+            connection.close()
+
+        if stored_meta == meta:
+            return GedcomSqliteRepository(database_path, cache_size)
+
+        os.unlink(database_path)
+
+    # build in a temporary file, so an interrupted build is not reused
+    building_path: str = f'{database_path}.building'
+    if os.path.exists(building_path):
+        os.unlink(building_path)
+
+    connection = sqlite3.connect(building_path)
+    try:
+        write_database(path, connection)
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', meta.items())
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(building_path, database_path)
+    return GedcomSqliteRepository(database_path, cache_size)
@@ -2,5 +2,7 @@ from .top_level import GedcomNote, GedcomHeader, GedcomTrailer
 from .date import GedcomDate, GedcomDateEvent
 from .individual import GedcomIndividual
 from .family import GedcomFamily
+from .lazy import GedcomLazyIndividual, GedcomLazyFamily
+from .compact import GedcomCompactIndividual, GedcomCompactFamily
 
-__all__ = 'GedcomNote', 'GedcomHeader', 'GedcomTrailer', 'GedcomDate', 'GedcomDateEvent', 'GedcomIndividual', 'GedcomFamily'
+__all__ = 'GedcomNote', 'GedcomHeader', 'GedcomTrailer', 'GedcomDate', 'GedcomDateEvent', 'GedcomIndividual', 'GedcomFamily', 'GedcomLazyIndividual', 'GedcomLazyFamily', 'GedcomCompactIndividual', 'GedcomCompactFamily'
@@ -1,12 +1,11 @@
-from typing import Any, Optional, Iterator, IO, List, Dict
+from typing import Any, Optional, Iterator, IO, List, Dict, Sequence
 from abc import ABCMeta, abstractmethod
-from ..file import GedcomLine
-from ..exceptions import GedcomDataParsingException, GedcomInvalidData
+from ..file import GedcomLine, line_range
 
 
 class GedcomData(metaclass=ABCMeta):
     ''' GEDCOM data base object '''
-    # __slots__ = 'lines', '_repo', '_level', 'parents', 'children'
+    __slots__ = 'lines', '_repo'
 
     belongs_to: Optional[str] = None
 
@@ -22,7 +21,7 @@ class GedcomData(metaclass=ABCMeta):
 
     @abstractmethod
     def parse_lines(self) -> bool:
-        ''' return True if gedcom data source is valid '''
+        ''' return True if gedcom data source is valid, or else the status of reject() '''
         return False
 
     @property
@@ -50,41 +49,48 @@ class GedcomData(metaclass=ABCMeta):
         ''' override to provide default values in __init__ '''
         pass
 
-    def __init__(self, lines: List[GedcomLine], repo: 'GedcomRepository') -> None:
-        self._repo: 'GedcomRepository' = repo
-        self.lines: List[GedcomLine] = lines
+    def reject(self, reason: str, line: Optional[GedcomLine] = None) -> bool:
+        ''' record why line, the first line by default, is not valid in diagnostics of repo
+            returns False as the status of parse_lines '''
+        diagnostics: Optional['GedcomDiagnostics'] = getattr(self._repo, 'diagnostics', None)
+        if diagnostics is not None:
+            diagnostics.add(line or self.line, reason)
 
-        self.set_default_values()
+        return False
 
-        try:
-            # check if parsed line is of known data type
-            line: GedcomLine = lines[0]
-            tag_mismatch: bool = line.tag != self.tag
-            level_mismatch: bool = self.level != None and line.level != self.level
-            if tag_mismatch or level_mismatch:
-                raise GedcomDataParsingException(
-                    'line and data type not matched')
+    def attach(self, repo: Optional['GedcomRepository']) -> None:
+        ''' point this data and data parsed under it to repo '''
+        self._repo = repo
 
-            # parse line data by type
-            done: bool = self.parse_lines()
-            if not done:
-                raise GedcomDataParsingException('data parsing failed')
+    def __init__(self, lines: Sequence[GedcomLine], repo: 'GedcomRepository') -> None:
+        self._repo: 'GedcomRepository' = repo
+        # parse from a list of line views
+        self.lines: Sequence[GedcomLine] = lines if isinstance(lines, list) else list(lines)
 
-        except Exception as e:
-            pass
+        self.set_default_values()
+
+        # check if parsed line is of known data type
+        line: GedcomLine = self.lines[0]
+        if line.tag != self.tag or (self.level != None and line.level != self.level):
+            self.reject('line and data type not matched')
 
-        else:
+        # parse line data by type, parse_lines records why it failed
+        elif self.parse_lines():
             # validate lines if no data parsing error
             self.validate_lines()
 
+        # keep a compact line range after parsing
+        self.lines = line_range(self.lines)
+
 
 class GedcomTagOnlyData(GedcomData):
     ''' GEDCOM no argument data base object '''
+    __slots__ = ()
 
     def parse_lines(self) -> bool:
         # no argumets allowed
         if self.line.arguments:
-            raise GedcomInvalidData(f'{self.tag} no argumets allowed')
+            return self.reject(f'{self.tag} no argumets allowed')
 
         return True
 
@@ -97,7 +103,7 @@ class GedcomSubjectData(GedcomData):
 
     @abstractmethod
     def parse_info_line(self, index: int) -> bool:
-        ''' parse data line of subject '''
+        ''' parse data line of subject, or else return the status of reject() '''
         return False
 
     @property
@@ -117,20 +123,27 @@ class GedcomSubjectData(GedcomData):
     def has_info(self, info: GedcomData) -> bool:
         return info and info.validated
 
-    def parse_lines(self) -> bool:
+    def parse_id_line(self) -> bool:
+        ''' parse subject ID from the level-0 line '''
+        line: GedcomLine = self.line
+
         # tag has to be the last token
-        if self.line.data.split()[-1] != self.line.tag:
-            raise GedcomInvalidData(f'Incorrect {self.line.tag} format')
+        if not line.table.is_id_line(line.row):
+            return self.reject(f'Incorrect {line.tag} format')
 
         # only a single argument for individual ID
-        if self.line.arguments_count != 1:
-            raise GedcomInvalidData('single argument individual id required')
+        if line.arguments_count != 1:
+            return self.reject('single argument individual id required')
+
+        self.id: str = line.argument
+        return True
 
-        self.id: str = self.line.argument
+    def parse_lines(self) -> bool:
+        if not self.parse_id_line():
+            return False
 
         # parse data under this subject
-        for index in range(1, len(self.lines)):
-            info_line: GedcomLine = self.lines[index]
+        for index, info_line in enumerate(self.lines[1:], 1):
             tag: str = info_line.tag
 
             # DATE lines should be parsed by a preceding event tag
@@ -139,13 +152,8 @@ class GedcomSubjectData(GedcomData):
 
             if tag not in self.info_tags:
                 continue
-                # raise GedcomInvalidData()
-
-            try:
-                # parse line containing info of subject
-                self.parse_info_line(index)
 
-            except Exception as e:
-                pass
+            # parse line containing info of subject, invalid lines are skipped
+            self.parse_info_line(index)
 
         return True
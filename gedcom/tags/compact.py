@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import date as Date
+from ..file import GedcomLine
+from ..dates import get_ymd
+from .base import GedcomData
+from .individual import GedcomIndividual
+from .family import GedcomFamily
+
+
+def get_field_property(field: str) -> property:
+    ''' get property of kept field, lists are returned as new lists '''
+    if field.endswith('_list'):
+        return property(lambda self: self._get_list(field))
+
+    return property(lambda self: self._get(field))
+
+
+def get_ordinal_property(field: str) -> property:
+    ''' get property of day number of kept date field '''
+    def get_ordinal(self: 'GedcomCompactSubject') -> Optional[int]:
+        date: Optional[Date] = getattr(self, field)
+        return date.toordinal() if date else None
+
+    return property(get_ordinal)
+
+
+def get_ymd_property(field: str) -> property:
+    ''' get property of (year, month, day) of kept date field '''
+    return property(lambda self: get_ymd(getattr(self, field)))
+
+
+class GedcomCompactSubject:
+    ''' subject which keeps the values of its properties after parsing and releases its lines and data objects,
+        a property raising while parsed raises the same error '''
+    __slots__ = ()
+
+    # parsed subject type whose properties are kept
+    parsed_type: type = GedcomData
+    # properties kept, in the order of _values, a property is generated for each
+    fields: Tuple[str, ...] = ()
+    # kept date properties, their day number and (year, month, day) properties are generated too
+    date_fields: Tuple[str, ...] = ()
+    # index of each field in _values
+    field_index: Dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.field_index = {field: index for index, field in enumerate(cls.fields)}
+        for field in cls.fields:
+            setattr(cls, field, get_field_property(field))
+
+        for field in cls.date_fields:
+            setattr(cls, f'{field}_ordinal', get_ordinal_property(field))
+            setattr(cls, f'{field}_ymd', get_ymd_property(field))
+
+    def __init__(self, lines: Sequence[GedcomLine], repo: 'GedcomRepository') -> None:
+        # only subjects with a valid ID line are kept by the repository
+        self._validated: bool = False
+        GedcomData.__init__(self, lines, repo)
+        self._line_no: int = self.line.line_no
+
+        values: List[Any] = []
+        errors: Dict[str, Tuple[type, Tuple[Any, ...]]] = {}
+        for field in self.fields:
+            try:
+                value: Any = getattr(self.parsed_type, field).fget(self)
+            except Exception as e:
+                errors[field] = type(e), e.args
+                value = None
+
+            # lists of few items are kept as tuples
+            values.append(tuple(value) if isinstance(value, list) else value)
+
+        self._values: Tuple[Any, ...] = tuple(values)
+        self._errors: Optional[Dict[str, Tuple[type, Tuple[Any, ...]]]] = errors or None
+
+        self.release_data()
+
+    @classmethod
+    def from_values(
+        cls,
+        repo: 'GedcomRepository',
+        id: str,
+        line_no: int,
+        values: Tuple[Any, ...],
+        errors: Optional[Dict[str, Tuple[type, Tuple[Any, ...]]]] = None
+    ) -> 'GedcomCompactSubject':
+        ''' get subject of values kept by a subject parsed elsewhere, without parsing '''
+        subject: GedcomCompactSubject = cls.__new__(cls)
+        subject._repo = repo
+        subject.id = id
+        subject._line_no = line_no
+        subject._validated = True
+        subject._values = values
+        subject._errors = errors
+        subject.release_data()
+        return subject
+
+    def release_data(self) -> None:
+        ''' release data objects and lines, only the ID line number is kept '''
+        self.set_default_values()
+        self.lines = ()
+
+    def _get(self, field: str) -> Any:
+        ''' get kept value, raise the error the parsed property raised '''
+        if self._errors is not None and field in self._errors:
+            error_type, args = self._errors[field]
+            raise error_type(*args)
+
+        return self._values[self.field_index[field]]
+
+    def _get_list(self, field: str) -> List[Any]:
+        return list(self._get(field))
+
+    @property
+    def line_no(self) -> int:
+        return self._line_no
+
+    @property
+    def validated(self) -> bool:
+        return self._validated
+
+    @validated.setter
+    def validated(self, validated: bool) -> None:
+        # only set while parsing, when lines are kept
+        GedcomData.validated.fset(self, validated)
+        self._validated = validated
+
+
+class GedcomCompactIndividual(GedcomCompactSubject, GedcomIndividual):
+    ''' GEDCOM 0 {id} INDI keeping only parsed values and line numbers '''
+    __slots__ = '_line_no', '_validated', '_values', '_errors'
+
+    parsed_type = GedcomIndividual
+    fields = (
+        'name', 'name_line_no', 'sex', 'sex_line_no', 'birth', 'birth_line_no', 'death', 'death_line_no',
+        'child_of_id_list', 'child_of_line_no_list', 'spouse_of_id_list', 'spouse_of_line_no_list')
+    date_fields = ('birth', 'death')
+
+    def release_data(self) -> None:
+        super().release_data()
+        # memberships are checked against the kept family IDs once parsed
+        self._member_of_ids = None
+
+    @property
+    def member_of_id_list(self) -> List[str]:
+        return self.child_of_id_list + self.spouse_of_id_list
+
+    @property
+    def member_of_line_no_list(self) -> List[int]:
+        return self.child_of_line_no_list + self.spouse_of_line_no_list
+
+
+class GedcomCompactFamily(GedcomCompactSubject, GedcomFamily):
+    ''' GEDCOM 0 {id} FAM keeping only parsed values and line numbers '''
+    __slots__ = '_line_no', '_validated', '_values', '_errors'
+
+    parsed_type = GedcomFamily
+    fields = (
+        'husband_id', 'husband_line_no', 'wife_id', 'wife_line_no', 'children_id_list', 'children_line_no_list',
+        'marriage', 'marriage_line_no', 'divorce', 'divorce_line_no')
+    date_fields = ('marriage', 'divorce')
+
+    def release_data(self) -> None:
+        super().release_data()
+        # members are checked against the kept individual IDs once parsed
+        self._member_ids = None
+
+    def has_member(self, individual_id: str) -> bool:
+        ''' check if individual is in this family '''
+        if self._member_ids is not None:
+            return individual_id in self._member_ids
+
+        return individual_id in (self.husband_id, self.wife_id) or individual_id in self._get('children_id_list')
@@ -1,12 +1,13 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+from functools import lru_cache
 from datetime import date as Date
 from .base import GedcomData, GedcomTagOnlyData
-from ..exceptions import GedcomInvalidData
+from ..dates import YMD
 
 
 class GedcomDate(GedcomData):
     ''' GEDCOM 2 DATE {date} {month} {year}'''
-    __slots__ = 'date'
+    __slots__ = 'date', 'ordinal', 'ymd'
 
     level = 2
     tag = 'DATE'
@@ -30,28 +31,50 @@ class GedcomDate(GedcomData):
     #     pass
 
     def parse_lines(self) -> bool:
-        d, mmm, yyyy = self.line.arguments
+        date, verdict = parse_date_arguments(self.line.arguments)
 
-        if not d or not mmm or not yyyy:
-            raise GedcomInvalidData(
-                f'invalid date arguments {d} {mmm} {yyyy}')
+        if verdict == DATE_MALFORMED:
+            return self.reject(f'invalid date arguments {" ".join(self.line.arguments)}')
 
-        day: int = int(d)
-        month: int = self.month_map[mmm]
-        year: int = int(yyyy)
-
-        if not month:
-            raise GedcomInvalidData('invalid day month')
+        self.date: Optional[Date] = date
+        if verdict == DATE_INVALID:
+            return self.reject('invalid date')
 
-        try: 
-            self.date: Date = Date(year, month, day)
-        except:
-            self.date = None
-            raise GedcomInvalidData('invalid date')
+        # integer forms for date arithmetic of validators
+        self.ordinal: int = date.toordinal()
+        self.ymd: YMD = date.year, date.month, date.day
 
         return True
 
 
+# verdicts of DATE arguments
+DATE_VALID: str = 'valid'
+# day, month and year are readable but not a calendar date
+DATE_INVALID: str = 'invalid'
+# not a day, month abbreviation and year
+DATE_MALFORMED: str = 'malformed'
+
+# distinct DATE arguments remembered
+DATE_CACHE_SIZE: int = 1 << 16
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_arguments(arguments: Tuple[str, ...]) -> Tuple[Optional[Date], str]:
+    ''' get date and verdict of DATE arguments, dates of repeated arguments are shared '''
+    try:
+        d, mmm, yyyy = arguments
+        day: int = int(d)
+        month: int = GedcomDate.month_map[mmm]
+        year: int = int(yyyy)
+    except (ValueError, KeyError):
+        return None, DATE_MALFORMED
+
+    try:
+        return Date(year, month, day), DATE_VALID
+    except (ValueError, OverflowError):
+        return None, DATE_INVALID
+
+
 class GedcomDateEvent(GedcomTagOnlyData):
     ''' GEDCOM entry preceding DATE '''
     __slots__ = '_date'
@@ -67,13 +90,36 @@ class GedcomDateEvent(GedcomTagOnlyData):
         ''' get date object of event '''
         return self._date.date if self._date else None
 
+    @property
+    def ordinal(self) -> Optional[int]:
+        ''' get day number of event date '''
+        return self._date.ordinal if self._date else None
+
+    @property
+    def ymd(self) -> Optional[YMD]:
+        ''' get (year, month, day) of event date '''
+        return self._date.ymd if self._date else None
+
+    def set_default_values(self) -> None:
+        # an event rejected before its DATE line is parsed has no date
+        self._date: Optional[GedcomDate] = None
+
+    def attach(self, repo: Optional['GedcomRepository']) -> None:
+        super().attach(repo)
+        if self._date:
+            self._date.attach(repo)
+
     def parse_lines(self) -> bool:
         # no argumets allowed
         if self.line.arguments:
-            raise GedcomInvalidData('event no argumets allowed')
+            return self.reject('event no argumets allowed')
+
+        # expect next line to be DATE
+        if len(self.lines) < 2 or self.lines[1].tag != 'DATE':
+            return self.reject('event DATE line missing')
 
-        date_line: GedcomLine = self.lines[1]
-        date: GedcomDate = GedcomDate([date_line], self._repo)
+        # an invalid DATE line records its own reason
+        date: GedcomDate = GedcomDate(self.lines[1:2], self._repo)
 
         self._date = date if date.validated else None
         return bool(self._date)
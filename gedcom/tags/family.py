@@ -1,12 +1,13 @@
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Sequence
 from datetime import date as Date
 from .base import GedcomData, GedcomSubjectData
 from .date import GedcomDateEvent
-from ..exceptions import GedcomInvalidData
+from ..dates import YMD
 
 
 class GedcomFamilyData(GedcomData):
     ''' GEDCOM data belonging to FAM '''
+    __slots__ = ()
     belongs_to = 'FAM'
     level = 1
 
@@ -18,7 +19,7 @@ class GedcomFamilyMember(GedcomFamilyData):
     def parse_lines(self) -> bool:
         # only a single argument for individual ID
         if self.line.arguments_count != 1:
-            raise GedcomInvalidData('single argument individual ID required')
+            return self.reject('single argument individual ID required')
 
         self.individual_id: str = self.line.argument
 
@@ -27,21 +28,25 @@ class GedcomFamilyMember(GedcomFamilyData):
 
 class GedcomFamilyHusband(GedcomFamilyMember):
     ''' GEDCOM 1 HUSB {individual_id} '''
+    __slots__ = ()
     tag = 'HUSB'
 
 
 class GedcomFamilyWife(GedcomFamilyMember):
     ''' GEDCOM 1 WIFE {individual_id} '''
+    __slots__ = ()
     tag = 'WIFE'
 
 
 class GedcomFamilyChild(GedcomFamilyMember):
     ''' GEDCOM 1 CHIL {individual_id} '''
+    __slots__ = ()
     tag = 'CHIL'
 
 
 class GedcomFamilyMarriage(GedcomDateEvent):
     ''' GEDCOM 1 MARR '''
+    __slots__ = ()
     belongs_to = 'FAM'
     level = 1
     tag = 'MARR'
@@ -49,6 +54,7 @@ class GedcomFamilyMarriage(GedcomDateEvent):
 
 class GedcomFamilyDivorce(GedcomDateEvent):
     ''' GEDCOM 1 DIV '''
+    __slots__ = ()
     belongs_to = 'FAM'
     level = 1
     tag = 'DIV'
@@ -56,7 +62,7 @@ class GedcomFamilyDivorce(GedcomDateEvent):
 
 class GedcomFamily(GedcomSubjectData):
     ''' GEDCOM 0 {id} FAM '''
-    __slots__ = '_husband', '_wife', '_marriage', '_divorce', '_children'
+    __slots__ = '_husband', '_wife', '_marriage', '_divorce', '_children', '_index', '_member_ids'
 
     tag = 'FAM'
     info_tags = 'HUSB', 'WIFE', 'CHIL', 'MARR', 'DIV'
@@ -79,7 +85,11 @@ class GedcomFamily(GedcomSubjectData):
     @property
     def husbands(self) -> List['GedcomIndividual']:
         ''' get husband '''
-        return self._repo.individual_duplicates[self.husband_id]
+        relations: Optional['GedcomRelationIndex'] = self._repo.relations
+        if relations is None:
+            return self._repo.individual_duplicates[self.husband_id]
+
+        return relations.husbands.get(self._index, self._repo.individuals)
 
     @property
     def husband_line_no(self) -> Optional[int]:
@@ -99,7 +109,11 @@ class GedcomFamily(GedcomSubjectData):
     @property
     def wifes(self) -> List['GedcomIndividual']:
         ''' get wife '''
-        return self._repo.individual_duplicates[self.wife_id]
+        relations: Optional['GedcomRelationIndex'] = self._repo.relations
+        if relations is None:
+            return self._repo.individual_duplicates[self.wife_id]
+
+        return relations.wifes.get(self._index, self._repo.individuals)
 
     @property
     def wife_line_no(self) -> Optional[int]:
@@ -115,6 +129,10 @@ class GedcomFamily(GedcomSubjectData):
     def children(self) -> List[str]:
         ''' get list of children '''
         # return [child for child in [self._repo.individual[child_id] for child_id in self.children_id_list] if child]
+        relations: Optional['GedcomRelationIndex'] = self._repo.relations
+        if relations is not None:
+            return relations.children.get(self._index, self._repo.individuals)
+
         result: List['GedcomIndividual'] = []
         visited: Set[str] = set()
         for child_id in self.children_id_list:
@@ -139,6 +157,16 @@ class GedcomFamily(GedcomSubjectData):
         ''' get marriage line number '''
         return self._get_line_no(self._marriage)
 
+    @property
+    def marriage_ordinal(self) -> Optional[int]:
+        ''' get marriage day number '''
+        return self._marriage.ordinal if self._marriage else None
+
+    @property
+    def marriage_ymd(self) -> Optional[YMD]:
+        ''' get marriage (year, month, day) '''
+        return self._marriage.ymd if self._marriage else None
+
     @property
     def divorce(self) -> Optional[Date]:
         ''' get Date object of divorce '''
@@ -149,70 +177,109 @@ class GedcomFamily(GedcomSubjectData):
         ''' get divorce line number '''
         return self._get_line_no(self._divorce)
 
+    @property
+    def divorce_ordinal(self) -> Optional[int]:
+        ''' get divorce day number '''
+        return self._divorce.ordinal if self._divorce else None
+
+    @property
+    def divorce_ymd(self) -> Optional[YMD]:
+        ''' get divorce (year, month, day) '''
+        return self._divorce.ymd if self._divorce else None
+
     def set_default_values(self) -> None:
         self._husband = None
         self._wife = None
         self._marriage = None
         self._divorce = None
         self._children: List[GedcomFamilyChild] = []
+        # individual IDs of HUSB/WIFE/CHIL lines, only kept while parsing
+        self._member_ids: Optional[Set[str]] = set()
+
+    def attach(self, repo: Optional['GedcomRepository']) -> None:
+        super().attach(repo)
+        for data in (self._husband, self._wife, self._marriage, self._divorce, *self._children):
+            if data:
+                data.attach(repo)
 
     def has_member(self, individual_id: str) -> bool:
         ''' check if individual is in this family '''
+        if self._member_ids is not None:
+            return individual_id in self._member_ids
+
         return (self._husband and self._husband.individual_id == individual_id
                 ) or (self._wife and self._wife.individual_id == individual_id
                       ) or [child for child in self._children if child.individual_id == individual_id]
 
+    def parse_lines(self) -> bool:
+        parsed: bool = super().parse_lines()
+        self._member_ids = None
+        return parsed
+
     def parse_info_line(self, index: int) -> bool:
         info_line: GedcomLine = self.lines[index]
         tag: str = info_line.tag
 
-        data_lines: List[GedcomLine] = [info_line]
+        data_lines: Sequence[GedcomLine] = self.lines[index:index + 1]
 
         if tag in self.event_tags:
             # expect next line to be DATE
-            data_lines.append(self.lines[index + 1])
+            data_lines = self.lines[index:index + 2]
+            if len(data_lines) != 2:
+                return self.reject('event DATE line missing', info_line)
 
             if tag == 'MARR':
                 if self.has_info(self._marriage):
-                    raise GedcomInvalidData('Duplicate family marriage date')
+                    return self.reject('Duplicate family marriage date', info_line)
 
                 self._marriage = GedcomFamilyMarriage(data_lines, self._repo)
 
             elif tag == 'DIV':
                 if self.has_info(self._divorce):
-                    raise GedcomInvalidData('Duplicate family divorce date')
+                    return self.reject('Duplicate family divorce date', info_line)
 
                 self._divorce = GedcomFamilyDivorce(data_lines, self._repo)
 
         elif tag == 'HUSB':
             if self.has_info(self._husband):
-                raise GedcomInvalidData('Duplicate family husband')
+                return self.reject('Duplicate family husband', info_line)
 
             husband = GedcomFamilyHusband(data_lines, self._repo)
+            if not husband.validated:
+                return False
 
             if self.has_member(husband.individual_id):
-                child.validated = False
-                raise GedcomInvalidData('Duplicate family role for individual')
+                husband.validated = False
+                return self.reject('Duplicate family role for individual', info_line)
 
             self._husband = husband
+            self._member_ids.add(husband.individual_id)
 
         elif tag == 'WIFE':
             if self.has_info(self._wife):
-                raise GedcomInvalidData('Duplicate family wife')
+                return self.reject('Duplicate family wife', info_line)
 
             wife = GedcomFamilyWife(data_lines, self._repo)
+            if not wife.validated:
+                return False
 
             if self.has_member(wife.individual_id):
                 wife.validated = False
-                raise GedcomInvalidData('Duplicate family role for individual')
+                return self.reject('Duplicate family role for individual', info_line)
 
             self._wife = wife
+            self._member_ids.add(wife.individual_id)
 
         elif tag == 'CHIL':
             child = GedcomFamilyChild(data_lines, self._repo)
+            if not child.validated:
+                return False
 
             if self.has_member(child.individual_id):
                 child.validated = False
-                raise GedcomInvalidData('Duplicate family role for individual')
+                return self.reject('Duplicate family role for individual', info_line)
 
             self._children.append(child)
+            self._member_ids.add(child.individual_id)
+
+        return True
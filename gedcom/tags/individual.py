@@ -1,13 +1,14 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Set, Tuple, Sequence
 from datetime import date as Date
 import re
 from .base import GedcomData, GedcomSubjectData
 from .date import GedcomDateEvent
-from ..exceptions import GedcomInvalidData
+from ..dates import YMD, years_between
 
 
 class GedcomIndividualData(GedcomData):
     ''' GEDCOM data belonging to INDI '''
+    __slots__ = ()
     belongs_to = 'INDI'
     level = 1
 
@@ -21,7 +22,7 @@ class GedcomIndividualName(GedcomIndividualData):
     def parse_lines(self) -> bool:
         # name cannot be empty
         if not self.line.arguments:
-            raise GedcomInvalidData('single argument required')
+            return self.reject('single argument required')
 
         self.name: str = ' '.join(self.line.arguments)
 
@@ -37,13 +38,13 @@ class GedcomIndividualSex(GedcomIndividualData):
     def parse_lines(self) -> bool:
         # sex cannot be empty
         if self.line.arguments_count != 1:
-            raise GedcomInvalidData('single argument required')
+            return self.reject('single argument required')
 
         sex: str = self.line.argument
 
         # sex can only be M or F
         if sex not in ('M', 'F'):
-            raise GedcomInvalidData('M or F required')
+            return self.reject('M or F required')
 
         self.sex: str = sex
 
@@ -57,7 +58,7 @@ class GedcomIndividualMemberOf(GedcomIndividualData):
     def parse_lines(self) -> bool:
         # only a single argument for family ID
         if self.line.arguments_count != 1:
-            raise GedcomInvalidData('single argument family ID required')
+            return self.reject('single argument family ID required')
 
         self.family_id: str = self.line.argument
 
@@ -66,16 +67,19 @@ class GedcomIndividualMemberOf(GedcomIndividualData):
 
 class GedcomIndividualChildOf(GedcomIndividualMemberOf):
     ''' GEDCOM 1 FAMC {family_id} '''
+    __slots__ = ()
     tag = 'FAMC'
 
 
 class GedcomIndividualSpouseOf(GedcomIndividualMemberOf):
     ''' GEDCOM 1 FAMS {family_id} '''
+    __slots__ = ()
     tag = 'FAMS'
 
 
 class GedcomIndividualBirth(GedcomDateEvent):
     ''' GEDCOM 1 BIRT '''
+    __slots__ = ()
     belongs_to = 'INDI'
     level = 1
     tag = 'BIRT'
@@ -83,6 +87,7 @@ class GedcomIndividualBirth(GedcomDateEvent):
 
 class GedcomIndividualDeath(GedcomDateEvent):
     ''' GEDCOM 1 DEAT '''
+    __slots__ = ()
     belongs_to = 'INDI'
     level = 1
     tag = 'DEAT'
@@ -90,7 +95,7 @@ class GedcomIndividualDeath(GedcomDateEvent):
 
 class GedcomIndividual(GedcomSubjectData):
     ''' GEDCOM 0 {id} INDI '''
-    __slots__ = '_name', '_sex', '_birth', '_death', '_child_of_list', '_spouse_of_list'
+    __slots__ = '_name', '_sex', '_birth', '_death', '_child_of_list', '_spouse_of_list', '_index', '_member_of_ids'
 
     tag = 'INDI'
     info_tags = 'NAME', 'SEX', 'FAMC', 'FAMS', 'BIRT', 'DEAT'
@@ -171,6 +176,16 @@ class GedcomIndividual(GedcomSubjectData):
         ''' get individual birth line number '''
         return self._get_line_no(self._birth)
 
+    @property
+    def birth_ordinal(self) -> Optional[int]:
+        ''' get individual birth day number '''
+        return self._birth.ordinal if self._birth else None
+
+    @property
+    def birth_ymd(self) -> Optional[YMD]:
+        ''' get individual birth (year, month, day) '''
+        return self._birth.ymd if self._birth else None
+
     @property
     def death(self) -> Optional[Date]:
         ''' get individual death date object '''
@@ -181,22 +196,27 @@ class GedcomIndividual(GedcomSubjectData):
         ''' get individual death line number '''
         return self._get_line_no(self._death)
 
+    @property
+    def death_ordinal(self) -> Optional[int]:
+        ''' get individual death day number '''
+        return self._death.ordinal if self._death else None
+
+    @property
+    def death_ymd(self) -> Optional[YMD]:
+        ''' get individual death (year, month, day) '''
+        return self._death.ymd if self._death else None
+
     def age_at(self, date: Date = Date.today()) -> Optional[int]:
         ''' get individual age at death, or else age at input date '''
-        birth_date: Date = self.birth
-        end_date: Date = self.death if self.death and self.death < date else date
-
-        if not birth_date or not end_date:
+        birth_ymd: Optional[YMD] = self.birth_ymd
+        if not birth_ymd or not date:
             return None
 
-        try:
-            this_birth_date: Date = Date(
-                end_date.year, birth_date.month, birth_date.day)
-        except:
-            return None
+        death_ordinal: Optional[int] = self.death_ordinal
+        if death_ordinal is not None and death_ordinal < date.toordinal():
+            return years_between(birth_ymd, self.death_ymd)
 
-        return end_date.year - birth_date.year - \
-            (1 if end_date < this_birth_date else 0)
+        return years_between(birth_ymd, (date.year, date.month, date.day))
 
     @property
     def age(self) -> Optional[int]:
@@ -217,7 +237,11 @@ class GedcomIndividual(GedcomSubjectData):
     def spouse_of_list(self) -> List['GedcomFamily']:
         ''' get list of families which this individual is a spouse '''
         # return [spouse_of for spouse_of in [self._repo.family[spouse_of_id] for spouse_of_id in self.spouse_of_id_list] if spouse_of]
-        return self.get_families_by_id_list(self.spouse_of_id_list)
+        relations: Optional['GedcomRelationIndex'] = self._repo.relations
+        if relations is None:
+            return self.get_families_by_id_list(self.spouse_of_id_list)
+
+        return relations.spouse_of.get(self._index, self._repo.families)
 
     @property
     def spouse_of_line_no_list(self) -> List[int]:
@@ -233,7 +257,11 @@ class GedcomIndividual(GedcomSubjectData):
     def child_of_list(self) -> List['GedcomFamily']:
         ''' get list of families which this individual is a child '''
         # return [child_of for child_of in [self._repo.family[child_of_id] for child_of_id in self.child_of_id_list] if child_of]
-        return self.get_families_by_id_list(self.child_of_id_list)
+        relations: Optional['GedcomRelationIndex'] = self._repo.relations
+        if relations is None:
+            return self.get_families_by_id_list(self.child_of_id_list)
+
+        return relations.child_of.get(self._index, self._repo.families)
 
     @property
     def child_of_line_no_list(self) -> List[int]:
@@ -249,7 +277,12 @@ class GedcomIndividual(GedcomSubjectData):
     def member_of_list(self) -> List['GedcomFamily']:
         ''' get list of families which this individual is a member '''
         # return [member_of for member_of in [self._repo.family[member_of_id] for member_of_id in self.member_of_id_list] if member_of]
-        return self.get_families_by_id_list(self.member_of_id_list)
+        relations: Optional['GedcomRelationIndex'] = self._repo.relations
+        if relations is None:
+            return self.get_families_by_id_list(self.member_of_id_list)
+
+        # family IDs are never repeated across FAMC and FAMS
+        return relations.child_of.get(self._index, self._repo.families) + relations.spouse_of.get(self._index, self._repo.families)
 
     @property
     def member_of_line_no_list(self) -> List[int]:
@@ -263,62 +296,86 @@ class GedcomIndividual(GedcomSubjectData):
         self._death = None
         self._child_of_list: List[GedcomIndividualChildOf] = []
         self._spouse_of_list: List[GedcomIndividualSpouseOf] = []
+        # family IDs of FAMC/FAMS lines, only kept while parsing
+        self._member_of_ids: Optional[Set[str]] = set()
+
+    def attach(self, repo: Optional['GedcomRepository']) -> None:
+        super().attach(repo)
+        for data in (self._name, self._sex, self._birth, self._death, *self._child_of_list, *self._spouse_of_list):
+            if data:
+                data.attach(repo)
 
     def is_member_of(self, family_id: str) -> bool:
         ''' check if individual is a member of family'''
+        if self._member_of_ids is not None:
+            return family_id in self._member_of_ids
+
         return (family_id in self.member_of_id_list)
 
+    def parse_lines(self) -> bool:
+        parsed: bool = super().parse_lines()
+        self._member_of_ids = None
+        return parsed
+
     def parse_info_line(self, index: int) -> bool:
         info_line: GedcomLine = self.lines[index]
         tag: str = info_line.tag
 
         # keep track of lines for the same piece of data
-        data_lines: List[GedcomLine] = [info_line]
+        data_lines: Sequence[GedcomLine] = self.lines[index:index + 1]
 
         if tag in self.event_tags:
             # expect next line to be DATE
-            data_lines.append(self.lines[index + 1])
+            data_lines = self.lines[index:index + 2]
+            if len(data_lines) != 2:
+                return self.reject('event DATE line missing', info_line)
 
             if tag == 'BIRT':
                 if self.has_info(self._birth):
-                    raise GedcomInvalidData('Duplicate individual birth date')
+                    return self.reject('Duplicate individual birth date', info_line)
 
                 self._birth = GedcomIndividualBirth(data_lines, self._repo)
 
             elif tag == 'DEAT':
                 if self.has_info(self._death):
-                    raise GedcomInvalidData('Duplicate individual death date')
+                    return self.reject('Duplicate individual death date', info_line)
 
                 self._death = GedcomIndividualDeath(data_lines, self._repo)
 
         elif tag == 'NAME':
             if self.has_info(self._name):
-                raise GedcomInvalidData('Duplicate individual name')
+                return self.reject('Duplicate individual name', info_line)
 
             self._name = GedcomIndividualName(data_lines, self._repo)
 
         elif tag == 'SEX':
             if self.has_info(self._sex):
-                raise GedcomInvalidData('Duplicate individual sex')
+                return self.reject('Duplicate individual sex', info_line)
 
             self._sex = GedcomIndividualSex(data_lines, self._repo)
 
         elif tag == 'FAMC':
             child_of = GedcomIndividualChildOf(data_lines, self._repo)
+            if not child_of.validated:
+                return False
 
             if self.is_member_of(child_of.family_id):
                 child_of.validated = False
-                raise GedcomInvalidData(
-                    'Duplicate family membership for individual')
+                return self.reject('Duplicate family membership for individual', info_line)
 
             self._child_of_list.append(child_of)
+            self._member_of_ids.add(child_of.family_id)
 
         elif tag == 'FAMS':
             spouse_of = GedcomIndividualSpouseOf(data_lines, self._repo)
+            if not spouse_of.validated:
+                return False
 
             if self.is_member_of(spouse_of.family_id):
                 spouse_of.validated = False
-                raise GedcomInvalidData(
-                    'Duplicate family membership for individual')
+                return self.reject('Duplicate family membership for individual', info_line)
 
             self._spouse_of_list.append(spouse_of)
+            self._member_of_ids.add(spouse_of.family_id)
+
+        return True
@@ -0,0 +1,54 @@
+from typing import Any, Sequence
+from ..file import GedcomLine
+from .base import GedcomData
+from .individual import GedcomIndividual
+from .family import GedcomFamily
+
+
+class GedcomLazySubject:
+    ''' subject which only parses its ID line while the file is scanned,
+        lines under it are parsed on first access of data parsed from them, then kept '''
+    __slots__ = ()
+
+    def __init__(self, lines: Sequence[GedcomLine], repo: 'GedcomRepository') -> None:
+        # set first, read by __getattr__
+        self.parsed: bool = False
+        self._repo: 'GedcomRepository' = repo
+        # line range of the record in the line table
+        self.lines: Sequence[GedcomLine] = lines
+
+        line: GedcomLine = self.line
+        if line.tag != self.tag or line.level != self.level:
+            self.reject('line and data type not matched')
+
+        # an ID line is validated regardless of the lines under it
+        elif self.parse_id_line():
+            self.validate_lines()
+
+    def parse(self) -> None:
+        ''' parse lines under the subject, once '''
+        self.parsed = True
+        GedcomData.__init__(self, self.lines, self._repo)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for attributes not set yet, which are set by parsing, and for properties raising AttributeError
+        if self.parsed or name.startswith('__'):
+            # the error of a property is raised again as it is raised by eager subjects
+            prop: Any = getattr(type(self), name, None)
+            if isinstance(prop, property) and prop.fget is not None:
+                return prop.fget(self)
+
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+        self.parse()
+        return getattr(self, name)
+
+
+class GedcomLazyIndividual(GedcomLazySubject, GedcomIndividual):
+    ''' GEDCOM 0 {id} INDI parsed on first access '''
+    __slots__ = 'parsed'
+
+
+class GedcomLazyFamily(GedcomLazySubject, GedcomFamily):
+    ''' GEDCOM 0 {id} FAM parsed on first access '''
+    __slots__ = 'parsed'
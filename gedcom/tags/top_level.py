@@ -1,5 +1,4 @@
 from .base import GedcomData, GedcomTagOnlyData
-from ..exceptions import GedcomInvalidData
 
 class GedcomNote(GedcomData):
     ''' GEDCOM 0 NOTE {note} data '''
@@ -16,12 +15,14 @@ class GedcomNote(GedcomData):
 
 class GedcomHeader(GedcomTagOnlyData):
     ''' GEDCOM 0 HEAD '''
+    __slots__ = ()
     level = 0
     tag = 'HEAD'
 
 
 class GedcomTrailer(GedcomTagOnlyData):
     ''' GEDCOM 0 TRLR '''
+    __slots__ = ()
     level = 0
     tag = 'TRLR'
 
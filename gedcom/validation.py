@@ -0,0 +1,253 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+
+# subjects the errors of a hook visiting a subject depend on, re-checked after those are edited
+# the visited subject only
+SUBJECT_SCOPE: str = 'subject'
+# the visited subject and subjects it refers to by ID: families of an individual, members of a family
+LINKED_SCOPE: str = 'linked'
+# any subject, or anything besides subjects, the rule is re-run on every subject
+TREE_SCOPE: str = 'tree'
+
+
+class ValidationRule:
+    ''' validation rule driven by ValidationEngine, a new rule is created for every run
+        hooks are methods decorated with @individual_hook or @family_hook yielding errors or returning None,
+        errors of each hook are reported in hook definition order, followed by errors from finalize()
+        a method decorated with @columns_hook checks all individuals or families at once in place of a hook
+        partitionable rules may be run on parts of the subjects in separate processes
+        scope declares what errors of a hook depend on, rules with finalize() are of TREE_SCOPE '''
+    hooks: List[Callable] = []
+    columns_hooks: Dict[str, Callable] = {}
+    partitionable: bool = True
+    scope: str = TREE_SCOPE
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # hooks of rules without cross-record state can run on parts of the subjects
+        if 'partitionable' not in vars(cls):
+            cls.partitionable = cls.finalize is ValidationRule.finalize
+
+        # cross-record state collected for finalize() depends on every subject
+        if cls.finalize is not ValidationRule.finalize:
+            cls.scope = TREE_SCOPE
+
+        # collect hooks in definition order, base class hooks first
+        hooks: Dict[str, Callable] = {}
+        columns_hooks: Dict[str, Callable] = {}
+        for klass in reversed(cls.__mro__):
+            for name, attribute in vars(klass).items():
+                visits: Optional[str] = getattr(attribute, 'visits', None)
+                if visits == 'columns':
+                    columns_hooks[attribute.replaces] = attribute
+                elif visits:
+                    hooks[name] = attribute
+
+        cls.hooks = list(hooks.values())
+        cls.columns_hooks = columns_hooks
+
+    def __init__(self, repo: 'GedcomRepository') -> None:
+        self.repo: 'GedcomRepository' = repo
+
+    def finalize(self) -> Iterable[str]:
+        ''' report errors of cross-record checks after all subjects are visited '''
+        return []
+
+
+def individual_hook(method: Callable) -> Callable:
+    ''' mark rule method to visit each individual in repo.individuals '''
+    method.visits = 'individual'
+    return method
+
+
+def family_hook(method: Callable) -> Callable:
+    ''' mark rule method to visit each family in repo.families '''
+    method.visits = 'family'
+    return method
+
+
+def columns_hook(replaces: Callable) -> Callable[[Callable], Callable]:
+    ''' mark rule method to check repo.individual_columns or repo.family_columns once instead of visiting each subject
+        with hook replaces, the hook is used when the repository has no columns '''
+    def decorator(method: Callable) -> Callable:
+        method.visits = 'columns'
+        method.replaces = replaces.__name__
+        return method
+
+    return decorator
+
+
+def as_validator(rule_class: Type[ValidationRule], name: str) -> 'Validator':
+    ''' wrap rule into a plain validator function, fused by ValidationEngine when run together
+        name: name of the validator, the module-level name it is assigned to '''
+    def validator(repo: 'GedcomRepository') -> List[str]:
+        result: ValidationResult = ValidationEngine([validator]).run(repo)[validator]
+        if result.exception:
+            raise result.exception
+
+        return result.errors
+
+    validator.rule = rule_class
+    validator.__name__ = validator.__qualname__ = name
+    validator.__doc__ = rule_class.__doc__
+    validator.__module__ = rule_class.__module__
+    return validator
+
+
+class ValidationResult:
+    ''' errors of a validator, or the exception which stopped it '''
+    __slots__ = 'errors', 'exception'
+
+    def __init__(self, errors: List[str], exception: Optional[Exception] = None) -> None:
+        self.errors: List[str] = errors
+        self.exception: Optional[Exception] = exception
+
+
+class _HookRun:
+    ''' errors collected by a single bound hook '''
+    __slots__ = 'method', 'errors', 'exception'
+
+    def __init__(self, method: Callable) -> None:
+        self.method: Callable = method
+        self.errors: List[str] = []
+        self.exception: Optional[Exception] = None
+
+    def visit(self, subject: Any) -> None:
+        # a failed hook stops like the loop of a validator function
+        if self.exception is None:
+            try:
+                errors: Optional[Iterable[str]] = self.method(subject)
+                if errors:
+                    self.errors.extend(errors)
+            except Exception as e:
+                self.exception = e
+
+
+class ValidationEngine:
+    ''' run validators with a single traversal of individuals and families
+        rules from as_validator are fused, other validators are called as they are '''
+
+    def __init__(self, validators: Sequence['Validator']) -> None:
+        self.validators: Sequence['Validator'] = validators
+
+    def run(self, repo: 'GedcomRepository') -> Dict['Validator', ValidationResult]:
+        ''' get result of each validator, same as calling them one after another '''
+        results: Dict['Validator', ValidationResult] = {}
+        rule_runs: Dict['Validator', Any] = {}
+        individual_hooks: List[_HookRun] = []
+        family_hooks: List[_HookRun] = []
+        traversing_rules: int = 0
+
+        for validator in self.validators:
+            rule_class: Optional[Type[ValidationRule]] = getattr(validator, 'rule', None)
+            if rule_class is None or validator in rule_runs:
+                continue
+
+            rule: ValidationRule = rule_class(repo)
+            hook_runs: List[_HookRun] = []
+            for hook in rule_class.hooks:
+                columns_method: Optional[Callable] = rule_class.columns_hooks.get(hook.__name__)
+                columns: Any = getattr(repo, f'{hook.visits}_columns', None) if columns_method else None
+                if columns is not None:
+                    # rows of all subjects are checked at once, in place of the traversal
+                    hook_run: _HookRun = _HookRun(columns_method.__get__(rule))
+                    hook_run.visit(columns)
+                    hook_runs.append(hook_run)
+                    continue
+
+                hook_run = _HookRun(hook.__get__(rule))
+                hook_runs.append(hook_run)
+                if hook.visits == 'individual':
+                    individual_hooks.append(hook_run)
+                else:
+                    family_hooks.append(hook_run)
+
+            rule_runs[validator] = rule, hook_runs
+            if not hook_runs or any(hook_run.method.visits != 'columns' for hook_run in hook_runs):
+                traversing_rules += 1
+
+        # resolve relations once when several rules look them up, rules checking only columns do not
+        relations: Optional['GedcomRelationIndex'] = repo.relations
+        resolved: bool = bool(relations and traversing_rules > 1 and not relations.resolved)
+        if resolved:
+            relations.resolve(repo.individuals, repo.families)
+
+        try:
+            self._traverse(repo, individual_hooks, family_hooks)
+        finally:
+            if resolved:
+                relations.release()
+
+        for validator in self.validators:
+            if validator in rule_runs:
+                rule, hook_runs = rule_runs[validator]
+                results[validator] = self._finalize(rule, hook_runs)
+                continue
+
+            try:
+                results[validator] = ValidationResult(validator(repo))
+            except Exception as e:
+                results[validator] = ValidationResult([], e)
+
+        return results
+
+    def _traverse(self, repo: 'GedcomRepository', individual_hooks: List[_HookRun], family_hooks: List[_HookRun]) -> None:
+        ''' visit every subject once for all rules '''
+        if individual_hooks:
+            for individual in repo.individuals:
+                for hook_run in individual_hooks:
+                    hook_run.visit(individual)
+
+        if family_hooks:
+            for family in repo.families:
+                for hook_run in family_hooks:
+                    hook_run.visit(family)
+
+    def _finalize(self, rule: ValidationRule, hook_runs: List[_HookRun]) -> ValidationResult:
+        ''' join hook errors in definition order, the first failed hook fails the rule '''
+        errors: List[str] = []
+        for hook_run in hook_runs:
+            if hook_run.exception is not None:
+                return ValidationResult([], hook_run.exception)
+
+            errors.extend(hook_run.errors)
+
+        try:
+            errors.extend(rule.finalize())
+        except Exception as e:
+            return ValidationResult([], e)
+
+        return ValidationResult(errors)
+
+
+# errors and exception of each hook of a rule, in hook definition order
+RulePart = List[Tuple[List[str], Optional[Exception]]]
+
+
+def run_rule_part(repo: 'GedcomRepository', rule_class: Type[ValidationRule], part: int, part_count: int) -> RulePart:
+    ''' run hooks of a partitionable rule on one of part_count even parts of the subjects '''
+    rule: ValidationRule = rule_class(repo)
+    hook_part: RulePart = []
+    for hook in rule_class.hooks:
+        subjects: Sequence[Any] = repo.individuals if hook.visits == 'individual' else repo.families
+        hook_run: _HookRun = _HookRun(hook.__get__(rule))
+        for subject in subjects[len(subjects) * part // part_count:len(subjects) * (part + 1) // part_count]:
+            hook_run.visit(subject)
+
+        hook_part.append((hook_run.errors, hook_run.exception))
+
+    return hook_part
+
+
+def join_rule_parts(parts: Sequence[RulePart]) -> ValidationResult:
+    ''' join rule parts in order, same as running the rule on all subjects '''
+    errors: List[str] = []
+    for hook_parts in zip(*parts):
+        for hook_errors, exception in hook_parts:
+            # the earliest failed subject stops the hook
+            if exception is not None:
+                return ValidationResult([], exception)
+
+            errors.extend(hook_errors)
+
+    return ValidationResult(errors)
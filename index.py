@@ -1,4 +1,6 @@
+import os
 from gedcom import GedcomRepository, prompt_repository_file
+from gedcom.instrumentation import GedcomInstrumentation
 from features.project3 import all_gedcom_individuals, all_gedcom_families
 from features.family_role_validation import correct_gender_roles, unique_family_spouses
 from features.unique_name_first_names_and_birthdate_validations import unique_name_and_birth, unique_first_names_in_families
@@ -17,39 +19,63 @@ from features.list_of_living_single_and_multiple_births import  living_single_li
 from features.large_age_diff import large_age_diff
 from features.illegitimate_dates import illegitimate_dates
 
+PIPELINE = [
+    (GedcomRepository.print_individuals, all_gedcom_individuals),
+    (GedcomRepository.print_families, all_gedcom_families),
+    (GedcomRepository.validate, correct_gender_roles),
+    (GedcomRepository.validate, unique_family_spouses),
+    (GedcomRepository.validate, unique_name_and_birth),
+    (GedcomRepository.validate, unique_first_names_in_families),
+    (GedcomRepository.validate, birth_before_death),
+    (GedcomRepository.validate, birth_before_marriage),
+    (GedcomRepository.validate, divorce_before_death),
+    (GedcomRepository.validate, dates_before_current_date),
+    (GedcomRepository.validate, birth_before_parents_marriage),
+    (GedcomRepository.validate, birth_before_parents_death),
+    (GedcomRepository.validate, unique_ids),
+    (GedcomRepository.validate, corresponding_entries),
+    (GedcomRepository.validate, marriage_before_death),
+    (GedcomRepository.validate, marriage_before_divorce),
+    (GedcomRepository.validate, age_and_age_at_death),
+    (GedcomRepository.print_individuals, order_siblings_by_age),
+    (GedcomRepository.validate, marriage_after_14),
+    (GedcomRepository.validate, male_last_names),
+    (GedcomRepository.print_individuals, deceased_individual_list),
+    (GedcomRepository.print_individuals, living_married_list),
+    (GedcomRepository.validate, sibling_spacing),
+    (GedcomRepository.validate, parents_too_old),
+    (GedcomRepository.validate, siblings_born_at_same_time),
+    (GedcomRepository.validate, too_many_siblings),
+    (GedcomRepository.print_individuals, list_recent_births),
+    (GedcomRepository.print_individuals, list_recent_deaths),
+    (GedcomRepository.print_individuals, living_single_list),
+    (GedcomRepository.print_individuals, list_multiple_births),
+    (GedcomRepository.validate, large_age_diff),
+    (GedcomRepository.validate, illegitimate_dates),
+]
+
 if __name__ == "__main__":
-    repo: GedcomRepository = prompt_repository_file()
+    # GEDCOM_REPORT=1 prints time spent in each stage, GEDCOM_PROFILE=<stage> also dumps <stage>.prof
+    # GEDCOM_CACHE=1 loads the parsed repository from, and saves it to, GEDCOM_CACHE_DIR (~/.cache/gedcom by default)
+    # GEDCOM_INCREMENTAL=1 re-parses and re-validates only what changed since the last run on the same file
+    cache: bool = bool(os.environ.get('GEDCOM_CACHE'))
+    incremental: bool = bool(os.environ.get('GEDCOM_INCREMENTAL'))
+    instrumentation: GedcomInstrumentation = None
+    if os.environ.get('GEDCOM_REPORT') or os.environ.get('GEDCOM_PROFILE'):
+        instrumentation = GedcomInstrumentation(profile_stage=os.environ.get('GEDCOM_PROFILE'))
+
+    repo: GedcomRepository = prompt_repository_file(cache=cache, instrumentation=instrumentation, incremental=incremental)
+
+    # run all validators in a single pass, errors are printed in pipeline order
+    repo.run_validations(
+        [step for run, step in PIPELINE if run is GedcomRepository.validate])
+
+    # keep parsed records and validator results for the next run
+    if incremental:
+        repo.store()
+
+    for run, step in PIPELINE:
+        run(repo, step)
 
-    repo \
-        .print_individuals(all_gedcom_individuals) \
-        .print_families(all_gedcom_families) \
-        .validate(correct_gender_roles) \
-        .validate(unique_family_spouses) \
-        .validate(unique_name_and_birth) \
-        .validate(unique_first_names_in_families) \
-        .validate(birth_before_death) \
-        .validate(birth_before_marriage) \
-        .validate(divorce_before_death) \
-        .validate(dates_before_current_date) \
-        .validate(birth_before_parents_marriage) \
-        .validate(birth_before_parents_death) \
-        .validate(unique_ids) \
-        .validate(corresponding_entries) \
-        .validate(marriage_before_death) \
-        .validate(marriage_before_divorce) \
-        .validate(age_and_age_at_death) \
-        .print_individuals(order_siblings_by_age) \
-        .validate(marriage_after_14) \
-        .validate(male_last_names) \
-        .print_individuals(deceased_individual_list) \
-        .print_individuals(living_married_list) \
-        .validate(sibling_spacing) \
-        .validate(parents_too_old) \
-        .validate(siblings_born_at_same_time) \
-        .validate(too_many_siblings) \
-        .print_individuals(list_recent_births) \
-        .print_individuals(list_recent_deaths) \
-        .print_individuals(living_single_list) \
-        .print_individuals(list_multiple_births) \
-        .validate(large_age_diff) \
-        .validate(illegitimate_dates)
+    if instrumentation:
+        instrumentation.print_report()
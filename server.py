@@ -0,0 +1,34 @@
+import signal
+import sys
+from gedcom.cache import GedcomRepositoryCache
+from gedcom.exceptions import GedcomException
+from gedcom.server import GedcomServer, make_server
+from client import get_server_address
+from index import PIPELINE
+
+if __name__ == "__main__":
+    # python server.py [GEDCOM file ...] loads files ahead of the first request
+    # GEDCOM_SERVER=unix:{path} or http://127.0.0.1:{port} is where client.py sends requests
+    address: str = get_server_address()
+    gedcom: GedcomServer = GedcomServer(PIPELINE, cache=GedcomRepositoryCache())
+    # bound before loading files, a server already serving at address is not waited for
+    try:
+        server = make_server(gedcom, address)
+    except GedcomException as e:
+        sys.exit(str(e))
+
+    for path in sys.argv[1:]:
+        print(gedcom.handle_request({'command': 'load', 'path': path}))
+
+    # stopped by Ctrl+C or kill, both close the server the same way
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    gedcom.start_watching()
+    print(f'serving GEDCOM requests at {address}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # repositories are stored in cache for the next start
+        server.server_close()
+        gedcom.close()
@@ -18,6 +18,25 @@ from features.list_recent_births_deaths_test import *
 from features.list_of_living_single_and_multiple_births_test import *
 from features.large_age_diff_test import *
 from features.illegitimate_dates_test import *
+from features.streaming_test import *
+from features.mapped_file_test import *
+from features.line_table_test import *
+from features.parallel_test import *
+from features.relation_index_test import *
+from features.validation_engine_test import *
+from features.parallel_validation_test import *
+from features.cache_test import *
+from features.sqlite_repository_test import *
+from features.instrumentation_test import *
+from features.membership_test import *
+from features.dates_test import *
+from features.columns_test import *
+from features.lazy_test import *
+from features.compact_test import *
+from features.diagnostics_test import *
+from features.incremental_test import *
+from features.server_test import *
+from features.record_index_test import *
 
 if __name__ == "__main__":
     main(exit=False, verbosity=3)